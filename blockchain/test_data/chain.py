@@ -1,17 +1,41 @@
 import hashlib
 import json
-from time import time
+from time import time, perf_counter_ns
 from typing import Dict
-from config import puzzle
+from config import puzzle, difficulty_mode, target_block_time, retarget_interval
 from blake3 import blake3
 
+MAX_TARGET = 2 ** 256 - 1
+MAX_RETARGET_FACTOR = 4  # Bound on how far a single retarget may move the target
+CALIBRATION_NONCES = 2000  # Nonces hashed to estimate the hashrate for the initial target
+
 class Chain:
     def __init__(self): 
         self.current_transactions = []
         self.chain = []
 
+        self.difficulty_mode = difficulty_mode
+        self.puzzle = puzzle
+        self.target = self.puzzle_to_target(puzzle)
+        self.target_block_time = target_block_time
+        self.retarget_interval = retarget_interval
+        self.pow_times = []  # Proof-of-work durations (ns) since the last retarget
+
         self.new_block(guess_hash="1", previous_hash="1", merkle_root="0", nonce=0) 
 
+        if self.difficulty_mode == "target":
+            self.set_target_block_time(self.target_block_time)
+
+    def reset(self):
+        """
+        Drop all blocks and pending transactions and start again from the genesis block.
+        Difficulty settings are kept, so a replayed round starts from the same state every time.
+        """
+        self.current_transactions = []
+        self.chain = []
+        self.pow_times = []
+        self.new_block(guess_hash="1", previous_hash="1", merkle_root="0", nonce=0)
+
     def new_block(self, guess_hash: str, merkle_root: str, nonce: int, previous_hash=None) -> Dict:
         
         header = self.hash({'header': str(previous_hash or self.hash(self.chain[-1])) + str(merkle_root) + str(nonce)})
@@ -48,9 +72,80 @@ class Chain:
     def hash(block: Dict):
         raise NotImplementedError
 
+    @staticmethod
+    def puzzle_to_target(puzzle):
+        """
+        Return the 256-bit target equivalent to requiring `puzzle` leading hex zeros.
+        """
+        return 1 << (256 - 4 * puzzle)
+
+    @staticmethod
+    def digest_value(guess_hash):
+        """
+        Interpret the leading 256 bits of a hex digest as an integer.
+        Shorter digests (md5, sha1) are left-aligned so all algorithms share one target scale.
+        """
+        head = guess_hash[:64]
+        return int(head, 16) << (256 - 4 * len(head))
+
+    def set_puzzle(self, puzzle):
+        """
+        Switch to fixed difficulty: a valid hash needs `puzzle` leading hex zeros.
+        """
+        self.difficulty_mode = "puzzle"
+        self.puzzle = puzzle
+        self.target = self.puzzle_to_target(puzzle)
+        self.pow_times = []
+
+    def set_target_block_time(self, block_time):
+        """
+        Switch to target-based difficulty aiming for `block_time` seconds of proof-of-work per block.
+        The initial target is derived from a short hashrate calibration and then retargeted periodically.
+        """
+        self.difficulty_mode = "target"
+        self.target_block_time = block_time
+
+        previous_nonce = self.last_block['nonce']
+        start = perf_counter_ns()
+        for nonce in range(CALIBRATION_NONCES):
+            self.valid_proof(previous_nonce, nonce)
+        elapsed_ns = max(perf_counter_ns() - start, 1)
+
+        expected_nonces = max(1, int(CALIBRATION_NONCES * block_time * 1e9 / elapsed_ns))
+        self.target = min(MAX_TARGET, (MAX_TARGET + 1) // expected_nonces)
+        self.pow_times = []
+
+    def retarget(self):
+        """
+        Scale the target by the ratio of observed to configured proof-of-work time,
+        bounded by MAX_RETARGET_FACTOR in either direction.
+        """
+        actual_ns = sum(self.pow_times) / len(self.pow_times)
+        expected_ns = self.target_block_time * 1e9
+        factor = min(max(actual_ns / expected_ns, 1 / MAX_RETARGET_FACTOR), MAX_RETARGET_FACTOR)
+
+        self.target = max(1, min(MAX_TARGET, int(self.target * factor)))
+        self.pow_times = []
+
     def proof_of_work(self, previous_nonce):
         nonce = 0
 
+        if self.difficulty_mode == "target":
+            start = perf_counter_ns()
+            target = self.target
+            while True:
+                guess_hash = self.valid_proof(previous_nonce, nonce)
+                if self.digest_value(guess_hash) < target:
+                    break
+                nonce += 1
+
+            self.pow_times.append(perf_counter_ns() - start)
+            if len(self.pow_times) >= self.retarget_interval:
+                self.retarget()
+
+            return nonce, guess_hash
+
+        puzzle = self.puzzle
         while True: 
             guess_hash = self.valid_proof(previous_nonce, nonce) 
             if guess_hash[:puzzle] == puzzle * "0":
@@ -175,4 +270,24 @@ class SHA512Chain(Chain):
     @staticmethod
     def valid_proof(previous_nonce, nonce):
         guess = f"{previous_nonce}{nonce}".encode('utf-8')
-        return hashlib.sha512(guess).hexdigest()
\ No newline at end of file
+        return hashlib.sha512(guess).hexdigest()
+
+
+chain_classes = {
+    "blake2b": BlakeChain,
+    "sha256": SHAChain,
+    "md5": MD5Chain,
+    "sha1": SHA1Chain,
+    "sha3": SHA3Chain,
+    "blake3": Blake3Chain,
+    "blake2s": Blake2sChain,
+    "sha512": SHA512Chain,
+}
+
+def make_chain(hash_name):
+    """
+    Instantiate the chain implementation for a hash algorithm name.
+    """
+    if hash_name not in chain_classes:
+        raise ValueError("Unsupported hash function")
+    return chain_classes[hash_name]()
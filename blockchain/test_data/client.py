@@ -1,28 +1,44 @@
 import requests
 import time
 import os
+import sys
 import argparse
-from config import sender_id, recipient_id, port, tx_endpoint, mining_endpoint, chain_length, tx_amount
+from config import (sender_id, recipient_id, port, tx_endpoint, mining_endpoint, difficulty_endpoint,
+                    reset_endpoint, chain_length, tx_amount)
+from workload import round_specs, read_trace, split_rounds
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from hashbench.store import record_round_files
 
 # Define the array of hash algorithms
 hash_names = ["blake3", "blake2b", "sha256", "blake2s", "sha512"]
 
-def create_rounds(hash_name, base_results_dir):
+def create_rounds(hash_name, base_results_dir, difficulty_mode="puzzle"):
     """
     Create configuration for 9 rounds dynamically based on the hash algorithm and base results directory.
+    In target mode each round fixes a target block time (seconds) instead of a puzzle difficulty.
     """
     return [
-        {"puzzle": 2, "tx_per_block": 5, "results_file": f"{base_results_dir}/{hash_name}/round1.txt"},
-        {"puzzle": 2, "tx_per_block": 10, "results_file": f"{base_results_dir}/{hash_name}/round2.txt"},
-        {"puzzle": 2, "tx_per_block": 15, "results_file": f"{base_results_dir}/{hash_name}/round3.txt"},
-        {"puzzle": 4, "tx_per_block": 5, "results_file": f"{base_results_dir}/{hash_name}/round4.txt"},
-        {"puzzle": 4, "tx_per_block": 10, "results_file": f"{base_results_dir}/{hash_name}/round5.txt"},
-        {"puzzle": 4, "tx_per_block": 15, "results_file": f"{base_results_dir}/{hash_name}/round6.txt"},
-        {"puzzle": 6, "tx_per_block": 5, "results_file": f"{base_results_dir}/{hash_name}/round7.txt"},
-        {"puzzle": 6, "tx_per_block": 10, "results_file": f"{base_results_dir}/{hash_name}/round8.txt"},
-        {"puzzle": 6, "tx_per_block": 15, "results_file": f"{base_results_dir}/{hash_name}/round9.txt"},
+        {**spec, "results_file": f"{base_results_dir}/{hash_name}/round{i}.txt"}
+        for i, spec in enumerate(round_specs(difficulty_mode), start=1)
     ]
 
+def companion_file(results_file, kind):
+    """
+    Return the companion file recording another per-block value next to the mining times,
+    e.g. round1.txt -> round1_nonces.txt (nonces tried), round1_pow.txt (proof-of-work ns)
+    or round1_targets.txt (hex target the block was mined against).
+    """
+    root, ext = os.path.splitext(results_file)
+    return f"{root}_{kind}{ext}"
+
+def round_difficulties(rounds):
+    """
+    Difficulty of each round ({round: {"puzzle": ...} or {"target_block_time": ...}}) for the run config.
+    """
+    return {str(number): {key: spec[key] for key in ("puzzle", "target_block_time") if spec.get(key) is not None}
+            for number, spec in rounds}
+
 def clear_prev_result(directory: str):
     """
     Clears all files in the specified results directory.
@@ -39,12 +55,37 @@ def clear_prev_result(directory: str):
     except Exception as e:
         return f"Error clearing results directory: {e}"
 
-def run_round(round_number, puzzle, tx_per_block, results_file):
+def set_difficulty(puzzle=None, target_block_time=None):
+    """
+    Configure the server's difficulty for the next round.
+    """
+    data = {'puzzle': puzzle, 'target_block_time': target_block_time}
+    try:
+        res = requests.post(f'http://localhost:{port}{difficulty_endpoint}', json=data)
+        res.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"Error setting difficulty: {e}")
+
+def reset_chain(hash_name=None):
+    """
+    Reset the server's chain to genesis, optionally switching its hash algorithm.
+    """
+    try:
+        res = requests.post(f'http://localhost:{port}{reset_endpoint}', json={'hash': hash_name})
+        res.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"Error resetting chain: {e}")
+
+def run_round(round_number, tx_per_block, results_file, puzzle=None, target_block_time=None, hash_name=None):
     """
-    Simulate mining and transaction processing for a single round.
+    Simulate mining and transaction processing for a single round, from a fresh genesis block on the
+    server switched to `hash_name`.
     """
     print(f"Running Round {round_number}")
-    print(f"Puzzle difficulty: {puzzle}, Transactions per block: {tx_per_block}")
+    if target_block_time is not None:
+        print(f"Target block time: {target_block_time}s, Transactions per block: {tx_per_block}")
+    else:
+        print(f"Puzzle difficulty: {puzzle}, Transactions per block: {tx_per_block}")
     print(f"Results will be saved to {results_file}")
     print("-------------------------------------------------------------------")
 
@@ -52,50 +93,98 @@ def run_round(round_number, puzzle, tx_per_block, results_file):
     results_dir = os.path.dirname(results_file)
     os.makedirs(results_dir, exist_ok=True)
 
+    reset_chain(hash_name)
+    set_difficulty(puzzle, target_block_time)
+
     # Mining and transaction simulation
     for block in range(chain_length):  # Iterate through blocks in the chain
-        for tx in range(tx_per_block):  # Simulate transactions per block
-            data = {'sender': sender_id, 'recipient': recipient_id, 'amount': tx_amount}
-            try:
-                res = requests.post(f'http://localhost:{port}{tx_endpoint}', json=data)
-                res.raise_for_status()
-            except requests.exceptions.RequestException as e:
-                print(f"Error during transaction: {e}")
-
-        try:
-            # Perform mining
-            res = requests.get(f'http://localhost:{port}{mining_endpoint}')
-            res.raise_for_status()
-            response_data = res.json()
+        block_txs = [{'sender': sender_id, 'recipient': recipient_id, 'amount': tx_amount}] * tx_per_block
+        mine_block(block_txs, results_file)
 
-            # Extract mining time
-            time_took = response_data.get('time took(ns)', "N/A")
+def replay_round(round_event, blocks, results_file):
+    """
+    Replay one round of a workload trace: reset the chain, apply the round's difficulty and mine its blocks.
+    """
+    print(f"Replaying Round {round_event['round']} ({len(blocks)} blocks)")
+    os.makedirs(os.path.dirname(results_file), exist_ok=True)
 
-            # Write mining time to the results file
-            with open(results_file, "a") as file:
-                file.write(f"{time_took}\n")
+    reset_chain()
+    set_difficulty(round_event.get("puzzle"), round_event.get("target_block_time"))
+    for block_txs in blocks:
+        mine_block([{k: tx[k] for k in ('sender', 'recipient', 'amount')} for tx in block_txs], results_file)
 
+def mine_block(block_txs, results_file):
+    """
+    Submit a block's transactions, trigger mining and record the server-side mining time.
+    """
+    for data in block_txs:  # Simulate transactions per block
+        try:
+            res = requests.post(f'http://localhost:{port}{tx_endpoint}', json=data)
+            res.raise_for_status()
         except requests.exceptions.RequestException as e:
-            print(f"Error during mining: {e}")
+            print(f"Error during transaction: {e}")
+
+    try:
+        # Perform mining
+        res = requests.get(f'http://localhost:{port}{mining_endpoint}')
+        res.raise_for_status()
+        response_data = res.json()
+
+        # Extract mining time, proof-of-work time, the number of nonces hashed and the block's target
+        time_took = response_data.get('time took(ns)', "N/A")
+        values = {
+            "nonces": response_data.get('nonces tried', "N/A"),
+            "pow": response_data.get('pow time(ns)', "N/A"),
+            "targets": response_data.get('target', "N/A"),
+        }
+
+        # Write mining time to the results file, the other values to its companion files
+        with open(results_file, "a") as file:
+            file.write(f"{time_took}\n")
+        for kind, value in values.items():
+            with open(companion_file(results_file, kind), "a") as file:
+                file.write(f"{value}\n")
+
+    except requests.exceptions.RequestException as e:
+        print(f"Error during mining: {e}")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run mining and transaction simulations for various hash algorithms.")
     parser.add_argument("--results_dir", type=str, required=True, help="Subdirectory name appended to the base path 'test_data/results/'.")
+    parser.add_argument("--difficulty_mode", type=str, choices=["puzzle", "target"], default="puzzle", help="Express rounds as puzzle difficulties or as target block times.")
+    parser.add_argument("--trace", type=str, help="Replay a workload trace generated by test_data/workload.py instead of the built-in rounds.")
     args = parser.parse_args()
 
+    trace_rounds = split_rounds(read_trace(args.trace)) if args.trace else []
+
     # Construct the base results directory
     base_results_dir = os.path.join("test_data/results", args.results_dir)
 
     # Iterate over all hash algorithms
     for hash_name in hash_names:
         print(f"Processing hash: {hash_name}")
-        rounds = create_rounds(hash_name, base_results_dir)
+        rounds = create_rounds(hash_name, base_results_dir, args.difficulty_mode)
 
         # Clear all previous results for the current hash type
         clear_message = clear_prev_result(f"{base_results_dir}/{hash_name}")
         print(clear_message)
 
         # Run all 9 rounds for the current hash algorithm
-        for i, round_config in enumerate(rounds, start=1):
-            run_round(i, round_config["puzzle"], round_config["tx_per_block"], round_config["results_file"])
+        if args.trace:
+            difficulties = round_difficulties((event["round"], event) for event, _ in trace_rounds)
+            # Replay the recorded workload against this algorithm from a fresh chain each round
+            reset_chain(hash_name)
+            for round_event, blocks in trace_rounds:
+                results_file = f"{base_results_dir}/{hash_name}/round{round_event['round']}.txt"
+                replay_round(round_event, blocks, results_file)
+        else:
+            difficulties = round_difficulties(enumerate(rounds, start=1))
+            for i, round_config in enumerate(rounds, start=1):
+                run_round(i, round_config["tx_per_block"], round_config["results_file"],
+                          puzzle=round_config.get("puzzle"), target_block_time=round_config.get("target_block_time"),
+                          hash_name=hash_name)
+
+        # Append this algorithm's rounds to the results store
+        record_round_files(f"{base_results_dir}/{hash_name}", hash_name, label=args.results_dir,
+                           config={"difficulty_mode": args.difficulty_mode, "trace": args.trace, "rounds": difficulties})
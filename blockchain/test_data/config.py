@@ -1,11 +1,20 @@
-from uuid import uuid4
+import random
+from uuid import UUID
 
 hash = "sha256"
 
-sender_id = str(uuid4()).replace('-', '')
-recipient_id = str(uuid4()).replace('-', '')
+workload_seed = 42  # Seed for account IDs and generated workload traces
+trace_file = "test_data/workload_trace.jsonl"
+
+_rng = random.Random(workload_seed)
+sender_id = UUID(int=_rng.getrandbits(128), version=4).hex
+recipient_id = UUID(int=_rng.getrandbits(128), version=4).hex
 
 puzzle = 4  # Increased default puzzle difficulty
+difficulty_mode = "puzzle"  # "puzzle" (leading hex zeros) or "target" (digest below a 256-bit target)
+target_block_time = 0.05  # Seconds of proof-of-work per block aimed for in target mode
+retarget_interval = 5  # Blocks mined between target adjustments
+target_block_times = [0.005, 0.05, 0.5]  # Target block times (s) used by the target-mode rounds
 chain_length = 15  # Increased number of blocks per round
 tx_per_block = 8  # Increased transactions per block
 tx_amount = 200  # Increased transaction amount
@@ -13,6 +22,8 @@ tx_amount = 200  # Increased transaction amount
 port = 4544
 tx_endpoint = "/tx/new"
 mining_endpoint = "/mine"
+difficulty_endpoint = "/difficulty"
+reset_endpoint = "/reset"
 results_file = "test_data/results"
 
 """
@@ -0,0 +1,209 @@
+import argparse
+import csv
+import os
+import sys
+import numpy as np
+import pandas as pd
+import requests
+from time import perf_counter_ns
+
+from chain import make_chain
+from merkle_tree import MerkleTree
+from client import hash_names, clear_prev_result, companion_file, round_difficulties, reset_chain, set_difficulty
+from config import (sender_id, recipient_id, port, tx_endpoint, mining_endpoint, chain_length, tx_amount)
+from workload import round_specs, read_trace, split_rounds
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from hashbench.store import record_frame
+
+miner_id = "1"
+
+def built_in_rounds(difficulty_mode="puzzle"):
+    """
+    Express the rounds used by create_rounds in the (round event, blocks) form of a replayed trace.
+    """
+    rounds = []
+    tx = {'sender': sender_id, 'recipient': recipient_id, 'amount': tx_amount}
+    for i, spec in enumerate(round_specs(difficulty_mode), start=1):
+        rounds.append(({"round": i, **spec}, [[tx] * spec["tx_per_block"] for _ in range(chain_length)]))
+    return rounds
+
+def apply_difficulty(blockchain, round_event):
+    """
+    Configure the chain's difficulty from a round event.
+    """
+    if round_event.get("target_block_time") is not None:
+        blockchain.set_target_block_time(round_event["target_block_time"])
+    else:
+        blockchain.set_puzzle(round_event["puzzle"])
+
+def mine_in_process(blockchain, merkle_tree, block_txs):
+    """
+    Add a block's transactions and mine it the same way server.py's /mine does, timing each phase.
+    Returns the phase timings in nanoseconds and the number of nonces tried.
+    """
+    start = perf_counter_ns()
+    for tx in block_txs:
+        blockchain.new_transaction(tx['sender'], tx['recipient'], tx['amount'])
+    tx_done = perf_counter_ns()
+
+    last_block = blockchain.last_block
+    nonce, guess_hash = blockchain.proof_of_work(last_block['nonce'])
+    pow_done = perf_counter_ns()
+
+    # Reward the miner
+    blockchain.new_transaction(sender="0", recipient=miner_id, amount=1)
+
+    txs = [str(tx) for tx in blockchain.current_transactions]
+    merkle_tree.add_leaf(txs, True)
+    merkle_tree.make_tree()
+    merkle_root = merkle_tree.get_merkle_root()
+    merkle_done = perf_counter_ns()
+
+    blockchain.new_block(guess_hash, merkle_root, nonce, last_block['hash'])
+    merkle_tree.reset_tree()
+    block_done = perf_counter_ns()
+
+    phases = {
+        "Tx(ns)": tx_done - start,
+        "PoW(ns)": pow_done - tx_done,
+        "Merkle(ns)": merkle_done - pow_done,
+        "Block(ns)": block_done - merkle_done,
+        "Mining(ns)": block_done - tx_done,  # Same span as the server's 'time took(ns)'
+        "Total(ns)": block_done - start,
+    }
+    return phases, nonce + 1
+
+def mine_over_http(block_txs):
+    """
+    Submit a block's transactions and mine it through the running server, timing the client side.
+    Returns the client-side total, the server-reported mining time and the nonces tried.
+    """
+    start = perf_counter_ns()
+    for data in block_txs:
+        requests.post(f'http://localhost:{port}{tx_endpoint}', json=data).raise_for_status()
+    res = requests.get(f'http://localhost:{port}{mining_endpoint}')
+    res.raise_for_status()
+    total_ns = perf_counter_ns() - start
+
+    response_data = res.json()
+    return total_ns, response_data['time took(ns)'], response_data['nonces tried']
+
+def run_in_process(hash_name, rounds, base_results_dir):
+    """
+    Run all rounds for one algorithm in-process, writing roundN.txt and its companion files like client.py.
+    Every round starts from a fresh genesis block. Returns per-block phase rows.
+    """
+    rows = []
+    blockchain = make_chain(hash_name)
+    merkle_tree = MerkleTree(hash_name)
+
+    for round_event, blocks in rounds:
+        round_name = f"round{round_event['round']}"
+        results_file = f"{base_results_dir}/{hash_name}/{round_name}.txt"
+        os.makedirs(os.path.dirname(results_file), exist_ok=True)
+        print(f"[in-process] {hash_name} {round_name}: {len(blocks)} blocks")
+
+        blockchain.reset()
+        apply_difficulty(blockchain, round_event)
+
+        with open(results_file, "a") as times_out, open(companion_file(results_file, "nonces"), "a") as nonces_out, \
+                open(companion_file(results_file, "pow"), "a") as pow_out, open(companion_file(results_file, "targets"), "a") as targets_out:
+            for index, block_txs in enumerate(blocks, start=1):
+                target = blockchain.target  # Retargeting after the proof may move it
+                phases, nonces = mine_in_process(blockchain, merkle_tree, block_txs)
+                times_out.write(f"{phases['Mining(ns)']}\n")
+                nonces_out.write(f"{nonces}\n")
+                pow_out.write(f"{phases['PoW(ns)']}\n")
+                targets_out.write(f"{target:064x}\n")
+                rows.append({"Hash": hash_name, "Round": round_name, "Block": index, "Nonces": nonces, **phases})
+    return rows
+
+def run_over_http(hash_name, rounds):
+    """
+    Run the same rounds through the server (switching it to `hash_name`). Returns per-block rows.
+    """
+    rows = []
+    reset_chain(hash_name)
+    for round_event, blocks in rounds:
+        round_name = f"round{round_event['round']}"
+        print(f"[http] {hash_name} {round_name}: {len(blocks)} blocks")
+
+        reset_chain()
+        set_difficulty(round_event.get("puzzle"), round_event.get("target_block_time"))
+        for index, block_txs in enumerate(blocks, start=1):
+            total_ns, server_ns, nonces = mine_over_http(block_txs)
+            rows.append({"Hash": hash_name, "Round": round_name, "Block": index, "Nonces": nonces,
+                         "HTTPTotal(ns)": total_ns, "ServerMining(ns)": server_ns, "Overhead(ns)": total_ns - server_ns})
+    return rows
+
+def summarize_overhead(http_rows, confidence=0.95):
+    """
+    Per (hash, round): mean HTTP overhead with its confidence interval. The overhead of each block is
+    the client-side total minus the server-reported mining time of that same block, so it does not
+    depend on how many nonces the block took.
+    """
+    from scipy.stats import t as student_t
+
+    grouped = {}
+    for row in http_rows:
+        grouped.setdefault((row["Hash"], row["Round"]), []).append(row)
+
+    summary = []
+    for (hash_name, round_name), rows in grouped.items():
+        overheads = np.array([row["HTTPTotal(ns)"] - row["ServerMining(ns)"] for row in rows], dtype=float)
+        n = len(overheads)
+        mean = overheads.mean()
+        half_width = student_t.ppf(0.5 + confidence / 2, df=n - 1) * overheads.std(ddof=1) / np.sqrt(n) if n > 1 else np.nan
+        summary.append({
+            "Hash": hash_name,
+            "Round": round_name,
+            "Blocks": n,
+            "HTTP(ns)": round(np.mean([row["HTTPTotal(ns)"] for row in rows])),
+            "ServerMining(ns)": round(np.mean([row["ServerMining(ns)"] for row in rows])),
+            "Overhead(ns)": round(mean),
+            "OverheadCILow(ns)": mean - half_width,
+            "OverheadCIHigh(ns)": mean + half_width,
+        })
+    return summary
+
+def write_rows(rows, path):
+    if not rows:
+        return
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Saved: {path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Chain/MerkleTree in-process, without the HTTP server.")
+    parser.add_argument("--results_dir", type=str, required=True, help="Subdirectory name appended to the base path 'test_data/results/'.")
+    parser.add_argument("--difficulty_mode", type=str, choices=["puzzle", "target"], default="puzzle", help="Express rounds as puzzle difficulties or as target block times.")
+    parser.add_argument("--trace", type=str, help="Replay a workload trace generated by test_data/workload.py instead of the built-in rounds.")
+    parser.add_argument("--mode", type=str, choices=["inprocess", "overhead"], default="inprocess", help="'overhead' also runs every round through the server and reports the HTTP overhead.")
+    args = parser.parse_args()
+
+    base_results_dir = os.path.join("test_data/results", args.results_dir)
+    rounds = split_rounds(read_trace(args.trace)) if args.trace else built_in_rounds(args.difficulty_mode)
+
+    in_process_rows = []
+    http_rows = []
+    for hash_name in hash_names:
+        print(f"Processing hash: {hash_name}")
+        print(clear_prev_result(f"{base_results_dir}/{hash_name}"))
+        in_process_rows.extend(run_in_process(hash_name, rounds, base_results_dir))
+        if args.mode == "overhead":
+            http_rows.extend(run_over_http(hash_name, rounds))
+
+    write_rows(in_process_rows, os.path.join(base_results_dir, "phases.csv"))
+    config = {"difficulty_mode": args.difficulty_mode, "trace": args.trace,
+              "rounds": round_difficulties((event["round"], event) for event, _ in rounds)}
+    phases_df = pd.DataFrame(in_process_rows)
+    record_frame("blockchain_phases", phases_df, [column for column in phases_df.columns if column.endswith("(ns)")] + ["Nonces"],
+                 label=args.results_dir, config=config, algorithm="Hash", round="Round")
+    if args.mode == "overhead":
+        write_rows(http_rows, os.path.join(base_results_dir, "http_blocks.csv"))
+        write_rows(summarize_overhead(http_rows), os.path.join(base_results_dir, "http_overhead.csv"))
+        record_frame("blockchain_http", pd.DataFrame(http_rows), ["HTTPTotal(ns)", "ServerMining(ns)", "Overhead(ns)", "Nonces"],
+                     label=args.results_dir, config=config, algorithm="Hash", round="Round")
@@ -1,106 +1,143 @@
 import argparse
-from fastapi import FastAPI
 from uuid import uuid4
-from pydantic import BaseModel
 import time
-from typing import ClassVar
-import uvicorn
+from typing import Optional
 
-from chain import (BlakeChain, SHAChain, MD5Chain, SHA1Chain, SHA3Chain, Blake3Chain,Blake2sChain, Blake2sChain, SHA512Chain)
+from chain import make_chain
 from merkle_tree import MerkleTree
 import config as cfg
 
 
-if cfg.hash == "blake2b":
-    blockchain = BlakeChain()
-elif cfg.hash == "sha256":
-    blockchain = SHAChain()
-elif cfg.hash == "md5":
-    blockchain = MD5Chain()
-elif cfg.hash == "sha1":
-    blockchain = SHA1Chain()
-elif cfg.hash == "sha3":
-    blockchain = SHA3Chain()
-elif cfg.hash == "blake3":
-    blockchain = Blake3Chain()
-elif cfg.hash == "blake2s":
-    blockchain = Blake2sChain()
-elif cfg.hash == "sha512":
-    blockchain = SHA512Chain()
-else:
-    raise ValueError("Unsupported hash function")
-
+blockchain = make_chain(cfg.hash)
 merkle_tree = MerkleTree(cfg.hash)
 
 miner_id ="1"
 
-class TX(BaseModel):
-    sender: ClassVar[str] = cfg.sender_id  # Mark as ClassVar
-    recipient: ClassVar[str] = cfg.recipient_id  # Mark as ClassVar
-    amount: int  
-
-app = FastAPI() 
-
-@app.get('/mine')
-def mine(): 
-    try:
-        mining_start = time.time_ns()
-        last_block = blockchain.last_block
-        last_nonce = last_block['nonce']
-        nonce, guess_hash = blockchain.proof_of_work(last_nonce)
-
-        # Reward the miner
-        blockchain.new_transaction(
-            sender="0",
-            recipient=miner_id,
-            amount=1,
-        )
-
-        previous_hash = last_block['hash']
-        txs = [str(tx) for tx in blockchain.current_transactions]
-        merkle_tree.add_leaf(txs, True)
-        merkle_tree.make_tree()
-        merkle_root = merkle_tree.get_merkle_root()
-        block = blockchain.new_block(guess_hash, merkle_root, nonce, previous_hash)
-        time_took = time.time_ns() - mining_start
-        
-        print(time_took)
-        # Prepare response
-        response = {
-            'message': 'New block added',
-            'time took(ns)': time_took,
-            'nonce': block['nonce'],
-            'index': block['index'],
-            'hash': block['hash'],
-            'merkle_root': block['merkle_root'],
-            'previous_hash': block['previous_hash'],
-        }
-        
-        print(response)
-
-        # Reset the Merkle tree for the next block
-        merkle_tree.reset_tree()
+def create_app():
+    """
+    Build the API. FastAPI and pydantic are imported here rather than at module load, so --help and
+    tools that import this module do not pay for the web stack.
+    """
+    from fastapi import FastAPI
+    from pydantic import BaseModel
+
+    class TX(BaseModel):
+        sender: str = cfg.sender_id  # Replayed traces supply their own accounts
+        recipient: str = cfg.recipient_id
+        amount: int  
+
+    class Reset(BaseModel):
+        hash: Optional[str] = None  # Switch to another hash algorithm while resetting
+
+    class Difficulty(BaseModel):
+        puzzle: Optional[int] = None  # Leading hex zeros (fixed difficulty)
+        target_block_time: Optional[float] = None  # Seconds per block (target-based difficulty)
+
+    app = FastAPI()
+
+    @app.get('/mine')
+    def mine(): 
+        try:
+            mining_start = time.time_ns()
+            last_block = blockchain.last_block
+            last_nonce = last_block['nonce']
+            target = blockchain.target  # Retargeting after this proof may move blockchain.target
+            pow_start = time.time_ns()
+            nonce, guess_hash = blockchain.proof_of_work(last_nonce)
+            pow_took = time.time_ns() - pow_start
+
+            # Reward the miner
+            blockchain.new_transaction(
+                sender="0",
+                recipient=miner_id,
+                amount=1,
+            )
+
+            previous_hash = last_block['hash']
+            txs = [str(tx) for tx in blockchain.current_transactions]
+            merkle_tree.add_leaf(txs, True)
+            merkle_tree.make_tree()
+            merkle_root = merkle_tree.get_merkle_root()
+            block = blockchain.new_block(guess_hash, merkle_root, nonce, previous_hash)
+            time_took = time.time_ns() - mining_start
+
+            print(time_took)
+            # Prepare response
+            response = {
+                'message': 'New block added',
+                'time took(ns)': time_took,
+                'pow time(ns)': pow_took,  # Proof-of-work only, the span hashrates are computed over
+                'nonces tried': nonce + 1,
+                'nonce': block['nonce'],
+                'index': block['index'],
+                'hash': block['hash'],
+                'merkle_root': block['merkle_root'],
+                'previous_hash': block['previous_hash'],
+                'difficulty_mode': blockchain.difficulty_mode,
+                'target': format(target, '064x'),
+            }
+
+            print(response)
+
+            # Reset the Merkle tree for the next block
+            merkle_tree.reset_tree()
+            return response
+
+        except Exception as e:
+            return {"error": "Mining operation failed"}
+
+
+    @app.post('/tx/new')
+    def new_transaction(tx: TX):
+        index = blockchain.new_transaction(tx.sender, tx.recipient, tx.amount)
+        response = {'message':f"Transaction will be added to block {index}",
+                'tx': tx}
         return response
 
-    except Exception as e:
-        return {"error": "Mining operation failed"}
+    @app.post('/difficulty')
+    def set_difficulty(difficulty: Difficulty):
+        if difficulty.target_block_time is not None:
+            blockchain.set_target_block_time(difficulty.target_block_time)
+        elif difficulty.puzzle is not None:
+            blockchain.set_puzzle(difficulty.puzzle)
 
+        response = {
+                'difficulty_mode': blockchain.difficulty_mode,
+                'puzzle': blockchain.puzzle,
+                'target_block_time': blockchain.target_block_time,
+                'target': format(blockchain.target, '064x'),
+                }
+        return response
 
-@app.post('/tx/new')
-def new_transaction(tx: TX):
-    index = blockchain.new_transaction(tx.sender, tx.recipient, tx.amount)
-    response = {'message':f"Transaction will be added to block {index}",
-            'tx': tx}
-    return response
+    @app.post('/reset')
+    def reset(options: Reset):
+        global blockchain, merkle_tree
+        if options.hash is not None and options.hash != cfg.hash:
+            blockchain = make_chain(options.hash)
+            merkle_tree = MerkleTree(options.hash)
+            cfg.hash = options.hash
+        else:
+            blockchain.reset()
+            merkle_tree.reset_tree()
+
+        response = {'message': 'Chain reset', 'hash': cfg.hash, 'length': len(blockchain.chain)}
+        return response
 
-@app.get('/chain')
-def get_chain():
-    response = {
-            'chain' : blockchain.chain,
-            'length': len(blockchain.chain),
-            }
+    @app.get('/chain')
+    def get_chain():
+        response = {
+                'chain' : blockchain.chain,
+                'length': len(blockchain.chain),
+                }
+
+        return response
 
-    return response
+    return app
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="localhost", port=cfg.port)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Blockchain mining server.")
+    parser.add_argument("--port", type=int, default=cfg.port, help="Port to listen on (default: config.port).")
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_app(), host="localhost", port=args.port)
@@ -0,0 +1,97 @@
+import argparse
+import json
+import random
+from uuid import UUID
+
+from config import chain_length, tx_amount, target_block_times, workload_seed, trace_file
+
+ACCOUNT_POOL_SIZE = 16  # Distinct sender/recipient IDs drawn from the seeded generator
+
+def round_specs(difficulty_mode="puzzle"):
+    """
+    Difficulty and transactions per block for the 9 benchmark rounds.
+    In target mode each round fixes a target block time (seconds) instead of a puzzle difficulty.
+    """
+    if difficulty_mode == "target":
+        return [
+            {"target_block_time": block_time, "tx_per_block": tx_per_block}
+            for block_time in target_block_times
+            for tx_per_block in [5, 10, 15]
+        ]
+
+    return [
+        {"puzzle": puzzle, "tx_per_block": tx_per_block}
+        for puzzle in [2, 4, 6]
+        for tx_per_block in [5, 10, 15]
+    ]
+
+def seeded_id(rng):
+    """
+    Draw a uuid4-style hex ID from a seeded generator.
+    """
+    return UUID(int=rng.getrandbits(128), version=4).hex
+
+def generate_trace(seed=workload_seed, difficulty_mode="puzzle", blocks_per_round=chain_length, max_amount=tx_amount):
+    """
+    Generate a deterministic list of workload events:
+    one "round" event per round, followed by its "tx" events and a "mine" trigger per block.
+    """
+    rng = random.Random(seed)
+    accounts = [seeded_id(rng) for _ in range(ACCOUNT_POOL_SIZE)]
+
+    events = []
+    for round_number, spec in enumerate(round_specs(difficulty_mode), start=1):
+        events.append({"op": "round", "round": round_number, **spec})
+        for _ in range(blocks_per_round):
+            for _ in range(spec["tx_per_block"]):
+                sender, recipient = rng.sample(accounts, 2)
+                events.append({"op": "tx", "sender": sender, "recipient": recipient,
+                               "amount": rng.randint(1, max_amount)})
+            events.append({"op": "mine"})
+    return events
+
+def write_trace(events, path):
+    """
+    Write events as JSON lines.
+    """
+    with open(path, "w") as file:
+        for event in events:
+            file.write(json.dumps(event) + "\n")
+    print(f"Trace with {len(events)} events saved to {path}")
+
+def read_trace(path):
+    """
+    Read a JSON-lines trace written by write_trace.
+    """
+    with open(path, "r") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+def split_rounds(events):
+    """
+    Group a trace into (round event, [blocks]) pairs where each block is the list of its tx events.
+    Transactions not followed by a "mine" in their round are dropped; a "mine" before any "round"
+    is an error, since the block would have no difficulty.
+    """
+    rounds = []
+    pending = []
+    for event in events:
+        if event["op"] == "round":
+            rounds.append((event, []))
+            pending = []
+        elif event["op"] == "tx":
+            pending.append(event)
+        elif event["op"] == "mine":
+            if not rounds:
+                raise ValueError("Trace has a 'mine' event before its first 'round' event")
+            rounds[-1][1].append(pending)
+            pending = []
+    return rounds
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a seeded blockchain workload trace for replay.")
+    parser.add_argument("--seed", type=int, default=workload_seed, help="Seed for transactions and account IDs.")
+    parser.add_argument("--difficulty_mode", type=str, choices=["puzzle", "target"], default="puzzle", help="Express rounds as puzzle difficulties or as target block times.")
+    parser.add_argument("--output", type=str, default=trace_file, help="Path of the JSON-lines trace to write.")
+    args = parser.parse_args()
+
+    write_trace(generate_trace(args.seed, args.difficulty_mode), args.output)
@@ -1,15 +1,31 @@
 import os
+import sys
+import json
+import math
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import argparse
+from scipy.stats import norm, t as student_t
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test_data"))
+from hashbench.store import load_wide, read_round_files, runs
+from workload import round_specs
 
 # Define hash algorithms and rounds
 hash_names = ["blake2b", "blake2s", "blake3", "sha256", "sha512"]
 rounds = [f"round{i}" for i in range(1, 10)]
 
+# Round files without recorded targets predate target mode and replays: they used the built-in puzzle rounds
+legacy_difficulties = {str(i): {"puzzle": spec["puzzle"]} for i, spec in enumerate(round_specs("puzzle"), start=1)}
+
 # Argument parser to accept parameters
 parser = argparse.ArgumentParser(description="Visualize hash algorithm performance.")
 parser.add_argument("--folder", type=str, required=True, help="Folder for reading results and saving images (e.g., MacOs, Wins)")
+parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level for intervals and sample size estimates.")
+parser.add_argument("--rel_error", type=float, default=0.05, help="Target relative half-width of the confidence interval used for required sample sizes.")
+parser.add_argument("--source", type=str, choices=["files", "store"], default="files", help="Read roundN.txt files or the latest blockchain runs labelled --folder in the results store.")
 args = parser.parse_args()
 
 # Input and output directories based on argument
@@ -19,25 +35,120 @@ output_dir = os.path.join("visualization", args.folder)
 # Ensure output directory exists
 os.makedirs(output_dir, exist_ok=True)
 
-# Function to load results for a specific hash algorithm
+# Function to summarize one round: average time and the raw per-block samples
+def round_entries(hash_name, round_name, blocks, difficulty):
+    blocks = blocks.dropna(subset=["Mining Time (ns)"])  # Blocks the client could not record
+    times = blocks["Mining Time (ns)"].astype(int).tolist()
+    avg_time_ns = sum(times) / len(times) if times else 0
+    data = {"Hash": hash_name, "Round": round_name, "AvgTime(ns)": avg_time_ns}
+
+    def complete(column):
+        # Per-block values, or [] when the column was not recorded for every block
+        return blocks[column].tolist() if column in blocks and blocks[column].notna().all() else []
+
+    sample = {"Hash": hash_name, "Round": round_name, "Times": times, "Nonces": complete("Nonces"),
+              "PowTimes": complete("PoW Time (ns)"), "ExpectedWork": complete("Expected Work"), "Difficulty": difficulty}
+    return data, sample
+
+# Function to load the round files of a specific hash algorithm
 def load_results(hash_name):
     data = []
+    samples = []
+    df = read_round_files(os.path.join(base_dir, hash_name))
     for round_name in rounds:
-        file_path = os.path.join(base_dir, hash_name, f"{round_name}.txt")
-        if os.path.exists(file_path):
-            with open(file_path, "r") as file:
-                times = [int(line.strip()) for line in file.readlines()]  # Read nanoseconds
-                avg_time_ns = sum(times) / len(times) if times else 0
-                data.append({"Hash": hash_name, "Round": round_name, "AvgTime(ns)": avg_time_ns})
-    return data
+        blocks = df[df["Round"] == int(round_name[len("round"):])]
+        if not blocks.empty:
+            # Round files carry no config: rely on recorded targets, else on the built-in puzzle rounds
+            recorded = "Expected Work" in blocks and blocks["Expected Work"].notna().any()
+            difficulty = {} if recorded else legacy_difficulties.get(round_name[len("round"):], {})
+            round_data, sample = round_entries(hash_name, round_name, blocks, difficulty)
+            data.append(round_data)
+            samples.append(sample)
+    return data, samples
+
+# Function to load the latest stored run of a hash algorithm from the results store
+def load_results_from_store(hash_name):
+    data = []
+    samples = []
+    df = load_wide(benchmark="blockchain", label=args.folder, algorithm=hash_name, latest=True)
+    configs = {row.run_id: json.loads(row.config or "{}") for row in runs().itertuples()} if not df.empty else {}
+    for round_name in rounds:
+        blocks = df[df["round"] == int(round_name[len("round"):])].sort_values("sample") if not df.empty else df
+        if blocks.empty:
+            continue
+        # Round difficulties come from the run config; imported legacy runs have none and used the puzzle rounds
+        config = configs.get(blocks["run_id"].iloc[0], {})
+        difficulties = config.get("rounds") or (legacy_difficulties if config.get("difficulty_mode", "puzzle") == "puzzle"
+                                                and not config.get("trace") else {})
+        round_data, sample = round_entries(hash_name, round_name, blocks, difficulties.get(round_name[len("round"):], {}))
+        data.append(round_data)
+        samples.append(sample)
+    return data, samples
+
+# Summarize per-block samples: mean with CI, proof-of-work hashrate and time normalized to the expected
+# work 2**256 / target (recorded per block, or 16**puzzle from the round's configured difficulty)
+def pow_statistics(samples, confidence, rel_error):
+    z = norm.ppf(0.5 + confidence / 2)
+    rows = []
+    for sample in samples:
+        times = np.asarray(sample["Times"], dtype=float)
+        n = len(times)
+        if n < 2:
+            continue
+        t_crit = student_t.ppf(0.5 + confidence / 2, df=n - 1)
+        mean, std = times.mean(), times.std(ddof=1)
+        half_width = t_crit * std / math.sqrt(n)
+        row = {
+            "Hash": sample["Hash"],
+            "Round": sample["Round"],
+            "Puzzle": sample["Difficulty"].get("puzzle"),
+            "TargetBlockTime(s)": sample["Difficulty"].get("target_block_time"),
+            "Blocks": n,
+            "MeanTime(ns)": mean,
+            "CILow(ns)": mean - half_width,
+            "CIHigh(ns)": mean + half_width,
+            "RequiredBlocks": math.ceil((z * std / (rel_error * mean)) ** 2),
+        }
+
+        if len(sample["Nonces"]) == n:
+            nonces = np.asarray(sample["Nonces"], dtype=float)
+            # Hashrate is fitted on proof-of-work time; older round files only have the whole block time
+            pow_recorded = len(sample["PowTimes"]) == n
+            pow_times = np.asarray(sample["PowTimes"], dtype=float) if pow_recorded else times
+            # Ratio estimator of time per nonce; its variance comes from the residuals t_i - r * n_i
+            ns_per_nonce = pow_times.sum() / nonces.sum()
+            residual_std = (pow_times - ns_per_nonce * nonces).std(ddof=1)
+            rel_se = residual_std / (nonces.mean() * ns_per_nonce * math.sqrt(n))
+            if len(sample["ExpectedWork"]) == n:
+                expected_work = float(np.mean(sample["ExpectedWork"]))
+            elif row["Puzzle"] is not None:
+                expected_work = 16 ** row["Puzzle"]  # 2**256 / target, the target being 16**(64 - puzzle)
+            else:
+                expected_work = float("nan")
+            row.update({
+                "TimeBasis": "pow" if pow_recorded else "block",
+                "MeanNonces": nonces.mean(),
+                "ExpectedWork": expected_work,
+                "Hashrate(nonces/s)": 1e9 / ns_per_nonce,
+                "HashrateCILow": 1e9 / (ns_per_nonce * (1 + t_crit * rel_se)),
+                "HashrateCIHigh": 1e9 / (ns_per_nonce * max(1 - t_crit * rel_se, 1e-12)),
+                "NormalizedTime(ns)": ns_per_nonce * expected_work,
+                "RequiredBlocksNormalized": math.ceil((z * rel_se * math.sqrt(n) / rel_error) ** 2),
+            })
+        rows.append(row)
+    return pd.DataFrame(rows)
 
 # Load results for all hash algorithms
 all_data = []
+all_samples = []
 for hash_name in hash_names:
-    all_data.extend(load_results(hash_name))
+    data, samples = load_results_from_store(hash_name) if args.source == "store" else load_results(hash_name)
+    all_data.extend(data)
+    all_samples.extend(samples)
 
 # Convert data to a DataFrame
 df = pd.DataFrame(all_data)
+stats_df = pow_statistics(all_samples, args.confidence, args.rel_error)
 
 # Plot grouped bar chart for specified rounds
 def visualize_results(dataframe, round_indices, title, filename):
@@ -79,3 +190,36 @@ visualize_results(df, round_indices=range(3, 6),
 visualize_results(df, round_indices=range(6, 9), 
                   title="Execution Time in Nanoseconds (Rounds 7-9)", 
                   filename="rounds_7_to_9.png")
+
+# Save per-round statistics and, when nonce counts were recorded, compare hashrates
+stats_path = os.path.join(output_dir, "pow_statistics.csv")
+stats_df.to_csv(stats_path, index=False)
+print(f"Saved: {stats_path}")
+
+def visualize_hashrate(dataframe, filename):
+    plt.figure(figsize=(12, 6))
+    x = range(len(rounds))
+    width = 0.15
+    colors = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd"]
+
+    for i, hash_name in enumerate(hash_names):
+        subset = dataframe[dataframe["Hash"] == hash_name].set_index("Round").reindex(rounds)
+        rates = subset["Hashrate(nonces/s)"].values
+        errors = [rates - subset["HashrateCILow"].values, subset["HashrateCIHigh"].values - rates]
+        plt.bar([p + i * width for p in x], rates, width=width, yerr=errors, capsize=2, label=hash_name, color=colors[i])
+
+    plt.title("Proof-of-Work Hashrate per Round", fontsize=16)
+    plt.xlabel("Rounds", fontsize=14)
+    plt.ylabel("Hashrate (nonces/s)", fontsize=14)
+    plt.xticks([p + 2 * width for p in x], rounds, rotation=45)
+    plt.legend(title="Hash Algorithm")
+    plt.grid(axis="y", linestyle="--", alpha=0.7)
+    plt.tight_layout()
+
+    output_path = os.path.join(output_dir, filename)
+    plt.savefig(output_path)
+    print(f"Saved: {output_path}")
+    plt.close()
+
+if "Hashrate(nonces/s)" in stats_df.columns:
+    visualize_hashrate(stats_df, "hashrate.png")
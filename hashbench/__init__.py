@@ -0,0 +1,3 @@
+"""
+Shared helpers for the text-input and blockchain benchmark scripts.
+"""
@@ -0,0 +1,82 @@
+import math
+from statistics import mean, median, stdev
+
+from hashbench.timing import Timer
+
+MAD_SCALE = 1.4826  # Makes the MAD a consistent estimator of the standard deviation for normal data
+
+
+def robust_summary(samples, outlier_threshold=3.5):
+    """
+    Median, MAD and an outlier mask (modified z-score above `outlier_threshold`) for a list of samples.
+    """
+    center = median(samples)
+    mad = median(abs(x - center) for x in samples)
+    if mad == 0:
+        return center, mad, [False] * len(samples)
+    return center, mad, [abs(x - center) / (MAD_SCALE * mad) > outlier_threshold for x in samples]
+
+
+def relative_ci(samples, confidence=0.95):
+    """
+    Half-width of the Student-t confidence interval of the mean (n - 1 degrees of freedom), relative
+    to the mean. The t quantile keeps the interval honest at the few runs run_adaptive may stop at.
+    """
+    from scipy.stats import t as student_t  # Deferred so importing hashbench stays light
+
+    if len(samples) < 2 or mean(samples) == 0:
+        return math.inf
+    t_crit = student_t.ppf(0.5 + confidence / 2, df=len(samples) - 1)
+    return t_crit * stdev(samples) / math.sqrt(len(samples)) / mean(samples)
+
+
+def calibrate_inner_loops(function, min_sample_ns, max_inner_loops=10000):
+    """
+    Number of back-to-back calls needed for one timed sample to last at least `min_sample_ns`.
+    """
+    with Timer(hardware=False) as timer:
+        function()
+    return max(1, min(max_inner_loops, math.ceil(min_sample_ns / max(timer.wall_ns, 1))))
+
+
+def run_adaptive(function, target_rel_ci=0.02, time_budget=10.0, min_runs=5, max_runs=200,
+                 min_sample_ns=20_000_000, confidence=0.95, outlier_threshold=3.5):
+    """
+    Time `function` repeatedly until the relative CI of the mean (outliers excluded) falls below
+    `target_rel_ci`, `max_runs` samples were taken or `time_budget` seconds were spent.
+
+    Short calls are grouped into calibrated inner loops; every reported value is per call.
+    Returns a dict with the kept per-call samples (ms), their Timer records, and the statistics.
+    """
+    inner_loops = calibrate_inner_loops(function, min_sample_ns)
+
+    samples = []
+    records = []
+    spent_ns = 0
+    while len(samples) < max_runs:
+        with Timer() as timer:
+            for _ in range(inner_loops):
+                function()
+        spent_ns += timer.wall_ns
+        samples.append(timer.wall_ns / inner_loops / 1e6)
+        records.append({name: None if value is None else value / inner_loops for name, value in timer.record().items()})
+
+        if len(samples) >= min_runs:
+            _, _, outliers = robust_summary(samples, outlier_threshold)
+            kept = [x for x, is_outlier in zip(samples, outliers) if not is_outlier]
+            if relative_ci(kept, confidence) <= target_rel_ci or spent_ns >= time_budget * 1e9:
+                break
+
+    center, mad, outliers = robust_summary(samples, outlier_threshold)
+    kept_samples = [x for x, is_outlier in zip(samples, outliers) if not is_outlier]
+    kept_records = [r for r, is_outlier in zip(records, outliers) if not is_outlier]
+    return {
+        "samples": kept_samples,
+        "records": kept_records,
+        "runs": len(samples),
+        "inner_loops": inner_loops,
+        "outliers": sum(outliers),
+        "median": center,
+        "mad": mad,
+        "rel_ci": relative_ci(kept_samples, confidence),
+    }
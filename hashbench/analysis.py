@@ -0,0 +1,175 @@
+import argparse
+import itertools
+
+import numpy as np
+import pandas as pd
+from scipy.stats import false_discovery_control, mannwhitneyu, ttest_ind
+
+BOOTSTRAP_SAMPLES = 2000
+RESULT_COLUMNS = [
+    "Algorithm 1", "Algorithm 2", "T-Statistic", "P-Value", "U-Statistic", "U P-Value", "Cohen's d", "Hedges' g",
+    "Cliff's Delta", "Mean Ratio", "Ratio CI Low", "Ratio CI High", "N 1", "N 2",
+    "P-Value (Holm)", "P-Value (BH)", "U P-Value (BH)",
+]
+
+
+def holm(p_values):
+    """
+    Holm-Bonferroni adjusted p-values (NaNs are left out of the family).
+    """
+    p_values = np.asarray(p_values, dtype=float)
+    adjusted = np.full_like(p_values, np.nan)
+    valid = np.flatnonzero(~np.isnan(p_values))
+    order = valid[np.argsort(p_values[valid])]
+    m = len(order)
+    adjusted[order] = np.minimum(np.maximum.accumulate((m - np.arange(m)) * p_values[order]), 1.0)
+    return adjusted
+
+
+def benjamini_hochberg(p_values):
+    """
+    Benjamini-Hochberg adjusted p-values (NaNs are left out of the family).
+    """
+    p_values = np.asarray(p_values, dtype=float)
+    adjusted = np.full_like(p_values, np.nan)
+    valid = ~np.isnan(p_values)
+    if valid.any():
+        adjusted[valid] = false_discovery_control(p_values[valid])
+    return adjusted
+
+
+def bootstrap_ratio_ci(x, y, confidence=0.95, n_boot=BOOTSTRAP_SAMPLES, rng=None):
+    """
+    Percentile bootstrap CI of mean(x) / mean(y) for each row of the (pairs, n) arrays `x` and `y`.
+    Resamples are drawn once as multinomial count vectors shared by all rows, so every bootstrap mean
+    is one matrix product.
+    """
+    rng = rng or np.random.default_rng()
+    x_weights = rng.multinomial(x.shape[1], np.full(x.shape[1], 1 / x.shape[1]), size=n_boot) / x.shape[1]
+    y_weights = rng.multinomial(y.shape[1], np.full(y.shape[1], 1 / y.shape[1]), size=n_boot) / y.shape[1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = (x @ x_weights.T) / (y @ y_weights.T)
+        return np.quantile(ratios, [(1 - confidence) / 2, (1 + confidence) / 2], axis=1)
+
+
+def welch_t_test(x, y, axis=-1):
+    """
+    Welch's t-test (unequal variances) of `x` against `y` along `axis`: (t statistic, p-value).
+    Shared by the pairwise analysis and the regression compare, so both tools agree.
+    """
+    return ttest_ind(x, y, axis=axis, equal_var=False)
+
+
+def collect_pairs(df, value, by, algorithm="Algorithm", pairs=None, min_samples=2):
+    """
+    Group samples once and list every algorithm pair to compare within each `by` group.
+    Returns (group key, algorithm 1, algorithm 2, samples 1, samples 2) tuples.
+    """
+    by = list(by)
+    samples = {key: group.to_numpy(float) for key, group in df.groupby(by + [algorithm], sort=True)[value]}
+    algorithms_by_group = {}
+    for key, values in samples.items():
+        if len(values) >= min_samples:
+            algorithms_by_group.setdefault(key[:-1], []).append(key[-1])
+
+    collected = []
+    for group_key, algorithms in algorithms_by_group.items():
+        candidates = pairs if pairs is not None else itertools.combinations(algorithms, 2)
+        for algo1, algo2 in candidates:
+            if algo1 in algorithms and algo2 in algorithms:
+                collected.append((group_key, algo1, algo2, samples[group_key + (algo1,)], samples[group_key + (algo2,)]))
+    return collected
+
+
+def pairwise_tests(df, value, by, algorithm="Algorithm", pairs=None, confidence=0.95, n_boot=BOOTSTRAP_SAMPLES, seed=0):
+    """
+    Compare every pair of algorithms within each group of `by` columns (e.g. data size, or OS and size).
+
+    Pairs with the same sample counts are stacked into 2-D arrays so the Welch t-test, Mann-Whitney U,
+    effect sizes and bootstrap CIs run once per shape instead of once per pair. Returns one row per pair
+    with T-Statistic/P-Value (Welch), U-Statistic/U P-Value, Cohen's d, Hedges' g, Cliff's delta, the ratio
+    of means with its bootstrap CI, and Holm / Benjamini-Hochberg adjusted p-values over the whole table.
+    """
+    collected = collect_pairs(df, value, by, algorithm, pairs)
+    if not collected:
+        return pd.DataFrame(columns=list(by) + RESULT_COLUMNS)
+
+    rng = np.random.default_rng(seed)
+    shapes = {}
+    for index, (_, _, _, x, y) in enumerate(collected):
+        shapes.setdefault((len(x), len(y)), []).append(index)
+
+    stats = {}
+    for (n1, n2), indices in shapes.items():
+        x = np.stack([collected[i][3] for i in indices])
+        y = np.stack([collected[i][4] for i in indices])
+        t_stat, p_value = welch_t_test(x, y, axis=1)
+        # Exact U distribution for small samples as scipy picks per pair (decided per shape, not per array)
+        method = "exact" if max(n1, n2) <= 8 else "asymptotic"
+        u_stat, u_p_value = mannwhitneyu(x, y, axis=1, alternative="two-sided", method=method)
+
+        x_mean, y_mean = x.mean(axis=1), y.mean(axis=1)
+        pooled_sd = np.sqrt(((n1 - 1) * x.var(axis=1, ddof=1) + (n2 - 1) * y.var(axis=1, ddof=1)) / (n1 + n2 - 2))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cohen_d = (x_mean - y_mean) / pooled_sd
+        hedges_g = cohen_d * (1 - 3 / (4 * (n1 + n2) - 9))
+        cliff_delta = 2 * u_stat / (n1 * n2) - 1
+        ratio_low, ratio_high = bootstrap_ratio_ci(x, y, confidence, n_boot, rng)
+
+        for row, i in enumerate(indices):
+            stats[i] = (t_stat[row], p_value[row], u_stat[row], u_p_value[row], cohen_d[row], hedges_g[row],
+                        cliff_delta[row], x_mean[row] / y_mean[row], ratio_low[row], ratio_high[row], n1, n2)
+
+    rows = []
+    for i, (group_key, algo1, algo2, _, _) in enumerate(collected):
+        (t_stat, p_value, u_stat, u_p_value, cohen_d, hedges_g, cliff_delta,
+         ratio, ratio_low, ratio_high, n1, n2) = stats[i]
+        rows.append({
+            **dict(zip(by, group_key)),
+            "Algorithm 1": algo1,
+            "Algorithm 2": algo2,
+            "T-Statistic": t_stat,
+            "P-Value": p_value,
+            "U-Statistic": u_stat,
+            "U P-Value": u_p_value,
+            "Cohen's d": cohen_d,
+            "Hedges' g": hedges_g,
+            "Cliff's Delta": cliff_delta,
+            "Mean Ratio": ratio,
+            "Ratio CI Low": ratio_low,
+            "Ratio CI High": ratio_high,
+            "N 1": n1,
+            "N 2": n2,
+        })
+
+    result = pd.DataFrame(rows)
+    result["P-Value (Holm)"] = holm(result["P-Value"])
+    result["P-Value (BH)"] = benjamini_hochberg(result["P-Value"])
+    result["U P-Value (BH)"] = benjamini_hochberg(result["U P-Value"])
+    return result
+
+
+if __name__ == "__main__":
+    import sys
+
+    from hashbench.store import config_conflicts, load, load_wide
+
+    parser = argparse.ArgumentParser(description="All-pairs statistical comparison of algorithms from the results store.")
+    parser.add_argument("--benchmark", type=str, default="speed_single_thread", help="Benchmark name in the results store.")
+    parser.add_argument("--metric", type=str, default="Timing (ms)", help="Metric to compare.")
+    parser.add_argument("--by", type=str, nargs="+", default=["os", "size_bytes"], help="Columns that define a comparison group.")
+    parser.add_argument("--label", type=str, nargs="+", default=None, help="Restrict to these results labels.")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the bootstrap CIs.")
+    parser.add_argument("--output", type=str, required=True, help="CSV file for the results.")
+    args = parser.parse_args()
+
+    filters = {"benchmark": args.benchmark, "metric": args.metric, "label": args.label, "latest": True}
+    # Samples of one comparison group must come from a single config, or different setups are pooled
+    conflicts = config_conflicts(load(**filters), [*args.by, "algorithm", "variant"])
+    if not conflicts.empty:
+        sys.exit("Runs with different configs share a comparison group; narrow --label or add 'label'/'variant' to --by:\n"
+                 + conflicts.to_string(index=False))
+    df = load_wide(**filters)
+    result = pairwise_tests(df, args.metric, args.by, algorithm="algorithm", confidence=args.confidence)
+    result.to_csv(args.output, index=False)
+    print(f"{len(result)} comparisons saved to {args.output}")
@@ -0,0 +1,218 @@
+import argparse
+import functools
+import mmap
+import os
+import sqlite3
+
+from hashbench.hashers import hash_constructor
+
+# FastCDC sizes: chunks are cut between MIN_SIZE and MAX_SIZE bytes, around AVG_SIZE on average
+MIN_SIZE = 2 * 1024
+AVG_SIZE = 8 * 1024
+MAX_SIZE = 64 * 1024
+NORMALIZATION = 2  # Extra mask bits before AVG_SIZE and fewer after it, narrowing the size distribution
+GEAR_SEED = 2024
+WINDOW = 64  # A 64-bit Gear hash only depends on the last 64 bytes
+SEGMENT_SIZE = 64 * 1024  # Bytes hashed per vectorized pass; the uint64 temporaries then stay in cache
+
+
+@functools.lru_cache(maxsize=1)
+def gear_table():
+    """
+    256 random 64-bit values, one per byte value, fixed by GEAR_SEED so chunk boundaries are reproducible.
+    """
+    import numpy as np
+
+    return np.random.default_rng(GEAR_SEED).integers(0, 2 ** 64, size=256, dtype=np.uint64)
+
+
+def top_bits_mask(bits):
+    import numpy as np
+
+    return np.uint64(((1 << bits) - 1) << (64 - bits))
+
+
+def gear_hashes(data):
+    """
+    Gear rolling hash h[i] = (h[i-1] << 1) + gear[data[i]] at every position of a uint8 array.
+    Unrolled, h[i] is the sum of gear[data[i-k]] << k over the last 64 bytes, which log2(64) shifted
+    additions compute for the whole array at once (uint64 arithmetic wraps like the rolling hash).
+    """
+    import numpy as np
+
+    hashes = gear_table()[data]
+    shift = 1
+    while shift < WINDOW:
+        hashes[shift:] += hashes[:-shift] << np.uint64(shift)
+        shift *= 2
+    return hashes
+
+
+def candidate_ends(data, strict_bits, loose_bits):
+    """
+    Chunk ends (offset after the byte) where the Gear hash has its top `loose_bits`, resp. `strict_bits`,
+    all zero. The strict candidates are a subset of the loose ones.
+    """
+    import numpy as np
+
+    array = np.frombuffer(data, dtype=np.uint8)
+    strict_mask, loose_mask = top_bits_mask(strict_bits), top_bits_mask(loose_bits)
+    strict_ends, loose_ends = [], []
+    for start in range(0, len(array), SEGMENT_SIZE):
+        context = min(start, WINDOW - 1)  # Bytes before the segment that still affect its hashes
+        hashes = gear_hashes(array[start - context:start + SEGMENT_SIZE])[context:]
+        loose = np.flatnonzero((hashes & loose_mask) == 0)
+        strict = loose[(hashes[loose] & strict_mask) == 0]
+        loose_ends.append(loose + start + 1)
+        strict_ends.append(strict + start + 1)
+    return np.concatenate(strict_ends), np.concatenate(loose_ends)
+
+
+def cut_points(data, min_size=MIN_SIZE, avg_size=AVG_SIZE, max_size=MAX_SIZE):
+    """
+    FastCDC chunk boundaries of a buffer, as a list of chunk end offsets (the last one is len(data)).
+    Past `min_size`, a chunk ends at the first strict candidate before `avg_size`, else at the first
+    loose candidate before `max_size`, else at `max_size`.
+    """
+    import numpy as np
+
+    length = len(data)
+    if length == 0:
+        return []
+    bits = avg_size.bit_length() - 1
+    strict, loose = candidate_ends(data, bits + NORMALIZATION, bits - NORMALIZATION)
+
+    def first(ends, low, high):
+        index = np.searchsorted(ends, low)
+        return int(ends[index]) if index < len(ends) and ends[index] < high else None
+
+    cuts = []
+    start = 0
+    while length - start > min_size:
+        end = first(strict, start + min_size, start + avg_size)
+        if end is None:
+            end = first(loose, start + avg_size, start + max_size)
+        if end is None:
+            end = min(start + max_size, length)
+        cuts.append(end)
+        start = end
+    if start < length:
+        cuts.append(length)
+    return cuts
+
+
+def hash_chunks(data, cuts, algorithm):
+    """
+    (offset, size, digest) of every chunk of a buffer.
+    """
+    constructor = hash_constructor(algorithm)
+    view = memoryview(data)
+    chunks = []
+    start = 0
+    for end in cuts:
+        chunks.append((start, end - start, constructor(view[start:end]).digest()))
+        start = end
+    view.release()
+    return chunks
+
+
+def chunk_file(file_path, algorithm, min_size=MIN_SIZE, avg_size=AVG_SIZE, max_size=MAX_SIZE):
+    """
+    Content-defined chunks of a file as (offset, size, digest), reading it through mmap.
+    """
+    if os.path.getsize(file_path) == 0:
+        return []
+    with open(file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        cuts = cut_points(mapped, min_size, avg_size, max_size)
+        return hash_chunks(mapped, cuts, algorithm)
+
+
+class ChunkIndex:
+    """
+    Chunk digest -> (size, references) for one algorithm, kept in memory and saved to / loaded from
+    SQLite. Tracks logical bytes added and unique bytes stored, whose ratio is the dedupe ratio.
+    """
+
+    def __init__(self, algorithm):
+        self.algorithm = algorithm
+        self.chunks = {}
+        self.logical_bytes = 0
+        self.unique_bytes = 0
+        self.references = 0
+
+    def add(self, digest, size):
+        """
+        Reference a chunk; returns True when it was not in the index yet.
+        """
+        self.logical_bytes += size
+        self.references += 1
+        entry = self.chunks.get(digest)
+        if entry is not None:
+            entry[1] += 1
+            return False
+        self.chunks[digest] = [size, 1]
+        self.unique_bytes += size
+        return True
+
+    def add_chunks(self, chunks):
+        """
+        Reference every (offset, size, digest) of a chunked file; returns the number of new chunks.
+        """
+        return sum(self.add(digest, size) for _, size, digest in chunks)
+
+    def dedupe_ratio(self):
+        return self.logical_bytes / self.unique_bytes if self.unique_bytes else 1.0
+
+    def stats(self):
+        return {
+            "Chunks": self.references,
+            "Unique Chunks": len(self.chunks),
+            "Logical (MB)": self.logical_bytes / 1024 / 1024,
+            "Stored (MB)": self.unique_bytes / 1024 / 1024,
+            "Avg Chunk (KB)": self.logical_bytes / self.references / 1024 if self.references else 0.0,
+            "Dedupe Ratio": self.dedupe_ratio(),
+        }
+
+    def save(self, path):
+        with sqlite3.connect(path) as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS chunks (algorithm TEXT, digest BLOB, size INTEGER, refs INTEGER, "
+                               "PRIMARY KEY (algorithm, digest))")
+            connection.execute("DELETE FROM chunks WHERE algorithm = ?", (self.algorithm,))
+            connection.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?)",
+                                   ((self.algorithm, digest, size, refs) for digest, (size, refs) in self.chunks.items()))
+        connection.close()
+
+    @classmethod
+    def load(cls, path, algorithm):
+        index = cls(algorithm)
+        if not os.path.exists(path):
+            return index
+        with sqlite3.connect(path) as connection:
+            rows = connection.execute("SELECT digest, size, refs FROM chunks WHERE algorithm = ?", (algorithm,)).fetchall()
+        connection.close()
+        for digest, size, refs in rows:
+            index.chunks[digest] = [size, refs]
+            index.logical_bytes += size * refs
+            index.unique_bytes += size
+            index.references += refs
+        return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Split files into content-defined chunks (FastCDC), hash them and report deduplication.")
+    parser.add_argument("paths", type=str, nargs="+", help="Files to chunk.")
+    parser.add_argument("--algorithm", type=str, default="blake3", help="Chunk hash algorithm.")
+    parser.add_argument("--index", type=str, default=None, help="SQLite chunk index to extend across runs (default: in memory only).")
+    parser.add_argument("--min_size", type=int, default=MIN_SIZE, help="Minimum chunk size in bytes.")
+    parser.add_argument("--avg_size", type=int, default=AVG_SIZE, help="Target average chunk size in bytes (a power of two).")
+    parser.add_argument("--max_size", type=int, default=MAX_SIZE, help="Maximum chunk size in bytes.")
+    args = parser.parse_args()
+
+    index = ChunkIndex.load(args.index, args.algorithm) if args.index else ChunkIndex(args.algorithm)
+    for file_path in args.paths:
+        chunks = chunk_file(file_path, args.algorithm, args.min_size, args.avg_size, args.max_size)
+        print(f"{file_path}: {len(chunks)} chunks, {index.add_chunks(chunks)} new")
+    if args.index:
+        index.save(args.index)
+        print(f"Chunk index saved to {args.index}")
+    print(", ".join(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}" for key, value in index.stats().items()))
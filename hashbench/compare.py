@@ -0,0 +1,141 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from hashbench.analysis import welch_t_test
+from hashbench.store import MB, config_conflicts, load
+
+# Metric compared by default for each benchmark; all are durations, so higher is worse
+DEFAULT_METRICS = {
+    "speed_single_thread": "Timing (ms)",
+    "speed_multi_thread": "Timing (ms)",
+    "resource": "Wall Time (ns)",
+    "small_message": "ns/hash",
+    "blockchain": "Mining Time (ns)",
+    "blockchain_phases": "Mining(ns)",
+    "blockchain_http": "HTTPTotal(ns)",
+    "startup": "Wall Time (ms)",
+    "chunk_size": "Timing (ms)",
+    "filehash": "Timing (ms)",
+    "cdc": "Timing (ms)",
+    "merkle_leaves": "ns/record",
+}
+HIGHER_IS_BETTER = {"Speed (MBps)", "Hashes/s", "Throughput (MBps)", "Files/s", "Speed (GBps)", "Records/s"}
+CASE_COLUMNS = ["algorithm", "size_bytes", "round", "variant"]
+
+
+def load_side(source, benchmark, metric, path=None):
+    """
+    Samples of `metric` for one side of the comparison, in long form with the case columns.
+    `source` is a CSV file (Algorithm, Data Size (MB) and the metric column), a run id in the
+    results store, or a results label whose latest runs are used. Raises ValueError when runs with
+    different configs share a case, since their samples would be pooled.
+    """
+    if os.path.exists(source):
+        df = pd.read_csv(source)
+        return pd.DataFrame({
+            "algorithm": df["Algorithm"],
+            "size_bytes": (df["Data Size (MB)"] * MB).round().astype("Int64") if "Data Size (MB)" in df else pd.NA,
+            "round": pd.NA,
+            "variant": pd.NA,
+            "value": df[metric],
+        })
+
+    df = load(benchmark=benchmark, metric=metric, run_id=source, path=path)
+    if df.empty:
+        df = load(benchmark=benchmark, metric=metric, label=source, latest=True, path=path)
+    if df.empty:
+        raise ValueError(f"No '{metric}' measurements of {benchmark} found for '{source}'")
+    conflicts = config_conflicts(df, CASE_COLUMNS)
+    if not conflicts.empty:
+        raise ValueError(f"'{source}' holds runs with different configs for the same case; select a single run id:\n"
+                         + conflicts.to_string(index=False))
+    return df[CASE_COLUMNS + ["value"]]
+
+
+def case_groups(df):
+    """
+    Samples per (algorithm, size, round, variant) case; missing case fields become -1 or "" so cases align.
+    """
+    df = df.assign(
+        algorithm=df["algorithm"].astype(str),
+        size_bytes=pd.to_numeric(df["size_bytes"]).fillna(-1).astype("int64"),
+        round=pd.to_numeric(df["round"]).fillna(-1).astype("int64"),
+        variant=df["variant"].fillna("").astype(str),
+    )
+    return {key: group["value"].to_numpy(float) for key, group in df.groupby(CASE_COLUMNS)}
+
+
+def compare_samples(baseline, candidate, metric, threshold=0.05, alpha=0.05):
+    """
+    Align cases by algorithm, size, round and variant and run a Welch t-test per case.
+    A case regresses when the candidate is worse by more than `threshold` (relative change of the
+    mean) and the difference is significant at `alpha`. Cases with fewer than 2 samples on either
+    side cannot be tested and get the status "insufficient data".
+    """
+    sign = -1 if metric in HIGHER_IS_BETTER else 1
+    base_groups, cand_groups = case_groups(baseline), case_groups(candidate)
+
+    rows = []
+    for key in sorted(base_groups.keys() & cand_groups.keys()):
+        base, cand = base_groups[key], cand_groups[key]
+        testable = len(base) > 1 and len(cand) > 1
+        t_stat, p_value = welch_t_test(cand, base) if testable else (np.nan, np.nan)
+        change = cand.mean() / base.mean() - 1
+        worse = sign * change > threshold
+        better = sign * change < -threshold
+        significant = bool(p_value < alpha)
+        if not testable:
+            status = "insufficient data"
+        else:
+            status = "regression" if worse and significant else "improvement" if better and significant else "unchanged"
+        algorithm, size_bytes, round_number, variant = key
+        rows.append({
+            "Algorithm": algorithm,
+            "Data Size (MB)": None if size_bytes == -1 else size_bytes / MB,
+            "Round": None if round_number == -1 else round_number,
+            "Variant": variant or None,
+            "Baseline Mean": base.mean(),
+            "Candidate Mean": cand.mean(),
+            "Change (%)": round(change * 100, 2),
+            "T-Statistic": round(t_stat, 4),
+            "P-Value": round(p_value, 6),
+            "Status": status,
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare a candidate run against a baseline and flag significant regressions.")
+    parser.add_argument("--baseline", type=str, required=True, help="Baseline: timing CSV, run id or results label in the store.")
+    parser.add_argument("--candidate", type=str, required=True, help="Candidate: timing CSV, run id or results label in the store.")
+    parser.add_argument("--benchmark", type=str, choices=sorted(DEFAULT_METRICS), default="speed_single_thread", help="Benchmark to compare when reading the store.")
+    parser.add_argument("--metric", type=str, default=None, help="Metric to compare (default depends on --benchmark).")
+    parser.add_argument("--threshold", type=float, default=0.05, help="Minimum relative slowdown of the mean that counts as a regression.")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level of the Welch t-test.")
+    parser.add_argument("--store", type=str, default=None, help="Results store path (default: hashbench.store.DEFAULT_STORE).")
+    parser.add_argument("--output", type=str, default=None, help="Also save the comparison table to this CSV file.")
+    args = parser.parse_args()
+
+    metric = args.metric or DEFAULT_METRICS[args.benchmark]
+    try:
+        baseline = load_side(args.baseline, args.benchmark, metric, args.store)
+        candidate = load_side(args.candidate, args.benchmark, metric, args.store)
+    except ValueError as e:
+        sys.exit(str(e))
+    result = compare_samples(baseline, candidate, metric, args.threshold, args.alpha)
+    if result.empty:
+        sys.exit("No common cases between baseline and candidate")
+
+    print(result.dropna(axis=1, how="all").to_string(index=False))
+    if args.output:
+        result.to_csv(args.output, index=False)
+        print(f"Comparison saved to {args.output}")
+
+    counts = result["Status"].value_counts()
+    print(f"\n{len(result)} cases: {counts.get('regression', 0)} regressions, {counts.get('improvement', 0)} improvements, "
+          f"{counts.get('insufficient data', 0)} with insufficient data (threshold {args.threshold:.0%}, alpha {args.alpha})")
+    sys.exit(1 if counts.get("regression", 0) else 0)
@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+import random
+
+from hashbench.digestcache import cached_digest, default_cache
+
+KINDS = ["zero", "pattern", "random", "text", "json"]
+DEFAULT_SEED = 2024
+DEFAULT_PATTERN = b"AB"
+WRITE_CHUNK_SIZE = 4 * 1024 * 1024
+MANIFEST_NAME = ".manifest.json"
+CHECKSUM_ALGORITHM = "blake2b"  # Digest cache key of file_checksum
+
+# Vocabulary of the synthetic text corpus; sentence ends carry a period and a newline
+WORDS = (
+    "the of and to in is that for it as was with be by on not he this are or his from at which but have an they "
+    "you were her she there been one all we their has would when if so no will more can time out about up them "
+    "said into some could other than then now only its new like over also first two after block chain hash data "
+    "file node value record network transaction amount sender recipient proof work digest merkle tree root"
+).split()
+TEXT_TOKENS = [word.encode("ascii") + b" " for word in WORDS] + [word.encode("ascii") + b".\n" for word in WORDS[:16]]
+TEXT_BLOCK_WORDS = 64 * 1024
+JSON_BLOCK_RECORDS = 4 * 1024
+
+
+def _numpy():
+    """
+    numpy if installed, imported on first use so that benchmark scripts which only check existing files
+    do not pay for it; None falls back to the random module.
+    """
+    try:
+        import numpy
+    except ImportError:  # Fall back to random.randbytes
+        return None
+    return numpy
+
+
+def text_blocks(seed):
+    """
+    Endless blocks of English-like text: words drawn uniformly from a fixed vocabulary.
+    """
+    np = _numpy()
+    if np is not None:
+        generator = np.random.Generator(np.random.PCG64(seed))
+        tokens = np.array(TEXT_TOKENS, dtype=object)
+        while True:
+            yield b"".join(tokens[generator.integers(0, len(tokens), TEXT_BLOCK_WORDS)])
+    rng = random.Random(seed)
+    while True:
+        yield b"".join(rng.choices(TEXT_TOKENS, k=TEXT_BLOCK_WORDS))
+
+
+def json_blocks(seed):
+    """
+    Endless blocks of JSON lines shaped like the blockchain's transactions.
+    """
+    rng = random.Random(seed)
+    record_id = 0
+    while True:
+        lines = []
+        for _ in range(JSON_BLOCK_RECORDS):
+            memo = " ".join(rng.choices(WORDS, k=rng.randint(2, 12)))
+            lines.append(f'{{"id": {record_id}, "sender": "{rng.getrandbits(128):032x}", '
+                         f'"recipient": "{rng.getrandbits(128):032x}", "amount": {rng.randint(1, 10000)}, '
+                         f'"timestamp": {1700000000 + record_id}, "memo": "{memo}"}}\n')
+            record_id += 1
+        yield "".join(lines).encode("ascii")
+
+
+def sized_chunks(blocks, size_in_bytes, chunk_size):
+    """
+    Re-cut an endless stream of variable-size blocks into chunks of `chunk_size` totalling `size_in_bytes`.
+    The last record or word is cut at the file boundary.
+    """
+    buffer = bytearray()
+    remaining = size_in_bytes
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        while len(buffer) < size:
+            buffer += next(blocks)
+        yield bytes(buffer[:size])
+        del buffer[:size]
+        remaining -= size
+
+
+def file_seed(seed, file_name):
+    """
+    Derive a per-file seed so files of the same kind and size differ but stay reproducible.
+    """
+    digest = hashlib.blake2b(f"{seed}:{file_name}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def content_chunks(kind, size_in_bytes, seed, pattern=DEFAULT_PATTERN, chunk_size=WRITE_CHUNK_SIZE):
+    """
+    Yield the file content in chunks: zero bytes, a repeated pattern, a seeded pseudo-random stream,
+    or seeded text/JSON corpora.
+    """
+    if kind == "text":
+        yield from sized_chunks(text_blocks(seed), size_in_bytes, chunk_size)
+        return
+    if kind == "json":
+        yield from sized_chunks(json_blocks(seed), size_in_bytes, chunk_size)
+        return
+    if kind == "random":
+        np = _numpy()
+        if np is not None:
+            generator = np.random.Generator(np.random.PCG64(seed))
+            next_bytes = generator.bytes
+        else:
+            next_bytes = random.Random(seed).randbytes
+    elif kind == "pattern":
+        chunk_size -= chunk_size % len(pattern)  # Keep the pattern aligned across chunks
+        block = pattern * (chunk_size // len(pattern))
+        size_in_bytes -= size_in_bytes % len(pattern)
+    elif kind == "zero":
+        block = bytes(chunk_size)
+    else:
+        raise ValueError(f"Unknown data kind '{kind}'")
+
+    remaining = size_in_bytes
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield next_bytes(size) if kind == "random" else block[:size]
+        remaining -= size
+
+
+def file_checksum(file_path, chunk_size=WRITE_CHUNK_SIZE):
+    """
+    blake2b checksum of a file's content.
+    """
+    hasher = hashlib.blake2b()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def write_file(file_path, kind, size_in_bytes, seed, sparse=True):
+    """
+    Stream a file to disk and return its manifest entry. Zero-filled files are created sparse when `sparse`.
+    """
+    hasher = hashlib.blake2b()
+    with open(file_path, "wb") as file:
+        if kind == "zero" and sparse:
+            file.truncate(size_in_bytes)
+            for chunk in content_chunks(kind, size_in_bytes, seed):
+                hasher.update(chunk)
+        else:
+            for chunk in content_chunks(kind, size_in_bytes, seed):
+                file.write(chunk)
+                hasher.update(chunk)
+    return {"kind": kind, "size": os.path.getsize(file_path), "seed": seed, "checksum": hasher.hexdigest()}
+
+
+def _write_file_task(task):
+    file_path, kind, size_in_bytes, seed, sparse = task
+    entry = write_file(file_path, kind, size_in_bytes, seed, sparse)
+    print(f"Created file: {file_path} with size: {size_in_bytes} bytes ({kind})")
+    return os.path.basename(file_path), entry
+
+
+def load_manifest(folder):
+    path = os.path.join(folder, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def save_manifest(folder, manifest):
+    with open(os.path.join(folder, MANIFEST_NAME), "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+
+
+def expected_size(kind, size_in_bytes, pattern=DEFAULT_PATTERN):
+    return size_in_bytes - size_in_bytes % len(pattern) if kind == "pattern" else size_in_bytes
+
+
+def is_valid(file_path, entry, kind, size_in_bytes, verify_checksum=False):
+    """
+    A file is reused when it exists with the expected size and kind, and, if requested,
+    its content still matches the recorded checksum.
+    """
+    if entry is None:
+        return False
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return False
+    if entry.get("kind") != kind or stat.st_size != expected_size(kind, size_in_bytes):
+        return False
+    if verify_checksum:
+        # An unchanged file is verified from the digest cache; only new or modified files are re-read
+        return cached_digest(file_path, CHECKSUM_ALGORITHM, file_checksum, stat) == entry.get("checksum")
+    return True
+
+
+def ensure_files(specs, folder, seed=DEFAULT_SEED, workers=None, sparse=True, verify_checksum=False):
+    """
+    Make sure every (file name, kind, size in bytes) in `specs` exists in `folder`.
+    Files with a manifest entry of the same kind and the expected size are reused; missing or stale
+    ones are generated in parallel worker processes. With `verify_checksum`, reused files are also
+    re-hashed against the recorded checksum (through the digest cache).
+
+    Files already present without a manifest entry (e.g. created by older scripts) are adopted
+    when their size matches: their checksum is recorded instead of regenerating them.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    os.makedirs(folder, exist_ok=True)
+    manifest = load_manifest(folder)
+
+    tasks = []
+    for file_name, kind, size_in_bytes in specs:
+        file_path = os.path.join(folder, file_name)
+        entry = manifest.get(file_name)
+        if entry is None and os.path.exists(file_path) and os.path.getsize(file_path) == expected_size(kind, size_in_bytes):
+            manifest[file_name] = {"kind": kind, "size": os.path.getsize(file_path), "seed": None,
+                                   "checksum": cached_digest(file_path, CHECKSUM_ALGORITHM, file_checksum)}
+            continue
+        if not is_valid(file_path, entry, kind, size_in_bytes, verify_checksum):
+            tasks.append((file_path, kind, size_in_bytes, file_seed(seed, file_name), sparse))
+
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for file_name, entry in executor.map(_write_file_task, tasks):
+                manifest[file_name] = entry
+                cache = default_cache()
+                if cache is not None:  # The checksum was computed while writing; record it for the next verification
+                    cache.put(os.path.join(folder, file_name), CHECKSUM_ALGORITHM, entry["checksum"])
+
+    save_manifest(folder, manifest)
+    return [os.path.join(folder, file_name) for file_name, _, _ in specs]
@@ -0,0 +1,186 @@
+import argparse
+import functools
+import os
+import sqlite3
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Cache file, or "off" to always hash
+DEFAULT_CACHE = os.environ.get("HASHBENCH_DIGEST_CACHE") or os.path.join(REPO_ROOT, "results", "digest_cache.sqlite")
+DEFAULT_MAX_ENTRIES = 100000
+EVICT_INTERVAL = 1000  # Inserts between LRU eviction passes
+
+# One row per (file, algorithm). A digest is only returned while the file's size, mtime and inode
+# still match the ones recorded when it was computed.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+    path TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (path, algorithm)
+);
+CREATE INDEX IF NOT EXISTS digests_last_used ON digests (last_used);
+"""
+
+
+class DigestCache:
+    """
+    Persistent digest cache keyed by file identity (path, size, mtime, inode) and algorithm, so an
+    unchanged file costs one stat and one indexed lookup instead of a full read. Entries of files that
+    changed are dropped on lookup; beyond `max_entries` the least recently used ones are evicted.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path or DEFAULT_CACHE
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=OFF")  # A lost entry only costs a re-hash
+        self.connection.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.inserts = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def get(self, file_path, algorithm, stat=None):
+        """
+        Cached digest of an unchanged file, or None. `stat` avoids a second stat when the caller has one.
+        """
+        file_path = os.path.abspath(file_path)
+        stat = stat or os.stat(file_path)
+        with self.lock:
+            row = self.connection.execute("SELECT size, mtime_ns, inode, digest FROM digests WHERE path = ? AND algorithm = ?",
+                                          (file_path, algorithm)).fetchone()
+            if row is None:
+                return None
+            if row[:3] != (stat.st_size, stat.st_mtime_ns, stat.st_ino):
+                self.connection.execute("DELETE FROM digests WHERE path = ? AND algorithm = ?", (file_path, algorithm))
+                return None
+            self.connection.execute("UPDATE digests SET last_used = ? WHERE path = ? AND algorithm = ?",
+                                    (time.time_ns(), file_path, algorithm))
+            return row[3]
+
+    def put(self, file_path, algorithm, digest, stat=None):
+        """
+        Record a digest. Pass the stat taken before hashing, so a file modified while it was being
+        read does not match its entry later.
+        """
+        file_path = os.path.abspath(file_path)
+        stat = stat or os.stat(file_path)
+        with self.lock:
+            self.connection.execute("INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                    (file_path, algorithm, stat.st_size, stat.st_mtime_ns, stat.st_ino, digest, time.time_ns()))
+            self.inserts += 1
+            if self.inserts % EVICT_INTERVAL == 0:
+                self._evict()
+
+    def digest(self, file_path, algorithm, compute, stat=None):
+        """
+        Digest of a file from the cache, or computed by `compute(file_path)` and recorded.
+        """
+        stat = stat or os.stat(file_path)
+        digest = self.get(file_path, algorithm, stat)
+        if digest is None:
+            digest = compute(file_path)
+            self.put(file_path, algorithm, digest, stat)
+        return digest
+
+    def invalidate(self, file_path=None):
+        """
+        Drop the entries of one file, or of every file.
+        """
+        with self.lock:
+            if file_path is None:
+                self.connection.execute("DELETE FROM digests")
+            else:
+                self.connection.execute("DELETE FROM digests WHERE path = ?", (os.path.abspath(file_path),))
+
+    def evict(self):
+        with self.lock:
+            return self._evict()
+
+    def _evict(self):
+        if not self.max_entries:
+            return 0
+        return self.connection.execute(
+            "DELETE FROM digests WHERE rowid IN (SELECT rowid FROM digests ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)).rowcount
+
+    def prune(self):
+        """
+        Drop entries of files that are missing or changed, then evict beyond `max_entries`.
+        Returns the number of entries removed.
+        """
+        with self.lock:
+            rows = self.connection.execute("SELECT path, algorithm, size, mtime_ns, inode FROM digests").fetchall()
+        stale = []
+        for file_path, algorithm, size, mtime_ns, inode in rows:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                stale.append((file_path, algorithm))
+                continue
+            if (size, mtime_ns, inode) != (stat.st_size, stat.st_mtime_ns, stat.st_ino):
+                stale.append((file_path, algorithm))
+        with self.lock:
+            self.connection.executemany("DELETE FROM digests WHERE path = ? AND algorithm = ?", stale)
+            return len(stale) + self._evict()
+
+    def stats(self):
+        with self.lock:
+            entries, algorithms = self.connection.execute("SELECT COUNT(*), COUNT(DISTINCT algorithm) FROM digests").fetchone()
+        return {"entries": entries, "algorithms": algorithms, "max_entries": self.max_entries, "path": self.path}
+
+
+@functools.lru_cache(maxsize=1)
+def default_cache():
+    """
+    The process-wide cache at DEFAULT_CACHE, or None when caching is turned off.
+    """
+    if DEFAULT_CACHE.lower() == "off":
+        return None
+    return DigestCache(DEFAULT_CACHE)
+
+
+def cached_digest(file_path, algorithm, compute, stat=None, cache=None):
+    """
+    `compute(file_path)` through `cache` (default: the process-wide cache).
+    """
+    cache = cache or default_cache()
+    if cache is None:
+        return compute(file_path)
+    return cache.digest(file_path, algorithm, compute, stat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect and maintain the persistent file digest cache.")
+    parser.add_argument("command", choices=["stats", "prune", "clear"],
+                        help="'stats' counts entries, 'prune' drops entries of changed or missing files, 'clear' drops everything.")
+    parser.add_argument("--cache", type=str, default=None, help=f"Cache path (default {DEFAULT_CACHE}, or $HASHBENCH_DIGEST_CACHE).")
+    parser.add_argument("--max_entries", type=int, default=DEFAULT_MAX_ENTRIES, help="Entries kept by 'prune' (least recently used are evicted).")
+    args = parser.parse_args()
+    if (args.cache or DEFAULT_CACHE).lower() == "off":
+        parser.error("the digest cache is turned off (HASHBENCH_DIGEST_CACHE=off)")
+
+    with DigestCache(args.cache, args.max_entries) as cache:
+        if args.command == "prune":
+            print(f"{cache.prune()} entries removed")
+        elif args.command == "clear":
+            cache.invalidate()
+            print(f"Cleared {cache.path}")
+        print(", ".join(f"{key}: {value}" for key, value in cache.stats().items()))
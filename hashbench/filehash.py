@@ -0,0 +1,308 @@
+import argparse
+import asyncio
+import itertools
+import os
+import platform
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from hashbench.hashers import hash_constructor
+from hashbench.io_strategies import hash_file_streaming
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BLOCKCHAIN_TEST_DATA = os.path.join(REPO_ROOT, "blockchain", "test_data")
+BENCHMARK_DATA_DIR = os.path.join(REPO_ROOT, "text-input", "code", "data", "filehash")
+
+DEFAULT_ALGORITHM = "blake3"  # Fastest algorithm of the speed benchmarks
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # Read size, and leaf size of the per-file Merkle tree
+WALK_BATCH = 256  # Paths taken from the path iterable per hop to a worker thread
+# Benchmark file sets with the same total size: (number of files, size of each file in bytes)
+FILE_SETS = {
+    "small": (4096, 64 * 1024),
+    "large": (4, 64 * 1024 * 1024),
+}
+
+FileDigest = namedtuple("FileDigest", ["path", "size", "digest", "merkle_root", "error"])
+
+
+def merkle_cache_key(algorithm, chunk_size):
+    return f"{algorithm}/merkle/{chunk_size}"
+
+
+def digest_file(path, algorithm=DEFAULT_ALGORITHM, chunk_size=DEFAULT_CHUNK_SIZE, merkle=False, cache=None):
+    """
+    Hash one file with readinto() into a reused buffer; hashlib and blake3 release the GIL while
+    hashing large buffers, so worker threads overlap I/O and hashing. With `merkle`, each chunk is
+    also a leaf of a MerkleTree whose root is returned alongside the whole-file digest.
+    With a DigestCache, an unchanged file is answered from it after a single stat.
+    """
+    stat = os.stat(path)
+    if cache is not None:
+        digest = cache.get(path, algorithm, stat)
+        merkle_root = cache.get(path, merkle_cache_key(algorithm, chunk_size), stat) if merkle else None
+        if digest is not None and (merkle_root is not None or not merkle):
+            return FileDigest(path, stat.st_size, digest, merkle_root, None)
+
+    if merkle:
+        size, digest, merkle_root = digest_file_merkle(path, algorithm, chunk_size)
+    else:
+        size, digest, merkle_root = stat.st_size, hash_file_streaming(path, algorithm, chunk_size), None
+
+    if cache is not None:
+        cache.put(path, algorithm, digest, stat)
+        if merkle_root is not None:
+            cache.put(path, merkle_cache_key(algorithm, chunk_size), merkle_root, stat)
+    return FileDigest(path, size, digest, merkle_root, None)
+
+
+def digest_file_merkle(path, algorithm, chunk_size):
+    """
+    Whole-file digest and Merkle root over `chunk_size` leaves, in one pass. Returns (size, digest, root).
+    """
+    if BLOCKCHAIN_TEST_DATA not in sys.path:
+        sys.path.insert(0, BLOCKCHAIN_TEST_DATA)
+    from merkle_tree import MerkleTree
+
+    constructor = hash_constructor(algorithm)
+    hasher = constructor()
+    tree = MerkleTree(algorithm)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    size = 0
+    with open(path, "rb", buffering=0) as file:
+        while count := file.readinto(buffer):
+            hasher.update(view[:count])
+            tree.add_leaf(constructor(view[:count]).hexdigest())
+            size += count
+    tree.make_tree()
+    return size, hasher.hexdigest(), tree.get_merkle_root()
+
+
+def walk_files(root):
+    """
+    Regular files under `root` (or `root` itself when it is not a directory, so a missing path is
+    reported by the worker that fails to open it), in directory order.
+    """
+    if not os.path.isdir(root):
+        yield root
+        return
+    for directory, _, file_names in os.walk(root):
+        for file_name in sorted(file_names):
+            yield os.path.join(directory, file_name)
+
+
+class FileHasher:
+    """
+    asyncio file hashing service: files are read and hashed in a bounded thread pool while the
+    event loop only schedules. At most `max_pending` paths are queued ahead of the workers and at
+    most `max_pending` results wait for the consumer, so a slow consumer stalls the directory walk
+    instead of buffering digests for a whole tree. With a DigestCache, unchanged files are not re-read.
+    """
+
+    def __init__(self, algorithm=DEFAULT_ALGORITHM, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, merkle=False, max_pending=None,
+                 cache=None):
+        hash_constructor(algorithm)  # Fail early on unknown algorithms
+        self.algorithm = algorithm
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.chunk_size = chunk_size
+        self.merkle = merkle
+        self.max_pending = max_pending or self.workers * 4
+        self.cache = cache
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="filehash")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown()
+
+    async def hash_file(self, path):
+        """
+        Hash a single file on the pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, digest_file, path, self.algorithm, self.chunk_size, self.merkle,
+                                          self.cache)
+
+    async def hash_paths(self, paths):
+        """
+        Hash every path of an iterable and yield FileDigests in completion order. Files that cannot be
+        read are yielded with `error` set instead of stopping the run; any other exception raised while
+        hashing stops it and is re-raised here.
+        """
+        pending = asyncio.Queue(maxsize=self.max_pending)
+        results = asyncio.Queue(maxsize=self.max_pending)
+
+        async def produce():
+            iterator = iter(paths)
+            try:
+                # Advance the iterable (e.g. os.walk over a large tree) in a thread, so listing
+                # directories never blocks the event loop while hashes complete
+                while batch := await asyncio.to_thread(list, itertools.islice(iterator, WALK_BATCH)):
+                    for path in batch:
+                        await pending.put(path)
+            finally:
+                for _ in range(self.workers):
+                    await pending.put(None)
+
+        async def work():
+            try:
+                while (path := await pending.get()) is not None:
+                    try:
+                        result = await self.hash_file(path)
+                    except OSError as e:
+                        result = FileDigest(path, None, None, None, str(e))
+                    await results.put(result)
+            except Exception as e:
+                # Not a per-file failure (unknown algorithm, broken cache, ...): re-raised by the consumer
+                await results.put(e)
+            await results.put(None)
+
+        producer = asyncio.ensure_future(produce())
+        workers = [asyncio.ensure_future(work()) for _ in range(self.workers)]
+        try:
+            finished = 0
+            while finished < self.workers:
+                result = await results.get()
+                if result is None:
+                    finished += 1
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    yield result
+            await producer  # Re-raise errors of the path iterable
+        finally:
+            for task in [producer, *workers]:
+                task.cancel()
+
+    async def hash_directory(self, root):
+        """
+        Hash every file under a directory, yielding FileDigests in completion order.
+        """
+        async for result in self.hash_paths(walk_files(root)):
+            yield result
+
+
+def hash_paths(paths, **options):
+    """
+    Blocking helper: hash paths with a FileHasher and return the FileDigests in completion order.
+    """
+    async def collect(hasher):
+        return [result async for result in hasher.hash_paths(paths)]
+
+    with FileHasher(**options) as hasher:
+        return asyncio.run(collect(hasher))
+
+
+def ensure_file_sets(file_sets=FILE_SETS, folder=BENCHMARK_DATA_DIR):
+    """
+    Generate the benchmark file sets (random content) and return {set name: file paths}.
+    """
+    from hashbench.datagen import ensure_files
+
+    files = {}
+    for name, (count, size_in_bytes) in file_sets.items():
+        specs = [(f"{name}_{index:05d}.bin", "random", size_in_bytes) for index in range(count)]
+        files[name] = ensure_files(specs, os.path.join(folder, name))
+    return files
+
+
+def benchmark(algorithms, worker_counts, runs=3, merkle=False, chunk_size=DEFAULT_CHUNK_SIZE, cache=None):
+    """
+    Time hashing each file set with each algorithm and worker count. The first pass over a set only
+    warms the page cache (and fills `cache`, so timed runs measure cache hits). Returns one row per run
+    with files/s and GB/s.
+    """
+    rows = []
+    for file_set, paths in ensure_file_sets().items():
+        total_bytes = sum(os.path.getsize(path) for path in paths)
+        for algorithm in algorithms:
+            for workers in worker_counts:
+                with FileHasher(algorithm, workers, chunk_size, merkle, cache=cache) as hasher:
+                    async def collect():
+                        return [result async for result in hasher.hash_paths(paths)]
+
+                    asyncio.run(collect())  # Warm-up
+                    for run in range(1, runs + 1):
+                        start = time.perf_counter_ns()
+                        results = asyncio.run(collect())
+                        wall_ns = time.perf_counter_ns() - start
+                        errors = [result for result in results if result.error]
+                        if errors:
+                            raise RuntimeError(f"{len(errors)} files failed, e.g. {errors[0].path}: {errors[0].error}")
+                        rows.append({
+                            "Algorithm": algorithm,
+                            "File Set": file_set,
+                            "Files": len(paths),
+                            "Data Size (MB)": total_bytes / 1024 / 1024,
+                            "Workers": workers,
+                            "Merkle": merkle,
+                            "Cached": cache is not None,
+                            "Run": run,
+                            "Timing (ms)": wall_ns / 1e6,
+                            "Files/s": len(paths) / (wall_ns / 1e9),
+                            "Speed (GBps)": total_bytes / 1024 ** 3 / (wall_ns / 1e9),
+                        })
+                print(f"{algorithm} {file_set} x{workers}: {rows[-1]['Files/s']:.0f} files/s, {rows[-1]['Speed (GBps)']:.3f} GB/s")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hash files and directories concurrently, or benchmark many small versus few large files.")
+    parser.add_argument("paths", type=str, nargs="*", help="Files or directories to hash.")
+    parser.add_argument("--algorithm", type=str, default=DEFAULT_ALGORITHM, help="Hash algorithm for hashing paths.")
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="Worker threads (benchmark: one run per count, default 1 2 4 8).")
+    parser.add_argument("--chunk_size", type=int, default=DEFAULT_CHUNK_SIZE, help="Read size in bytes, also the Merkle leaf size.")
+    parser.add_argument("--merkle", action="store_true", help="Also compute a Merkle root per file over its chunks.")
+    parser.add_argument("--no_cache", action="store_true", help="Re-read every file instead of answering unchanged files from the digest cache.")
+    parser.add_argument("--benchmark", action="store_true", help="Benchmark files/s and GB/s on generated small and large file sets.")
+    parser.add_argument("--algorithms", type=str, nargs="+", default=["sha256", "blake2b", "blake3"], help="Algorithms to benchmark.")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per benchmark case.")
+    parser.add_argument("--cached", action="store_true", help="Benchmark answering unchanged files from a fresh digest cache filled by the warm-up pass.")
+    parser.add_argument("--label", type=str, default=platform.system(), help="Results label in the results store.")
+    parser.add_argument("--output", type=str, default=os.path.join(REPO_ROOT, "results", "filehash_benchmark.csv"), help="CSV file for the benchmark runs.")
+    args = parser.parse_args()
+
+    if not args.benchmark:
+        if not args.paths:
+            parser.error("give paths to hash, or --benchmark")
+
+        from hashbench.digestcache import default_cache
+
+        async def main():
+            cache = None if args.no_cache else default_cache()
+            with FileHasher(args.algorithm, args.workers and args.workers[0], args.chunk_size, args.merkle, cache=cache) as hasher:
+                for root in args.paths:
+                    async for result in hasher.hash_directory(root):
+                        if result.error:
+                            print(f"{result.path}: {result.error}", file=sys.stderr)
+                        else:
+                            print(f"{result.digest}  {result.merkle_root + '  ' if result.merkle_root else ''}{result.path}")
+
+        asyncio.run(main())
+        sys.exit(0)
+
+    import pandas as pd
+    from hashbench.store import record_frame
+
+    cache = None
+    if args.cached:
+        import tempfile
+        from hashbench.digestcache import DigestCache
+
+        cache = DigestCache(os.path.join(tempfile.mkdtemp(prefix="filehash"), "digest_cache.sqlite"))
+    df = pd.DataFrame(benchmark(args.algorithms, args.workers or [1, 2, 4, 8], args.runs, args.merkle, args.chunk_size, cache))
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    df.to_csv(args.output, index=False)
+    print(f"File hashing benchmark saved to {args.output}")
+    df["Variant"] = df["File Set"] + " x" + df["Workers"].astype(str) + (" merkle" if args.merkle else "") + (" cached" if args.cached else "")
+    record_frame("filehash", df, ["Timing (ms)", "Files/s", "Speed (GBps)"], label=args.label,
+                 config={"runs": args.runs, "chunk_size": args.chunk_size, "merkle": args.merkle, "cached": args.cached}, size="Data Size (MB)", variant="Variant")
+
+    summary = df.groupby(["Algorithm", "File Set", "Workers"], sort=False)[["Files/s", "Speed (GBps)"]].median()
+    print(summary.round(3).to_string())
@@ -0,0 +1,106 @@
+import argparse
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.stats import theilslopes
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEXT_RESULTS = os.path.join(REPO_ROOT, "text-input", "results")
+
+# Timing CSV of each speed benchmark and the fit CSV written next to it
+FIT_FILES = {
+    "hashing_speed_single_thread_timing.csv": "hashing_speed_single_thread_fit.csv",
+    "hashing_speed_multi_threads_timing.csv": "hashing_speed_multi_threads_fit.csv",
+}
+# Theil-Sen looks at every pair of points; beyond this many samples fit the per-size medians instead
+MAX_POINTS = 2000
+
+
+def fit_overhead(size_mb, time_ms, confidence=0.95):
+    """
+    Robust (Theil-Sen) fit of time = a + b * size. Returns the fixed overhead a (ms), the per-MB
+    cost b (ms/MB) with its confidence interval, and R² of the fitted line.
+    """
+    size_mb, time_ms = np.asarray(size_mb, dtype=float), np.asarray(time_ms, dtype=float)
+    if len(size_mb) > MAX_POINTS:
+        medians = pd.Series(time_ms).groupby(size_mb).median()
+        size_mb, time_ms = medians.index.to_numpy(float), medians.to_numpy(float)
+    slope, intercept, slope_low, slope_high = theilslopes(time_ms, size_mb, alpha=confidence)
+    residuals = time_ms - (intercept + slope * size_mb)
+    total = ((time_ms - time_ms.mean()) ** 2).sum()
+    r_squared = 1 - (residuals ** 2).sum() / total if total > 0 else np.nan
+    return intercept, slope, slope_low, slope_high, r_squared
+
+
+def to_gbps(ms_per_mb):
+    return 1000 / ms_per_mb / 1024 if ms_per_mb > 0 else np.nan
+
+
+def fit_frame(df, time_column="Timing (ms)", size_column="Data Size (MB)", by=("Algorithm",), confidence=0.95):
+    """
+    Fit time = a + b * size per group of `by` columns. The asymptotic speed is 1 / b, in GB/s
+    (1024 MB) like the MBps columns of the summaries; its interval comes from the slope's.
+    """
+    rows = []
+    for key, group in df.dropna(subset=[time_column]).groupby(list(by), sort=False):
+        if group[size_column].nunique() < 2:
+            continue
+        intercept, slope, slope_low, slope_high, r_squared = fit_overhead(group[size_column], group[time_column], confidence)
+        rows.append({
+            **dict(zip(by, key if isinstance(key, tuple) else (key,))),
+            "Overhead (ms)": intercept,
+            "Per-MB Time (ms)": slope,
+            "Asymptotic Speed (GBps)": to_gbps(slope),
+            "Speed CI Low (GBps)": to_gbps(slope_high),
+            "Speed CI High (GBps)": to_gbps(slope_low),
+            "R2": r_squared,
+            "Sizes": group[size_column].nunique(),
+            "Samples": len(group),
+        })
+    return pd.DataFrame(rows)
+
+
+def fit_timing_csv(timing_csv, output_folder=None):
+    """
+    Fit a speed benchmark's timing CSV (per-run timings, or the Avg Time (ms) column of a summary)
+    and save the fits next to it.
+    """
+    df = pd.read_csv(timing_csv)
+    time_column = "Timing (ms)" if "Timing (ms)" in df else "Avg Time (ms)"
+    fit_df = fit_frame(df, time_column)
+
+    file_name = FIT_FILES.get(os.path.basename(timing_csv), os.path.basename(timing_csv).replace(".csv", "_fit.csv"))
+    fit_csv = os.path.join(output_folder or os.path.dirname(timing_csv), file_name)
+    fit_df.to_csv(fit_csv, index=False)
+    print(f"Overhead fit saved to {fit_csv}")
+    return fit_df
+
+
+def fit_line(fit_row, sizes, metric):
+    """
+    Fitted Avg Time (ms) or Speed (MBps) at `sizes`, for drawing the fit over the measured points.
+    """
+    sizes = np.asarray(sizes, dtype=float)
+    times = fit_row["Overhead (ms)"] + fit_row["Per-MB Time (ms)"] * sizes
+    return times if metric == "Avg Time (ms)" else sizes / times * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit time = overhead + size / bandwidth to the speed benchmarks' timings.")
+    parser.add_argument("--folders", type=str, nargs="+", default=None, help="Result folders under text-input/results (default: all).")
+    args = parser.parse_args()
+
+    folders = args.folders or sorted(os.path.basename(path) for path in glob.glob(os.path.join(TEXT_RESULTS, "*")))
+    tables = []
+    for folder in folders:
+        for timing_file in FIT_FILES:
+            timing_csv = os.path.join(TEXT_RESULTS, folder, "hashing", timing_file)
+            if os.path.exists(timing_csv):
+                benchmark = "multi_thread" if "multi" in timing_file else "single_thread"
+                tables.append(fit_timing_csv(timing_csv).assign(OS=folder, Benchmark=benchmark))
+
+    if tables:
+        columns = ["OS", "Benchmark", "Algorithm", "Overhead (ms)", "Asymptotic Speed (GBps)", "R2"]
+        print(pd.concat(tables, ignore_index=True)[columns].round(4).to_string(index=False))
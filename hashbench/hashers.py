@@ -0,0 +1,118 @@
+import functools
+import hashlib
+import itertools
+import os
+
+from blake3 import blake3
+
+SMALL_RECORD_LIMIT = 2048  # Average record size below which records are sliced as bytes
+PARALLEL_MIN_BYTES = 1024 * 1024  # Packed buffers below this size are hashed in the calling thread
+SLICE_BYTES = 256 * 1024  # Bytes of records per thread-pool task
+
+
+def hash_constructor(algorithm):
+    """
+    Return a constructor creating a hasher object (update/digest/hexdigest) for an algorithm name.
+    """
+    if algorithm == "blake3":
+        return blake3
+    if hasattr(hashlib, algorithm):
+        return getattr(hashlib, algorithm)  # Direct constructor, avoids hashlib.new's name lookup
+    return lambda data=b"": hashlib.new(algorithm, data)
+
+
+def chunk_hash_function(algorithm):
+    """
+    Return a function digesting one buffer, as used by the benchmark scripts' chunk loops.
+    """
+    constructor = hash_constructor(algorithm)
+    return lambda data: constructor(data).digest()
+
+
+def hash_batch(algorithm, messages):
+    """
+    Digest every message of a list in one call, binding the constructor once.
+    """
+    constructor = hash_constructor(algorithm)
+    return [constructor(message).digest() for message in messages]
+
+
+def hash_packed(algorithm, buffer, record_size=None, offsets=None):
+    """
+    Digest records packed in one buffer and return the digests concatenated in a bytearray.
+
+    Records are either fixed-size (`record_size`) or delimited by `offsets`, a sequence of
+    n + 1 start positions where record i spans offsets[i]:offsets[i + 1].
+    """
+    constructor = hash_constructor(algorithm)
+    view = memoryview(buffer).cast("B")
+    if offsets is None:
+        offsets = range(0, len(view) + 1, record_size)
+
+    # Slicing bytes is cheaper than a memoryview for small records; large records are hashed zero-copy
+    records = len(offsets) - 1
+    source = view if records and len(view) // records >= SMALL_RECORD_LIMIT else view.tobytes()
+    return bytearray(b"".join([constructor(source[start:end]).digest() for start, end in zip(offsets, offsets[1:])]))
+
+
+def pack_records(messages):
+    """
+    Concatenate messages into one buffer and return it with the n + 1 record offsets.
+    """
+    return b"".join(messages), [0, *itertools.accumulate(map(len, messages))]
+
+
+@functools.lru_cache(maxsize=None)
+def record_pool(workers):
+    """
+    Thread pool shared by every hash_records call with the same worker count.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash_records")
+
+
+def hash_records(algorithm, buffer, record_size=None, offsets=None, out=None, workers=None):
+    """
+    Digest records packed in one buffer into `out`, a preallocated writable buffer (bytearray,
+    NumPy uint8 array, ...) of records * digest_size bytes, and return it. A bytearray is allocated
+    when `out` is None. Records are fixed-size or delimited by `offsets` as in hash_packed; NumPy
+    offset arrays are accepted.
+
+    Buffers of PARALLEL_MIN_BYTES and more are split into slices of whole records hashed by a thread
+    pool, each digest written in place. hashlib releases the GIL for records of 2KB and more, so
+    threads overlap for large records; small records still avoid building a digest list.
+    """
+    constructor = hash_constructor(algorithm)
+    digest_size = constructor().digest_size
+    view = memoryview(buffer).cast("B")
+    if offsets is None:
+        offsets = range(0, len(view) + 1, record_size)
+    elif hasattr(offsets, "tolist"):
+        offsets = offsets.tolist()  # Python ints slice faster than NumPy scalars
+    records = len(offsets) - 1
+
+    if out is None:
+        out = bytearray(records * digest_size)
+    target = memoryview(out).cast("B")
+    if len(target) < records * digest_size:
+        raise ValueError(f"Output holds {len(target)} bytes, {records} digests need {records * digest_size}")
+    source = view if records and len(view) // records >= SMALL_RECORD_LIMIT else view.tobytes()
+
+    def hash_slice(first, last):
+        bounds = zip(offsets[first:last], offsets[first + 1:last + 1])
+        target[first * digest_size:last * digest_size] = b"".join([constructor(source[start:end]).digest() for start, end in bounds])
+
+    if records < 2 or len(view) < PARALLEL_MIN_BYTES:
+        hash_slice(0, records)  # Small buffers skip os.cpu_count, which costs a few microseconds per call
+        return out
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        hash_slice(0, records)
+    else:
+        per_slice = max(1, records * SLICE_BYTES // len(view))
+        futures = [record_pool(workers).submit(hash_slice, first, min(first + per_slice, records))
+                   for first in range(0, records, per_slice)]
+        for future in futures:
+            future.result()
+    return out
@@ -0,0 +1,205 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+
+try:
+    import psutil
+except ImportError:  # Core counts and frequency fall back to /proc, sysctl or os.cpu_count
+    psutil = None
+
+# CPU feature flags that decide which SHA-2/BLAKE code paths run: x86 names from /proc/cpuinfo and
+# macOS machdep.cpu features, ARM names from /proc/cpuinfo "Features" and hw.optional.arm.FEAT_*
+HASH_FLAGS = {
+    "sha_ni": "SHA-NI", "sha": "SHA-NI", "ssse3": "SSSE3", "sse4_1": "SSE4.1", "sse4.1": "SSE4.1",
+    "avx": "AVX", "avx1.0": "AVX", "avx2": "AVX2", "avx512f": "AVX-512F", "avx512vl": "AVX-512VL", "bmi2": "BMI2",
+    "asimd": "NEON", "neon": "NEON", "sha1": "ARM-SHA1", "sha2": "ARM-SHA2", "sha256": "ARM-SHA2",
+    "sha512": "ARM-SHA512", "sha3": "ARM-SHA3",
+}
+
+# Fields that identify a machine; governor and frequencies may change between runs on the same host
+IDENTITY_FIELDS = ["cpu_model", "physical_cores", "logical_cpus", "caches", "cpu_flags", "machine", "system", "memory_gb"]
+
+
+def _read(path):
+    try:
+        with open(path, "r") as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def _sysctl(name):
+    try:
+        return subprocess.run(["sysctl", "-n", name], capture_output=True, text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _cpuinfo():
+    """
+    First processor block of /proc/cpuinfo as a dict, plus the number of distinct physical cores.
+    """
+    text = _read("/proc/cpuinfo")
+    if not text:
+        return {}, None
+    first, cores = {}, set()
+    for block in text.split("\n\n"):
+        fields = {}
+        for line in block.splitlines():
+            key, _, value = line.partition(":")
+            fields[key.strip()] = value.strip()
+        if not first:
+            first = fields
+        if "core id" in fields:
+            cores.add((fields.get("physical id"), fields["core id"]))
+    return first, len(cores) or None
+
+
+def cpu_model(cpuinfo):
+    model = cpuinfo.get("model name") or cpuinfo.get("Model") or cpuinfo.get("Hardware")
+    if not model and platform.system() == "Darwin":
+        model = _sysctl("machdep.cpu.brand_string")
+    return model or platform.processor() or None
+
+
+def core_counts(physical_from_cpuinfo):
+    logical = os.cpu_count()
+    physical = psutil.cpu_count(logical=False) if psutil is not None else None
+    if physical is None:
+        physical = physical_from_cpuinfo
+    if physical is None and platform.system() == "Darwin":
+        value = _sysctl("hw.physicalcpu")
+        physical = int(value) if value else None
+    return physical, logical
+
+
+def cache_sizes():
+    """
+    Cache sizes in KB by name (L1d, L1i, L2, L3) from sysfs or sysctl.
+    """
+    caches = {}
+    for index in sorted(glob.glob("/sys/devices/system/cpu/cpu0/cache/index*")):
+        level, kind, size = (_read(os.path.join(index, name)) for name in ("level", "type", "size"))
+        if not (level and size):
+            continue
+        name = f"L{level}" + {"Data": "d", "Instruction": "i"}.get(kind, "")
+        caches[name] = int(size.rstrip("K")) if size.endswith("K") else size
+    if not caches and platform.system() == "Darwin":
+        for name, key in [("L1d", "hw.l1dcachesize"), ("L1i", "hw.l1icachesize"), ("L2", "hw.l2cachesize"), ("L3", "hw.l3cachesize")]:
+            value = _sysctl(key)
+            if value and value.isdigit() and int(value) > 0:
+                caches[name] = int(value) // 1024
+    return caches
+
+
+def cpu_flags(cpuinfo):
+    """
+    Hashing-relevant CPU features present on this host, e.g. ["AVX2", "SHA-NI"].
+    """
+    raw = (cpuinfo.get("flags") or cpuinfo.get("Features") or "").lower().split()
+    if not raw and platform.system() == "Darwin":
+        raw = " ".join(filter(None, [_sysctl("machdep.cpu.features"), _sysctl("machdep.cpu.leaf7_features")])).lower().split()
+        for feature in ("FEAT_SHA1", "FEAT_SHA256", "FEAT_SHA512", "FEAT_SHA3"):
+            if _sysctl(f"hw.optional.arm.{feature}") == "1":
+                raw.append(feature[len("FEAT_"):].lower())
+        if _sysctl("hw.optional.neon") == "1":
+            raw.append("neon")
+    return sorted({HASH_FLAGS[flag] for flag in raw if flag in HASH_FLAGS})
+
+
+def frequency():
+    """
+    CPU frequency governor and current/max frequency in MHz, where the OS exposes them.
+    """
+    cpufreq = "/sys/devices/system/cpu/cpu0/cpufreq"
+    governor = _read(os.path.join(cpufreq, "scaling_governor"))
+    current, maximum = _read(os.path.join(cpufreq, "scaling_cur_freq")), _read(os.path.join(cpufreq, "cpuinfo_max_freq"))
+    current_mhz = int(current) / 1000 if current else None
+    max_mhz = int(maximum) / 1000 if maximum else None
+    if psutil is not None and current_mhz is None:
+        try:
+            freq = psutil.cpu_freq()
+        except (OSError, NotImplementedError):
+            freq = None
+        if freq:
+            current_mhz, max_mhz = freq.current or None, freq.max or max_mhz
+    return governor, current_mhz, max_mhz
+
+
+def memory_gb():
+    if psutil is not None:
+        return round(psutil.virtual_memory().total / 1024 ** 3, 1)
+    try:
+        return round(os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 1024 ** 3, 1)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def package_version(name):
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return None
+
+
+def openssl_version():
+    """
+    OpenSSL build behind hashlib (the _hashlib and ssl extensions link the same library).
+    """
+    try:
+        import ssl
+        return ssl.OPENSSL_VERSION
+    except ImportError:
+        return None
+
+
+def fingerprint():
+    """
+    Describe this host and software stack: CPU model, cores/threads, caches, hashing-relevant CPU flags,
+    governor/frequency, OS, Python, OpenSSL and blake3 versions. `host_id` hashes the hardware fields only.
+    """
+    cpuinfo, physical_from_cpuinfo = _cpuinfo()
+    physical, logical = core_counts(physical_from_cpuinfo)
+    governor, current_mhz, max_mhz = frequency()
+    info = {
+        "cpu_model": cpu_model(cpuinfo),
+        "physical_cores": physical,
+        "logical_cpus": logical,
+        "caches": cache_sizes(),
+        "cpu_flags": cpu_flags(cpuinfo),
+        "governor": governor,
+        "current_mhz": current_mhz,
+        "max_mhz": max_mhz,
+        "memory_gb": memory_gb(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "os": platform.platform(),
+        "hostname": platform.node(),
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "openssl": openssl_version(),
+        "blake3": package_version("blake3"),
+    }
+    identity = json.dumps({field: info[field] for field in IDENTITY_FIELDS}, sort_keys=True)
+    info["host_id"] = hashlib.blake2b(identity.encode("utf-8"), digest_size=6).hexdigest()
+    return info
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print (or save) the fingerprint of this host.")
+    parser.add_argument("--output", type=str, default=None, help="Write the fingerprint to this JSON file (e.g. configuration/<host>.json).")
+    args = parser.parse_args()
+
+    info = fingerprint()
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(info, file, indent="\t")
+        print(f"Host fingerprint saved to {args.output}")
+    else:
+        json.dump(info, sys.stdout, indent=2)
+        print()
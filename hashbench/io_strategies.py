@@ -0,0 +1,76 @@
+import mmap
+import os
+
+from hashbench.hashers import hash_constructor
+
+STRATEGIES = ["chunked", "streaming", "mmap"]
+
+
+class BufferStats:
+    """
+    Counts the read buffers a strategy allocates (one bytes object per read() call).
+    """
+
+    def __init__(self):
+        self.allocations = 0
+        self.bytes_allocated = 0
+
+    def add(self, size):
+        self.allocations += 1
+        self.bytes_allocated += size
+
+
+def hash_file_chunked(file_path, algorithm, chunk_size, stats=None):
+    """
+    read() a new bytes object per chunk and feed it to one hasher.
+    """
+    hasher = hash_constructor(algorithm)()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            if stats is not None:
+                stats.add(len(chunk))
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def hash_file_streaming(file_path, algorithm, chunk_size, stats=None):
+    """
+    readinto() one preallocated buffer and feed memoryview slices, so no per-chunk allocation.
+    """
+    hasher = hash_constructor(algorithm)()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    if stats is not None:
+        stats.add(chunk_size)
+    with open(file_path, "rb", buffering=0) as file:
+        while size := file.readinto(buffer):
+            hasher.update(view[:size])
+    return hasher.hexdigest()
+
+
+def hash_file_mmap(file_path, algorithm, chunk_size, stats=None):
+    """
+    Map the file and hash it in chunk_size slices of the mapping, letting the kernel page it in.
+    """
+    hasher = hash_constructor(algorithm)()
+    if os.path.getsize(file_path) == 0:
+        return hasher.hexdigest()
+    with open(file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        for offset in range(0, len(mapped), chunk_size):
+            hasher.update(view[offset:offset + chunk_size])
+        view.release()
+    return hasher.hexdigest()
+
+
+def hash_file(file_path, algorithm, strategy="chunked", chunk_size=64 * 1024, stats=None):
+    """
+    Hash a whole file with one of STRATEGIES and return its hex digest.
+    """
+    if strategy == "chunked":
+        return hash_file_chunked(file_path, algorithm, chunk_size, stats)
+    if strategy == "streaming":
+        return hash_file_streaming(file_path, algorithm, chunk_size, stats)
+    if strategy == "mmap":
+        return hash_file_mmap(file_path, algorithm, chunk_size, stats)
+    raise ValueError(f"Unknown read strategy '{strategy}'")
@@ -0,0 +1,136 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import warnings
+
+from hashbench.hashers import chunk_hash_function
+from hashbench.timing import Timer, cycles_per_byte
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_STATES = ["none", "cold", "warm"]
+
+
+def prepare_cache(file_path, state):
+    """
+    Put a file's pages in the requested page cache state before a run.
+    "cold" drops them (POSIX_FADV_DONTNEED), "warm" prefetches them (POSIX_FADV_WILLNEED plus a full read),
+    "none" leaves the cache untouched.
+    """
+    if state == "none":
+        return
+    if not hasattr(os, "posix_fadvise"):
+        warnings.warn(f"posix_fadvise is not available on this platform; cache state '{state}' is not enforced")
+        return
+
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        if state == "cold":
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        elif state == "warm":
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            while os.read(fd, 1024 * 1024):
+                pass
+        else:
+            raise ValueError(f"Unknown cache state '{state}'")
+    finally:
+        os.close(fd)
+
+
+def hash_file_chunks(file_path, hash_function, chunk_size):
+    with open(file_path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            hash_function(chunk)
+
+
+def file_hasher(case):
+    """
+    Function hashing the case's whole file once: the benchmark scripts' per-chunk digest loop, or one of
+    hashbench.io_strategies when the case names an "io" strategy.
+    """
+    if case.get("io"):
+        from hashbench.io_strategies import hash_file
+
+        return lambda: hash_file(case["file"], case["algorithm"], case["io"], case["chunk_size"])
+    hash_function = chunk_hash_function(case["algorithm"])
+    return lambda: hash_file_chunks(case["file"], hash_function, case["chunk_size"])
+
+
+def run_case(case):
+    """
+    Execute one (algorithm, size) case in this process and return its per-run measurements.
+    With "threads" > 1, that many threads hash the file concurrently and each run times all of them.
+    """
+    threads = case.get("threads", 1)
+    size_in_bytes = case["size_mb"] * 1024 * 1024 * threads
+    hash_once = file_hasher(case)
+
+    # Warm the hash implementation on memory, not on the file, so the cache state stays as requested
+    chunk_hash_function(case["algorithm"])(bytes(case["chunk_size"]))
+    if case["cache"] == "none":
+        hash_once()
+
+    executor = None
+    hash_all = hash_once
+    if threads > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=threads)
+        hash_all = lambda: list(executor.map(lambda _: hash_once(), range(threads)))
+
+    runs = []
+    for _ in range(case["runs"]):
+        prepare_cache(case["file"], case["cache"])
+        if case["benchmark"] == "resource":
+            from hashbench.sampler import ResourceSampler
+
+            with ResourceSampler(case.get("sample_interval", 0.005)) as sampler, Timer() as timer:
+                hash_all()
+            record = {**timer.record(), **sampler.summary()}
+        else:
+            with Timer() as timer:
+                hash_all()
+            record = timer.record()
+        record["Cycles per Byte"] = cycles_per_byte([record], size_in_bytes)
+        runs.append(record)
+
+    if executor is not None:
+        executor.shutdown()
+    return runs
+
+
+def run_case_in_subprocess(case):
+    """
+    Run one case in a fresh interpreter and return its measurements.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+    command = [sys.executable, "-m", "hashbench.isolated", "--case", json.dumps(case)]
+    completed = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+
+def run_cases(cases, seed=None):
+    """
+    Run cases in randomized order, each in its own subprocess. Returns (case, runs) pairs in execution order.
+    """
+    order = list(cases)
+    random.Random(seed).shuffle(order)
+
+    results = []
+    for index, case in enumerate(order, start=1):
+        print(f"[{index}/{len(order)}] {case['benchmark']} {case['algorithm']} {case['size_mb']}MB (cache: {case['cache']})")
+        try:
+            results.append((case, run_case_in_subprocess(case)))
+        except subprocess.CalledProcessError as e:
+            print(f"Error running {case['algorithm']} with {case['size_mb']}MB: {e.stderr.strip()}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one benchmark case and print its measurements as JSON.")
+    parser.add_argument("--case", type=str, required=True, help="JSON case description.")
+    args = parser.parse_args()
+
+    print(json.dumps(run_case(json.loads(args.case))))
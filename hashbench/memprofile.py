@@ -0,0 +1,84 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+
+from hashbench.io_strategies import BufferStats, hash_file
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def max_rss_mb():
+    """
+    Peak RSS of this process so far, or None.
+    On Linux VmHWM is used because ru_maxrss carries over the parent's peak across fork/exec.
+    """
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KB on Linux, bytes on macOS
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def profile_case(file_path, algorithm, strategy, chunk_size):
+    """
+    Hash one file under tracemalloc and report traced peak, retained memory and read buffer allocations.
+    """
+    stats = BufferStats()
+    rss_before = max_rss_mb()
+
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    baseline_current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+
+    hash_file(file_path, algorithm, strategy, chunk_size, stats)
+
+    current, peak = tracemalloc.get_traced_memory()
+    retained = tracemalloc.take_snapshot().compare_to(baseline, "filename")
+    tracemalloc.stop()
+
+    return {
+        "Peak Traced (bytes)": peak - baseline_current,
+        "Retained (bytes)": current - baseline_current,
+        "Retained Blocks": sum(stat.count_diff for stat in retained),
+        "Buffer Allocations": stats.allocations,
+        "Buffer Bytes Allocated": stats.bytes_allocated,
+        "Max RSS Before (MB)": rss_before,
+        "Max RSS (MB)": max_rss_mb(),
+    }
+
+
+def profile_in_subprocess(file_path, algorithm, strategy, chunk_size):
+    """
+    Run profile_case in a fresh interpreter so max RSS reflects only that case.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+    command = [sys.executable, "-m", "hashbench.memprofile", "--file", file_path, "--algorithm", algorithm,
+               "--strategy", strategy, "--chunk_size", str(chunk_size)]
+    completed = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile memory allocations while hashing one file.")
+    parser.add_argument("--file", type=str, required=True)
+    parser.add_argument("--algorithm", type=str, required=True)
+    parser.add_argument("--strategy", type=str, required=True)
+    parser.add_argument("--chunk_size", type=int, default=64 * 1024)
+    args = parser.parse_args()
+
+    print(json.dumps(profile_case(args.file, args.algorithm, args.strategy, args.chunk_size)))
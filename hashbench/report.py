@@ -0,0 +1,282 @@
+import argparse
+import glob
+import hashlib
+import html
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from hashbench.fit import fit_frame, fit_line
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEXT_RESULTS = os.path.join(REPO_ROOT, "text-input", "results")
+BLOCKCHAIN_RESULTS = os.path.join(REPO_ROOT, "blockchain", "test_data", "results")
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, "report")
+CACHE_FILE = ".cache.json"
+
+HASH_NAMES = ["blake2b", "blake2s", "blake3", "sha256", "sha512"]
+ROUNDS = [f"round{i}" for i in range(1, 10)]
+ROUND_FILE = re.compile(r"round(\d+)\.txt$")
+COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd"]
+
+# Summary CSVs read per OS folder: (section, file, key)
+TEXT_CSVS = [
+    ("hashing", "hashing_speed_single_thread_summary.csv", "single_thread"),
+    ("hashing", "hashing_speed_multi_threads_summary.csv", "multi_thread"),
+    ("hashing", "hashing_speed_single_thread_timing.csv", "single_thread_timing"),
+    ("hashing", "hashing_speed_multi_threads_timing.csv", "multi_thread_timing"),
+    ("resource_usage", "hashing_resource_avg_results.csv", "resource"),
+]
+
+
+def _source_version():
+    """
+    Hash of this module, so changing how a figure is drawn invalidates the cached images.
+    """
+    with open(os.path.abspath(__file__), "rb") as file:
+        return hashlib.blake2b(file.read(), digest_size=8).hexdigest()
+
+
+def read_values(file_path):
+    """
+    One integer per line, skipping entries the client could not record ("N/A").
+    """
+    with open(file_path, "r") as file:
+        return [int(line) for line in (raw.strip() for raw in file) if line.isdigit()]
+
+
+def load_blockchain(os_folder):
+    """
+    Mining times (and nonces and proof-of-work times, when recorded) of every algorithm and round as one long frame.
+    """
+    rows = []
+    for hash_folder in sorted(glob.glob(os.path.join(os_folder, "*"))):
+        for path in sorted(glob.glob(os.path.join(hash_folder, "round*.txt"))):
+            match = ROUND_FILE.search(os.path.basename(path))
+            if not match:
+                continue
+            times = read_values(path)
+            companions = {}
+            for kind in ("nonces", "pow"):
+                companion_path = path[:-len(".txt")] + f"_{kind}.txt"
+                values = read_values(companion_path) if os.path.exists(companion_path) else []
+                companions[kind] = values if len(values) == len(times) else [None] * len(times)
+            for time_ns, nonce, pow_ns in zip(times, companions["nonces"], companions["pow"]):
+                rows.append({"Hash": os.path.basename(hash_folder), "Round": f"round{match.group(1)}",
+                             "Time (ns)": time_ns, "Nonces": nonce, "PoW (ns)": pow_ns})
+    return pd.DataFrame(rows, columns=["Hash", "Round", "Time (ns)", "Nonces", "PoW (ns)"])
+
+
+def load_results():
+    """
+    Read every OS's summary CSVs and blockchain round files once: {os: {key: DataFrame}}.
+    """
+    results = {}
+    for os_folder in sorted(glob.glob(os.path.join(TEXT_RESULTS, "*"))):
+        for section, file_name, key in TEXT_CSVS:
+            path = os.path.join(os_folder, section, file_name)
+            if os.path.exists(path):
+                df = pd.read_csv(path)
+                if "Avg Time (ms)" in df:
+                    # Speed of one pass from its average time; older summaries scaled it by the run count
+                    df["Speed (MBps)"] = df["Data Size (MB)"] / df["Avg Time (ms)"] * 1000
+                results.setdefault(os.path.basename(os_folder), {})[key] = df
+    for os_folder in sorted(glob.glob(os.path.join(BLOCKCHAIN_RESULTS, "*"))):
+        df = load_blockchain(os_folder)
+        if not df.empty:
+            results.setdefault(os.path.basename(os_folder), {})["blockchain"] = df
+    return results
+
+
+def figure_tasks(results):
+    """
+    Every figure of the report as (relative path, title, renderer, data, options) tasks:
+    the per-OS charts of hashing_visualization.py, resource_visualization.py and
+    blockchain/visualization/main.py, plus cross-OS comparisons.
+    """
+    tasks = []
+    for os_name, frames in results.items():
+        for key, label in [("single_thread", "Single-Threaded"), ("multi_thread", "Multi-Threaded")]:
+            if key in frames:
+                df = frames[key]
+                # Overhead/bandwidth fit per algorithm, drawn as dashed lines over the measured points
+                fits = {}
+                if f"{key}_timing" in frames:
+                    fit_df = fit_frame(frames[f"{key}_timing"])
+                    fits = {row["Algorithm"]: {column: row[column] for column in ("Overhead (ms)", "Per-MB Time (ms)")}
+                            for _, row in fit_df.iterrows()}
+                tasks.append((f"{os_name}/hashing/{key}_avg_time.png", f"{os_name} - {label} Hashing: Average Timing Per Algorithm",
+                              "line", df, {"x": "Data Size (MB)", "y": "Avg Time (ms)", "ylabel": "Average Time (ms)", "fits": fits}))
+                tasks.append((f"{os_name}/hashing/{key}_speed.png", f"{os_name} - {label} Hashing: Speed Per Algorithm",
+                              "line", df, {"x": "Data Size (MB)", "y": "Speed (MBps)", "ylabel": "Speed (MBps)", "fits": fits}))
+        if "resource" in frames:
+            # Header names differ between result sets; like resource_visualization.py, go by position
+            df = frames["resource"].iloc[:, :4].set_axis(["Algorithm", "Data Size (MB)", "Average CPU Usage (%)", "Peak Memory (MB)"], axis=1)
+            tasks.append((f"{os_name}/resource_usage/cpu_usage_bar.png", f"{os_name} - Average CPU Usage Across Data Sizes",
+                          "grouped_bar", df, {"x": "Data Size (MB)", "y": "Average CPU Usage (%)", "ylabel": "Average CPU Usage (%)"}))
+            tasks.append((f"{os_name}/resource_usage/memory_usage_bar.png", f"{os_name} - Average Peak Memory Usage Across Data Sizes",
+                          "grouped_bar", df, {"x": "Data Size (MB)", "y": "Peak Memory (MB)", "ylabel": "Peak Memory Usage (MB)"}))
+        if "blockchain" in frames:
+            df = frames["blockchain"]
+            for first in range(0, len(ROUNDS), 3):
+                selected = ROUNDS[first:first + 3]
+                tasks.append((f"{os_name}/blockchain/rounds_{first + 1}_to_{first + 3}.png",
+                              f"{os_name} - Execution Time in Nanoseconds (Rounds {first + 1}-{first + 3})",
+                              "rounds", df[df["Round"].isin(selected)], {"rounds": selected}))
+            if df["Nonces"].notna().any():
+                tasks.append((f"{os_name}/blockchain/hashrate.png", f"{os_name} - Proof-of-Work Hashrate per Round",
+                              "hashrate", df.dropna(subset=["Nonces"]), {"rounds": ROUNDS}))
+
+    for key, label in [("single_thread", "Single-Threaded"), ("multi_thread", "Multi-Threaded")]:
+        frames = [frames[key].assign(OS=os_name) for os_name, frames in results.items() if key in frames]
+        if frames:
+            tasks.append((f"all/{key}_speed_by_os.png", f"{label} Hashing: Mean Speed per OS", "os_bar",
+                          pd.concat(frames, ignore_index=True), {"y": "Speed (MBps)", "ylabel": "Mean Speed over Data Sizes (MBps)"}))
+    return tasks
+
+
+def task_key(task, version):
+    """
+    Content hash of a figure's inputs: renderer, title, options, data and the plotting code version.
+    """
+    path, title, renderer, df, options = task
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([version, path, title, renderer, options], sort_keys=True).encode("utf-8"))
+    digest.update(df.to_csv(index=False).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def render(task, output_dir):
+    """
+    Draw one figure with the Agg backend and save it under `output_dir`.
+    """
+    import matplotlib.pyplot as plt
+
+    path, title, renderer, df, options = task
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    if renderer == "line":
+        for algo in df["Algorithm"].unique():
+            subset = df[df["Algorithm"] == algo]
+            line, = ax.plot(subset[options["x"]], subset[options["y"]], marker="o", label=algo.upper())
+            if algo in options.get("fits", {}):
+                fitted = fit_line(options["fits"][algo], subset[options["x"]], options["y"])
+                ax.plot(subset[options["x"]], fitted, linestyle="--", color=line.get_color(), alpha=0.6)
+        ax.set_xlabel(options["x"], fontsize=14)
+        ax.legend(title="Algorithm (dashed: fit)" if options.get("fits") else "Algorithm", fontsize=12)
+        ax.grid(True, linestyle="--", alpha=0.7)
+    elif renderer == "grouped_bar":
+        df.pivot_table(index=options["x"], columns="Algorithm", values=options["y"]).plot(kind="bar", width=0.8, ax=ax)
+        ax.set_xlabel(options["x"], fontsize=14)
+        ax.legend(title="Algorithm", fontsize=12)
+        ax.grid(axis="y", linestyle="--", alpha=0.7)
+    elif renderer in ("rounds", "hashrate"):
+        grouped = df.groupby(["Hash", "Round"])
+        if renderer == "rounds":
+            values = grouped["Time (ns)"].mean()
+            ax.set_ylabel("Average Execution Time (ns)", fontsize=14)
+        else:
+            # Proof-of-work time when recorded; older round files only have the whole block time
+            pow_ns = df["PoW (ns)"].fillna(df["Time (ns)"]).groupby([df["Hash"], df["Round"]]).sum()
+            values = 1e9 * grouped["Nonces"].sum() / pow_ns
+            ax.set_ylabel("Hashrate (nonces/s)", fontsize=14)
+        rounds, width = options["rounds"], 0.15
+        for i, hash_name in enumerate(HASH_NAMES):
+            heights = [values.get((hash_name, round_name), 0) for round_name in rounds]
+            ax.bar([p + i * width for p in range(len(rounds))], heights, width=width, label=hash_name, color=COLORS[i])
+        ax.set_xticks([p + 2 * width for p in range(len(rounds))])
+        ax.set_xticklabels(rounds, rotation=45)
+        ax.set_xlabel("Rounds", fontsize=14)
+        ax.legend(title="Hash Algorithm")
+        ax.grid(axis="y", linestyle="--", alpha=0.7)
+    elif renderer == "os_bar":
+        df.pivot_table(index="Algorithm", columns="OS", values=options["y"], aggfunc="mean").plot(kind="bar", width=0.8, ax=ax)
+        ax.set_xlabel("Algorithm", fontsize=14)
+        ax.legend(title="OS", fontsize=12)
+        ax.grid(axis="y", linestyle="--", alpha=0.7)
+    else:
+        raise ValueError(f"Unknown renderer: {renderer}")
+
+    if "ylabel" in options:
+        ax.set_ylabel(options["ylabel"], fontsize=14)
+    ax.set_title(title, fontsize=16)
+    fig.tight_layout()
+
+    output_path = os.path.join(output_dir, path)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    fig.savefig(output_path)
+    plt.close(fig)
+    return path
+
+
+def write_html(tasks, output_dir, elapsed):
+    """
+    Single index.html with every figure, grouped by OS.
+    """
+    sections = {}
+    for path, title, _, _, _ in tasks:
+        sections.setdefault(path.split("/", 1)[0], []).append((path, title))
+
+    parts = ["<!DOCTYPE html>", "<html><head><meta charset=\"utf-8\"><title>Hashing Performance Report</title>",
+             "<style>body{font-family:sans-serif;margin:2em} img{max-width:100%;border:1px solid #ddd;margin-bottom:1em}</style>",
+             "</head><body>", "<h1>Hashing Performance Report</h1>",
+             f"<p>{len(tasks)} figures, generated {time.strftime('%Y-%m-%d %H:%M:%S')} in {elapsed:.1f} s.</p>"]
+    for section in sorted(sections, key=lambda name: (name == "all", name)):
+        parts.append(f"<h2>{'All OSes' if section == 'all' else html.escape(section)}</h2>")
+        for path, title in sections[section]:
+            parts.append(f"<h3>{html.escape(title)}</h3><img src=\"{html.escape(path)}\" alt=\"{html.escape(title)}\">")
+    parts.append("</body></html>")
+
+    index_path = os.path.join(output_dir, "index.html")
+    with open(index_path, "w") as file:
+        file.write("\n".join(parts))
+    return index_path
+
+
+def build_report(output_dir=DEFAULT_OUTPUT, workers=None, force=False):
+    """
+    Load all results once, render the figures whose inputs changed in parallel, and write index.html.
+    """
+    start = time.perf_counter()
+    tasks = figure_tasks(load_results())
+    version = _source_version()
+    os.makedirs(output_dir, exist_ok=True)
+
+    cache_path = os.path.join(output_dir, CACHE_FILE)
+    cache = {}
+    if os.path.exists(cache_path) and not force:
+        with open(cache_path, "r") as file:
+            cache = json.load(file)
+
+    keys = {task[0]: task_key(task, version) for task in tasks}
+    stale = [task for task in tasks if cache.get(task[0]) != keys[task[0]] or not os.path.exists(os.path.join(output_dir, task[0]))]
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            for path in executor.map(render, stale, [output_dir] * len(stale)):
+                cache[path] = keys[path]
+
+    with open(cache_path, "w") as file:
+        json.dump({path: cache[path] for path in keys if path in cache}, file, indent=1)
+    index_path = write_html(tasks, output_dir, time.perf_counter() - start)
+    print(f"{len(stale)} of {len(tasks)} figures rendered ({len(tasks) - len(stale)} unchanged) in {time.perf_counter() - start:.1f} s")
+    print(f"Report saved to {index_path}")
+    return index_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render every figure for every OS into one HTML report.")
+    parser.add_argument("--output", type=str, default=DEFAULT_OUTPUT, help="Report directory (index.html and PNG figures).")
+    parser.add_argument("--workers", type=int, default=None, help="Number of rendering processes (default: CPU count).")
+    parser.add_argument("--force", action="store_true", help="Re-render every figure, ignoring the content-hash cache.")
+    args = parser.parse_args()
+
+    build_report(args.output, args.workers, args.force)
@@ -0,0 +1,91 @@
+import csv
+import os
+import threading
+import time
+
+import psutil
+
+
+class ResourceSampler:
+    """
+    Background thread sampling a process's CPU time, RSS and I/O counters at a fixed interval.
+
+    Use as a context manager around the measured work. A sample is also taken synchronously on
+    entry and exit so the summary covers exactly the measured window. CPU time includes the
+    sampler thread itself, which is negligible at millisecond intervals. For the current process
+    total CPU time comes from time.process_time(), which is finer than psutil's clock ticks.
+    """
+
+    def __init__(self, interval=0.005, process=None):
+        self.interval = interval
+        self.process = process or psutil.Process(os.getpid())
+        self.own_process = self.process.pid == os.getpid()
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        with self.process.oneshot():
+            cpu = self.process.cpu_times()
+            sample = {
+                "Time (s)": time.perf_counter(),
+                "CPU User (s)": cpu.user,
+                "CPU System (s)": cpu.system,
+                "CPU Total (s)": time.process_time() if self.own_process else cpu.user + cpu.system,
+                "RSS (MB)": self.process.memory_info().rss / (1024 * 1024),
+                "Read (bytes)": None,
+                "Write (bytes)": None,
+            }
+            try:
+                io = self.process.io_counters()  # Not available on macOS
+                sample["Read (bytes)"] = io.read_bytes
+                sample["Write (bytes)"] = io.write_bytes
+            except (AttributeError, psutil.AccessDenied):
+                pass
+        self.samples.append(sample)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.samples = []
+        self._stop.clear()
+        self._sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return False
+
+    def summary(self):
+        """
+        Average CPU utilization (% of one core) and peak RSS over the sampled window.
+        """
+        first, last = self.samples[0], self.samples[-1]
+        elapsed = last["Time (s)"] - first["Time (s)"]
+        cpu_used = last["CPU Total (s)"] - first["CPU Total (s)"]
+        summary = {
+            "CPU (%)": cpu_used / elapsed * 100 if elapsed > 0 else 0.0,
+            "Peak Memory (MB)": max(sample["RSS (MB)"] for sample in self.samples),
+            "Samples": len(self.samples),
+        }
+        if first["Read (bytes)"] is not None:
+            summary["Read (bytes)"] = last["Read (bytes)"] - first["Read (bytes)"]
+        return summary
+
+    def write_csv(self, path):
+        """
+        Write the time series with times relative to the first sample.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        start = self.samples[0]["Time (s)"]
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(self.samples[0].keys()))
+            writer.writeheader()
+            for sample in self.samples:
+                writer.writerow({**sample, "Time (s)": round(sample["Time (s)"] - start, 6)})
@@ -0,0 +1,110 @@
+import argparse
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry points and how they are launched: (working directory, arguments after the interpreter).
+# --help exits right after argument parsing, so the run measures interpreter start plus module-level imports.
+ENTRY_POINTS = {
+    "hashing_speed": ("text-input", ["code/hashing/hashing_speed.py", "--help"]),
+    "hashing_speed_multithread": ("text-input", ["code/hashing/hashing_speed_multithread.py", "--help"]),
+    "small_message": ("text-input", ["code/hashing/small_message.py", "--help"]),
+    "resource_consumption": ("text-input", ["code/resource_usage/resource_consumption.py", "--help"]),
+    "isolated_runner": ("text-input", ["code/isolated_runner.py", "--help"]),
+    "isolated_worker": (".", ["-m", "hashbench.isolated", "--help"]),
+    "memprofile_worker": (".", ["-m", "hashbench.memprofile", "--help"]),
+    "server": ("blockchain", ["test_data/server.py", "--help"]),
+    "client": ("blockchain", ["test_data/client.py", "--help"]),
+    "harness": ("blockchain", ["test_data/harness.py", "--help"]),
+}
+# Libraries that only analysis, plotting or the HTTP server should pay for
+HEAVY_MODULES = ["numpy", "pandas", "scipy", "matplotlib", "fastapi", "pydantic", "uvicorn", "requests", "psutil"]
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr):
+    """
+    Per-module (self us, cumulative us, depth) from `python -X importtime` output.
+    """
+    modules = {}
+    for match in IMPORT_LINE.finditer(stderr):
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = (int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+    return modules
+
+
+def measure_entry_point(name, runs=5):
+    """
+    Launch an entry point `runs` times under -X importtime and return one row per run:
+    wall time, total import time, number of modules imported and the heavy libraries among them.
+    """
+    cwd, arguments = ENTRY_POINTS[name]
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    rows = []
+    for run in range(runs + 1):  # The first launch only warms the bytecode and page caches
+        start = time.perf_counter_ns()
+        completed = subprocess.run([sys.executable, "-X", "importtime", *arguments], cwd=os.path.join(REPO_ROOT, cwd),
+                                   env=env, capture_output=True, text=True)
+        wall_ns = time.perf_counter_ns() - start
+        if completed.returncode != 0:
+            raise RuntimeError(f"{name} failed to start: {completed.stderr.strip().splitlines()[-1]}")
+        if run == 0:
+            continue
+        modules = parse_importtime(completed.stderr)
+        import_us = sum(cumulative for _, cumulative, depth in modules.values() if depth == 0)
+        rows.append({
+            "Entry Point": name,
+            "Run": run,
+            "Wall Time (ms)": wall_ns / 1e6,
+            "Import Time (ms)": import_us / 1000,
+            "Modules": len(modules),
+            "Heavy Modules": " ".join(module for module in HEAVY_MODULES if module in modules),
+        })
+    return rows
+
+
+def slowest_imports(name, top=10):
+    """
+    Top-level imports of an entry point ordered by cumulative import time (ms).
+    """
+    cwd, arguments = ENTRY_POINTS[name]
+    completed = subprocess.run([sys.executable, "-X", "importtime", *arguments], cwd=os.path.join(REPO_ROOT, cwd),
+                               env=dict(os.environ, PYTHONPATH=REPO_ROOT), capture_output=True, text=True)
+    modules = parse_importtime(completed.stderr)
+    top_level = sorted(((cumulative, module) for module, (_, cumulative, depth) in modules.items() if depth == 0), reverse=True)
+    return [(module, cumulative / 1000) for cumulative, module in top_level[:top]]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure interpreter start-up and import time of each benchmark entry point.")
+    parser.add_argument("--entry_points", type=str, nargs="+", choices=sorted(ENTRY_POINTS), default=list(ENTRY_POINTS), help="Entry points to launch.")
+    parser.add_argument("--runs", type=int, default=5, help="Launches per entry point (after one warm-up launch).")
+    parser.add_argument("--label", type=str, default=platform.system(), help="Results label in the results store.")
+    parser.add_argument("--output", type=str, default=os.path.join(REPO_ROOT, "results", "startup_times.csv"), help="CSV file for the per-run measurements.")
+    parser.add_argument("--top", type=int, default=0, help="Also list the N slowest top-level imports of each entry point.")
+    args = parser.parse_args()
+
+    import pandas as pd
+    from hashbench.store import record_frame
+
+    rows = []
+    for name in args.entry_points:
+        rows.extend(measure_entry_point(name, args.runs))
+        if args.top:
+            print(f"{name}: " + ", ".join(f"{module} {ms:.1f} ms" for module, ms in slowest_imports(name, args.top)))
+
+    df = pd.DataFrame(rows)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    df.to_csv(args.output, index=False)
+    print(f"Startup times saved to {args.output}")
+    record_frame("startup", df, ["Wall Time (ms)", "Import Time (ms)", "Modules"], label=args.label,
+                 config={"runs": args.runs, "python": sys.version.split()[0]}, algorithm="Entry Point")
+
+    summary = df.groupby("Entry Point", sort=False).agg({"Wall Time (ms)": "median", "Import Time (ms)": "median",
+                                                         "Modules": "median", "Heavy Modules": "first"})
+    print(summary.round(1).to_string())
@@ -0,0 +1,354 @@
+import argparse
+import functools
+import glob
+import hashlib
+import json
+import os
+import platform
+import re
+import sqlite3
+import uuid
+from datetime import datetime, timezone
+
+from hashbench.hostinfo import fingerprint
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_STORE = os.environ.get("HASHBENCH_STORE") or os.path.join(REPO_ROOT, "results", "hashbench.sqlite")
+MB = 1024 * 1024
+
+# One row per measured value: (run, case, metric, sample). Run metadata is repeated on each row so
+# loads filter on a single indexed table without joins.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    benchmark TEXT NOT NULL,
+    os TEXT,
+    host_id TEXT,
+    label TEXT,
+    started_at TEXT,
+    source TEXT,
+    config TEXT,
+    host TEXT
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    run_id TEXT NOT NULL,
+    benchmark TEXT NOT NULL,
+    os TEXT,
+    host_id TEXT,
+    algorithm TEXT,
+    size_bytes INTEGER,
+    round INTEGER,
+    variant TEXT,
+    metric TEXT NOT NULL,
+    sample INTEGER,
+    value REAL
+);
+CREATE INDEX IF NOT EXISTS measurements_case ON measurements (benchmark, metric, algorithm, size_bytes);
+CREATE INDEX IF NOT EXISTS measurements_run ON measurements (run_id);
+CREATE INDEX IF NOT EXISTS runs_source ON runs (source);
+"""
+
+# Legacy text-input CSVs: (benchmark, relative path, metric columns)
+LEGACY_CSVS = [
+    ("speed_single_thread", "hashing/hashing_speed_single_thread_timing.csv", ["Timing (ms)", "Wall Time (ns)", "CPU Time (ns)"]),
+    ("speed_multi_thread", "hashing/hashing_speed_multi_threads_timing.csv", ["Timing (ms)", "Wall Time (ns)", "CPU Time (ns)"]),
+    ("resource", "resource_usage/hashing_resource_results.csv", ["CPU (%)", "Peak Memory (MB)", "Wall Time (ns)", "CPU Time (ns)"]),
+]
+ROUND_FILE = re.compile(r"round(\d+)\.txt$")
+# Per-block files written next to roundN.txt: (suffix, metric)
+ROUND_COMPANIONS = [("nonces", "Nonces"), ("pow", "PoW Time (ns)"), ("targets", "Expected Work")]
+
+# Hand-written hardware descriptions of the committed results, by results folder
+LEGACY_HOSTS = {"Linux": "linux.json", "Windows": "windows.json", "Aws": "aws-ec2.json"}
+
+
+def current_os():
+    """
+    OS name in the spelling used by the results folders (Linux, Windows, macOS).
+    """
+    return {"Darwin": "macOS"}.get(platform.system(), platform.system())
+
+
+@functools.lru_cache(maxsize=1)
+def current_host():
+    """
+    Fingerprint of this machine, taken once per process.
+    """
+    return fingerprint()
+
+
+def legacy_host(os_name):
+    """
+    Host description of a committed results folder from configuration/*.json, when one exists.
+    """
+    file_name = LEGACY_HOSTS.get(os_name)
+    if file_name is None:
+        return {"host_id": None}
+    with open(os.path.join(REPO_ROOT, "configuration", file_name), "r") as file:
+        info = json.load(file)
+    identity = json.dumps(info, sort_keys=True)
+    return {**info, "host_id": hashlib.blake2b(identity.encode("utf-8"), digest_size=6).hexdigest()}
+
+
+def connect(path=None):
+    """
+    Open (and create if needed) the results store.
+    """
+    path = path or DEFAULT_STORE
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    if "host" not in {row[1] for row in connection.execute("PRAGMA table_info(runs)")}:
+        connection.execute("ALTER TABLE runs ADD COLUMN host TEXT")  # Stores created before host fingerprints
+    return connection
+
+
+def start_run(benchmark, label=None, config=None, source=None, os_name=None, host=None, path=None):
+    """
+    Register a new run and return its id. `label` is the results folder name (e.g. --output Linux).
+    `host` is the host fingerprint stored with the run; it defaults to this machine's.
+    """
+    run_id = uuid.uuid4().hex
+    host = host or current_host()
+    with connect(path) as connection:
+        connection.execute(
+            "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (run_id, benchmark, os_name or current_os(), host["host_id"], label,
+             datetime.now(timezone.utc).isoformat(timespec="seconds"), source, json.dumps(config or {}, sort_keys=True),
+             json.dumps(host, sort_keys=True)),
+        )
+    return run_id
+
+
+def append_frame(run_id, df, metrics, algorithm="Algorithm", size=None, size_unit=MB, round=None, variant=None, path=None):
+    """
+    Append the `metrics` columns of a wide DataFrame to a run. `algorithm`, `size`, `round` and
+    `variant` name the columns identifying a case; `size` values are multiplied by `size_unit` to
+    store bytes. Repeated rows of the same case are numbered as samples. Missing values are skipped.
+    """
+    import pandas as pd
+    metrics = [metric for metric in metrics if metric in df.columns]
+    if df.empty or not metrics:
+        return 0
+
+    keys = {"algorithm": algorithm, "size_bytes": size, "round": round, "variant": variant}
+    cases = pd.DataFrame({key: df[column] if column else None for key, column in keys.items()}, index=df.index)
+    if size:
+        cases["size_bytes"] = (pd.to_numeric(cases["size_bytes"]) * size_unit).round().astype("Int64")
+    if round:
+        cases["round"] = cases["round"].astype(str).str.extract(r"(\d+)", expand=False).astype("Int64")
+    cases["sample"] = cases.fillna("").groupby(list(keys), sort=False).cumcount()
+
+    long = cases.join(df[metrics]).melt(id_vars=[*keys, "sample"], value_vars=metrics, var_name="metric")
+    long["value"] = pd.to_numeric(long["value"], errors="coerce")
+    long = long.dropna(subset=["value"])
+
+    with connect(path) as connection:
+        benchmark, os_name, host = connection.execute(
+            "SELECT benchmark, os, host_id FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        rows = (
+            (run_id, benchmark, os_name, host,
+             None if pd.isna(r.algorithm) else str(r.algorithm),
+             None if pd.isna(r.size_bytes) else int(r.size_bytes),
+             None if pd.isna(r.round) else int(r.round),
+             None if pd.isna(r.variant) else str(r.variant),
+             r.metric, int(r.sample), float(r.value))
+            for r in long.itertuples(index=False)
+        )
+        connection.executemany("INSERT INTO measurements VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(long)
+
+
+def record_frame(benchmark, df, metrics, label=None, config=None, source=None, os_name=None, host=None, path=None, **columns):
+    """
+    Start a run and append a DataFrame to it in one call. Returns the run id.
+    """
+    run_id = start_run(benchmark, label=label, config=config, source=source, os_name=os_name, host=host, path=path)
+    count = append_frame(run_id, df, metrics, path=path, **columns)
+    print(f"{count} measurements stored in {path or DEFAULT_STORE} (run {run_id})")
+    return run_id
+
+
+def completed_cases(label=None, path=None):
+    """
+    Case ids (the "case" config entry written by hashbench.sweep) of the runs stored under a label.
+    """
+    with connect(path) as connection:
+        configs = connection.execute("SELECT config FROM runs WHERE label IS ?", (label,)).fetchall()
+    return {json.loads(config).get("case") for (config,) in configs if config} - {None}
+
+
+def load(benchmark=None, metric=None, os_name=None, algorithm=None, run_id=None, label=None, latest=False, path=None):
+    """
+    Load measurements in long form, optionally filtered; each filter takes a value or a list of values.
+    Run metadata (label, start time, config) is joined in. With `latest`, only the most recent run per
+    (benchmark, label, algorithm, config) is kept.
+    """
+    import pandas as pd
+    filters = {"m.benchmark": benchmark, "m.metric": metric, "m.os": os_name, "m.algorithm": algorithm,
+               "m.run_id": run_id, "r.label": label}
+    clauses, params = [], []
+    for column, value in filters.items():
+        if value is None:
+            continue
+        values = [value] if isinstance(value, (str, int)) else list(value)
+        clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+        params.extend(values)
+
+    query = ("SELECT m.*, r.label, r.started_at, r.config, r.rowid AS run_order FROM measurements m JOIN runs r USING (run_id)"
+             + (" WHERE " + " AND ".join(clauses) if clauses else ""))
+    with connect(path) as connection:
+        df = pd.read_sql_query(query, connection, params=params)
+
+    if latest and not df.empty:
+        newest = df.groupby(["benchmark", "label", "algorithm", "config"], dropna=False)["run_order"].transform("max")
+        df = df[df["run_order"] == newest].reset_index(drop=True)
+    return df.drop(columns="run_order")
+
+
+def config_conflicts(df, keys=("benchmark", "algorithm", "size_bytes", "round", "variant")):
+    """
+    Cases of a load() frame whose samples come from runs with different configs (e.g. data profiles)
+    and would be pooled into one sample: one row per such case with its distinct configs.
+    Empty when every case was measured under a single config.
+    """
+    keys = [key for key in keys if key in df]
+    configs = df.assign(config=df["config"].fillna("")).groupby(keys, dropna=False)["config"].unique()
+    return configs[configs.map(len) > 1].reset_index()
+
+
+def load_wide(path=None, **filters):
+    """
+    Load measurements with one column per metric, like the per-benchmark CSVs.
+    """
+    df = load(path=path, **filters)
+    index = ["run_id", "benchmark", "os", "host_id", "label", "algorithm", "size_bytes", "round", "variant", "sample"]
+    wide = df.pivot_table(index=index, columns="metric", values="value", aggfunc="first", dropna=False)
+    wide = wide.dropna(how="all").reset_index()
+    wide.columns.name = None
+    return wide
+
+
+def runs(path=None):
+    """
+    All runs with their metadata.
+    """
+    import pandas as pd
+    with connect(path) as connection:
+        return pd.read_sql_query("SELECT * FROM runs ORDER BY started_at", connection)
+
+
+def hosts(path=None):
+    """
+    One row per host fingerprint seen in the store (latest fingerprint per host id), flattened into columns.
+    """
+    import pandas as pd
+    df = runs(path).dropna(subset=["host"]).drop_duplicates("host_id", keep="last")
+    return pd.json_normalize([json.loads(host) for host in df["host"]])
+
+
+def expected_work(target):
+    """
+    Expected nonces to find a proof below a hex target, 2**256 / target (16**puzzle in puzzle mode).
+    None when the target was not recorded.
+    """
+    try:
+        return 2 ** 256 / int(target, 16)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return None
+
+
+def read_round_files(folder):
+    """
+    Read a blockchain results folder of roundN.txt (mining ns) files into one DataFrame, with the
+    companion roundN_nonces.txt, roundN_pow.txt (proof-of-work ns) and roundN_targets.txt (hex target,
+    stored as the expected work 2**256 / target) when they were recorded.
+    Entries the client could not record ("N/A") are kept as missing values so blocks stay aligned;
+    empty files are skipped.
+    """
+    import pandas as pd
+    frames = []
+    for file_path in glob.glob(os.path.join(folder, "round*.txt")):
+        match = ROUND_FILE.search(os.path.basename(file_path))
+        if not match or os.path.getsize(file_path) == 0:
+            continue  # An interrupted run can leave an empty round file
+        times = pd.to_numeric(pd.read_csv(file_path, header=None)[0], errors="coerce")
+        df = pd.DataFrame({"Round": int(match.group(1)), "Mining Time (ns)": times})
+        for kind, column in ROUND_COMPANIONS:
+            companion_path = os.path.join(folder, f"round{match.group(1)}_{kind}.txt")
+            if not os.path.exists(companion_path) or os.path.getsize(companion_path) == 0:
+                continue
+            values = pd.read_csv(companion_path, header=None, dtype=str)[0]
+            if len(values) != len(times):
+                continue
+            if kind == "targets":
+                df[column] = [expected_work(value) for value in values]
+            else:
+                df[column] = pd.to_numeric(values, errors="coerce").values
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=["Round", "Mining Time (ns)"] + [column for _, column in ROUND_COMPANIONS])
+    return pd.concat(frames, ignore_index=True).sort_values("Round", kind="stable")
+
+
+def record_round_files(folder, hash_name, label=None, config=None, source=None, os_name=None, host=None, path=None):
+    """
+    Store one algorithm's round files as a "blockchain" run.
+    """
+    df = read_round_files(folder)
+    df["Algorithm"] = hash_name
+    return record_frame("blockchain", df, ["Mining Time (ns)"] + [column for _, column in ROUND_COMPANIONS], label=label,
+                        config=config, source=source, os_name=os_name, host=host, path=path, round="Round")
+
+
+def import_legacy(path=None):
+    """
+    Import the committed per-OS results (text-input CSVs and blockchain round files) once each;
+    files already imported (same source path) are skipped.
+    """
+    import pandas as pd
+    with connect(path) as connection:
+        imported = {row[0] for row in connection.execute("SELECT source FROM runs WHERE source IS NOT NULL")}
+
+    for os_folder in sorted(glob.glob(os.path.join(REPO_ROOT, "text-input", "results", "*"))):
+        os_name = os.path.basename(os_folder)
+        for benchmark, relative_path, metrics in LEGACY_CSVS:
+            csv_path = os.path.join(os_folder, relative_path)
+            source = os.path.relpath(csv_path, REPO_ROOT)
+            if os.path.exists(csv_path) and source not in imported:
+                record_frame(benchmark, pd.read_csv(csv_path), metrics, label=os_name, source=source,
+                             os_name=os_name, host=legacy_host(os_name), path=path, size="Data Size (MB)")
+
+    for hash_folder in sorted(glob.glob(os.path.join(REPO_ROOT, "blockchain", "test_data", "results", "*", "*"))):
+        if not os.path.isdir(hash_folder):
+            continue
+        os_name = os.path.basename(os.path.dirname(hash_folder))
+        source = os.path.relpath(hash_folder, REPO_ROOT)
+        if source not in imported:
+            record_round_files(hash_folder, os.path.basename(hash_folder), label=os_name, source=source,
+                               os_name=os_name, host=legacy_host(os_name), path=path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the unified benchmark results store.")
+    parser.add_argument("command", choices=["import", "summary", "hosts", "export"],
+                        help="'import' loads the committed CSV/round files, 'summary' lists stored runs, 'hosts' lists host fingerprints, 'export' writes a Parquet/CSV copy.")
+    parser.add_argument("--store", type=str, default=None, help=f"SQLite store path (default {DEFAULT_STORE}, or $HASHBENCH_STORE).")
+    parser.add_argument("--output", type=str, default="results.parquet", help="Export target; .parquet needs pyarrow, .csv works everywhere.")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        import_legacy(args.store)
+    elif args.command == "hosts":
+        print(hosts(args.store).to_string())
+    elif args.command == "summary":
+        df = load(path=args.store)
+        print(df.groupby(["benchmark", "os", "label"], dropna=False).agg(
+            runs=("run_id", "nunique"), algorithms=("algorithm", "nunique"), measurements=("value", "size")).to_string())
+    else:
+        df = load(path=args.store)
+        if args.output.endswith(".parquet"):
+            df.to_parquet(args.output, index=False)
+        else:
+            df.to_csv(args.output, index=False)
+        print(f"{len(df)} measurements exported to {args.output}")
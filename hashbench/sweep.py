@@ -0,0 +1,259 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+from hashbench.datagen import KINDS
+from hashbench.io_strategies import STRATEGIES
+from hashbench.isolated import CACHE_STATES
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPEED_DATA_DIR = os.path.join(REPO_ROOT, "text-input", "code", "data", "speed")
+BLOCKCHAIN_TEST_DATA = os.path.join(REPO_ROOT, "blockchain", "test_data")
+
+# Matrix keys of each benchmark: (case field, default). A list value is an axis of the matrix,
+# a scalar is fixed for every case of the entry; a None default means the key is required.
+FIELDS = {
+    "speed": {
+        "algorithms": ("algorithm", None),
+        "sizes_mb": ("size_mb", None),
+        "chunk_sizes": ("chunk_size", 64 * 1024),
+        "threads": ("threads", 1),
+        "io": ("io", "chunked"),
+        "profiles": ("profile", "random"),
+        "cache": ("cache", "none"),
+        "runs": ("runs", 5),
+    },
+    "resource": {
+        "algorithms": ("algorithm", None),
+        "sizes_mb": ("size_mb", None),
+        "chunk_sizes": ("chunk_size", 8192),
+        "threads": ("threads", 1),
+        "io": ("io", "chunked"),
+        "profiles": ("profile", "random"),
+        "cache": ("cache", "none"),
+        "runs": ("runs", 5),
+        "sample_interval": ("sample_interval", 0.005),
+    },
+    "blockchain": {
+        "algorithms": ("algorithm", None),
+        "puzzles": ("puzzle", 4),
+        "tx_per_block": ("tx_per_block", 8),
+        "blocks": ("blocks", 15),
+    },
+}
+CHOICES = {"io": STRATEGIES, "profile": KINDS, "cache": CACHE_STATES}
+
+
+def load_matrix(matrix_path):
+    """
+    Read a matrix file: TOML (Python 3.11+ or the tomli package) or JSON.
+    """
+    if matrix_path.endswith(".json"):
+        with open(matrix_path, "r") as file:
+            return json.load(file)
+    if tomllib is None:
+        raise RuntimeError("Reading TOML matrices needs Python 3.11+ or the tomli package; use a .json matrix instead")
+    with open(matrix_path, "rb") as file:
+        return tomllib.load(file)
+
+
+def expand_entry(entry):
+    """
+    Cases of one [[matrix]] entry: the cartesian product of its list-valued keys.
+    """
+    benchmark = entry.get("benchmark")
+    if benchmark not in FIELDS:
+        raise ValueError(f"Unknown benchmark '{benchmark}' (expected one of {', '.join(FIELDS)})")
+    unknown = set(entry) - set(FIELDS[benchmark]) - {"benchmark"}
+    if unknown:
+        raise ValueError(f"Unknown keys for {benchmark}: {', '.join(sorted(unknown))}")
+
+    axes = {}
+    for key, (field, default) in FIELDS[benchmark].items():
+        value = entry.get(key, default)
+        if value is None:
+            raise ValueError(f"Missing '{key}' in {benchmark} matrix entry")
+        values = value if isinstance(value, list) else [value]
+        for value in values:
+            if field in CHOICES and value not in CHOICES[field]:
+                raise ValueError(f"Unknown {field} '{value}' (expected one of {', '.join(CHOICES[field])})")
+        axes[field] = values
+
+    return [{"benchmark": benchmark, **dict(zip(axes, values))} for values in itertools.product(*axes.values())]
+
+
+def expand_matrix(matrix):
+    """
+    All cases of a matrix, in file order, without duplicates.
+    """
+    cases = {}
+    for entry in matrix.get("matrix", []):
+        for case in expand_entry(entry):
+            cases.setdefault(case_id(case), case)
+    return list(cases.values())
+
+
+def case_id(case):
+    """
+    Stable id of a case, stored in the run config so later sweeps can tell which cases are done.
+    """
+    return hashlib.blake2b(json.dumps(case, sort_keys=True).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def variant_name(case):
+    """
+    Store variant of a case: the axes that are not algorithm or data size.
+    """
+    if case["benchmark"] == "blockchain":
+        return f"puzzle {case['puzzle']} tx {case['tx_per_block']}"
+    return f"{case['io']} {case['chunk_size'] // 1024}KB x{case['threads']} {case['profile']} {case['cache']}"
+
+
+def describe(case):
+    if case["benchmark"] == "blockchain":
+        return f"blockchain {case['algorithm']} {variant_name(case)}"
+    return f"{case['benchmark']} {case['algorithm']} {case['size_mb']}MB {variant_name(case)}"
+
+
+def data_file(case):
+    return os.path.join(SPEED_DATA_DIR, f"{case['profile']}_{case['size_mb']}MB.bin")
+
+
+def ensure_data_files(cases):
+    """
+    Generate the data files the file-hashing cases read, once per (profile, size).
+    """
+    from hashbench.datagen import ensure_files
+
+    specs = {(os.path.basename(data_file(case)), case["profile"], case["size_mb"] * 1024 * 1024)
+             for case in cases if case["benchmark"] != "blockchain"}
+    if specs:
+        ensure_files(sorted(specs), SPEED_DATA_DIR)
+
+
+def run_blockchain_case(case):
+    """
+    Mine `blocks` blocks of `tx_per_block` transactions in-process with harness.py's timed phases.
+    """
+    if BLOCKCHAIN_TEST_DATA not in sys.path:
+        sys.path.insert(0, BLOCKCHAIN_TEST_DATA)
+    from chain import make_chain
+    from config import recipient_id, sender_id, tx_amount
+    from harness import apply_difficulty, mine_in_process
+    from merkle_tree import MerkleTree
+
+    blockchain = make_chain(case["algorithm"])
+    merkle_tree = MerkleTree(case["algorithm"])
+    apply_difficulty(blockchain, {"puzzle": case["puzzle"]})
+
+    tx = {'sender': sender_id, 'recipient': recipient_id, 'amount': tx_amount}
+    rows = []
+    for block in range(1, case["blocks"] + 1):
+        phases, nonces = mine_in_process(blockchain, merkle_tree, [tx] * case["tx_per_block"])
+        rows.append({"Block": block, "Nonces": nonces, **phases})
+    return rows
+
+
+def run_case(case):
+    """
+    Dispatch a case: file hashing runs in a fresh interpreter (hashbench.isolated), mining in-process.
+    """
+    if case["benchmark"] == "blockchain":
+        return run_blockchain_case(case)
+    from hashbench.isolated import run_case_in_subprocess
+
+    return run_case_in_subprocess({**case, "file": data_file(case)})
+
+
+def record_case(case, rows, label, path=None):
+    """
+    Store one case's measurements as its own run, tagged with the case id.
+    """
+    import pandas as pd
+    from hashbench.store import record_frame
+
+    df = pd.DataFrame(rows).assign(Algorithm=case["algorithm"], Variant=variant_name(case))
+    config = {**case, "case": case_id(case), "sweep": label}
+    if case["benchmark"] == "blockchain":
+        metrics = [column for column in df.columns if column.endswith("(ns)")] + ["Nonces"]
+        return record_frame("blockchain_phases", df, metrics, label=label, config=config, path=path, variant="Variant")
+
+    df["Data Size (MB)"] = case["size_mb"]
+    df["Timing (ms)"] = df["Wall Time (ns)"] / 1e6
+    df["Speed (MBps)"] = case["size_mb"] * case["threads"] / (df["Timing (ms)"] / 1000)
+    if case["benchmark"] == "resource":
+        benchmark = "resource"
+    else:
+        benchmark = "speed_single_thread" if case["threads"] == 1 else "speed_multi_thread"
+    metrics = [column for column in df.columns if column not in ("Algorithm", "Variant", "Data Size (MB)")]
+    return record_frame(benchmark, df, metrics, label=label, config=config, path=path, size="Data Size (MB)", variant="Variant")
+
+
+def pending_cases(cases, label, path=None):
+    """
+    Cases without a stored run under `label`.
+    """
+    from hashbench.store import completed_cases
+
+    done = completed_cases(label, path)
+    return [case for case in cases if case_id(case) not in done]
+
+
+def run_sweep(cases, label, seed=None, path=None):
+    """
+    Run every pending case in randomized order, storing each one as soon as it finishes, so an
+    interrupted sweep resumes where it stopped. Returns the number of cases run.
+    """
+    pending = pending_cases(cases, label, path)
+    print(f"{len(cases) - len(pending)} of {len(cases)} cases already stored under '{label}', {len(pending)} to run")
+    random.Random(seed).shuffle(pending)
+    ensure_data_files(pending)
+
+    for index, case in enumerate(pending, start=1):
+        print(f"[{index}/{len(pending)}] {describe(case)}")
+        try:
+            record_case(case, run_case(case), label, path)
+        except subprocess.CalledProcessError as e:
+            print(f"Error running {describe(case)}: {e.stderr.strip()}")
+    return len(pending)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a declarative benchmark matrix, skipping cases already in the results store.")
+    parser.add_argument("matrix", type=str, help="Matrix file (.toml or .json), e.g. configuration/sweep.toml.")
+    parser.add_argument("--label", type=str, default=None, help="Results label; cases stored under it are skipped (default: the matrix's label, or its file name).")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the case order (default: the matrix's seed).")
+    parser.add_argument("--store", type=str, default=None, help="SQLite store path (default results/hashbench.sqlite, or $HASHBENCH_STORE).")
+    parser.add_argument("--dry_run", action="store_true", help="List the pending cases without running them.")
+    args = parser.parse_args()
+
+    matrix = load_matrix(args.matrix)
+    label = args.label or matrix.get("label") or os.path.splitext(os.path.basename(args.matrix))[0]
+    seed = args.seed if args.seed is not None else matrix.get("seed")
+    cases = expand_matrix(matrix)
+
+    if args.dry_run:
+        pending = pending_cases(cases, label, args.store)
+        for case in pending:
+            print(f"{case_id(case)} {describe(case)}")
+        print(f"{len(pending)} of {len(cases)} cases pending under '{label}'")
+        sys.exit(0)
+
+    try:
+        run_sweep(cases, label, seed, args.store)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; finished cases are stored. Rerun with --label {label} to resume.")
+        sys.exit(130)
@@ -0,0 +1,165 @@
+import ctypes
+import os
+import platform
+import struct
+import threading
+import time
+import weakref
+
+# perf_event_open(2) constants
+PERF_TYPE_HARDWARE = 0
+PERF_COUNT_HW_CPU_CYCLES = 0
+PERF_COUNT_HW_INSTRUCTIONS = 1
+PERF_COUNT_HW_CACHE_MISSES = 3
+PERF_EVENT_IOC_ENABLE = 0x2400
+PERF_EVENT_IOC_DISABLE = 0x2401
+PERF_EVENT_IOC_RESET = 0x2403
+PERF_FLAG_DISABLED = 1 << 0
+PERF_FLAG_EXCLUDE_KERNEL = 1 << 5
+PERF_FLAG_EXCLUDE_HV = 1 << 6
+
+PERF_EVENT_OPEN_SYSCALL = {"x86_64": 298, "aarch64": 241, "i686": 336, "armv7l": 364, "ppc64le": 319, "s390x": 331}
+
+HARDWARE_EVENTS = {
+    "Cycles": PERF_COUNT_HW_CPU_CYCLES,
+    "Instructions": PERF_COUNT_HW_INSTRUCTIONS,
+    "Cache Misses": PERF_COUNT_HW_CACHE_MISSES,
+}
+
+
+class PerfEventAttr(ctypes.Structure):
+    """
+    Leading fields of struct perf_event_attr (PERF_ATTR_SIZE_VER0, 64 bytes).
+    """
+    _fields_ = [
+        ("type", ctypes.c_uint32),
+        ("size", ctypes.c_uint32),
+        ("config", ctypes.c_uint64),
+        ("sample_period", ctypes.c_uint64),
+        ("sample_type", ctypes.c_uint64),
+        ("read_format", ctypes.c_uint64),
+        ("flags", ctypes.c_uint64),
+        ("wakeup_events", ctypes.c_uint32),
+        ("bp_type", ctypes.c_uint32),
+        ("config1", ctypes.c_uint64),
+    ]
+
+
+class HardwareCounters:
+    """
+    User-space cycle, instruction and cache-miss counters for the calling thread via perf_event_open.
+    `available` is False when the platform or perf_event_paranoid does not allow it.
+    """
+
+    def __init__(self):
+        self.fds = {}
+        # Close the fds when the counters are dropped, e.g. with the threading.local of an exited worker thread
+        self._finalizer = weakref.finalize(self, _close_fds, self.fds)
+        syscall_nr = PERF_EVENT_OPEN_SYSCALL.get(platform.machine())
+        if platform.system() != "Linux" or syscall_nr is None:
+            return
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.ioctl = libc.ioctl
+        for name, config in HARDWARE_EVENTS.items():
+            attr = PerfEventAttr(type=PERF_TYPE_HARDWARE, size=ctypes.sizeof(PerfEventAttr), config=config,
+                                 flags=PERF_FLAG_DISABLED | PERF_FLAG_EXCLUDE_KERNEL | PERF_FLAG_EXCLUDE_HV)
+            fd = libc.syscall(syscall_nr, ctypes.byref(attr), 0, -1, -1, 0)
+            if fd < 0:
+                self.close()
+                return
+            self.fds[name] = fd
+
+    @property
+    def available(self):
+        return bool(self.fds)
+
+    def start(self):
+        for fd in self.fds.values():
+            self.ioctl(fd, PERF_EVENT_IOC_RESET, 0)
+            self.ioctl(fd, PERF_EVENT_IOC_ENABLE, 0)
+
+    def stop(self):
+        """
+        Stop counting and return {event name: count}.
+        """
+        counts = {}
+        for name, fd in self.fds.items():
+            self.ioctl(fd, PERF_EVENT_IOC_DISABLE, 0)
+            counts[name] = struct.unpack("Q", os.read(fd, 8))[0]
+        return counts
+
+    def close(self):
+        _close_fds(self.fds)
+
+
+def _close_fds(fds):
+    for fd in fds.values():
+        os.close(fd)
+    fds.clear()
+
+
+_thread_counters = threading.local()
+
+def thread_counters():
+    """
+    Return the calling thread's HardwareCounters, opening them on first use. They are closed when
+    the thread exits and its thread-local storage is released.
+    """
+    if not hasattr(_thread_counters, "counters"):
+        _thread_counters.counters = HardwareCounters()
+    return _thread_counters.counters
+
+
+class Timer:
+    """
+    Context manager recording wall time (perf_counter_ns), CPU time and, where available,
+    hardware counters for the enclosed block.
+
+    CPU time is per thread when `per_thread` is True (for use inside worker threads),
+    otherwise per process.
+    """
+
+    def __init__(self, per_thread=False, hardware=True):
+        self.cpu_clock = time.thread_time_ns if per_thread else time.process_time_ns
+        self.counters = thread_counters() if hardware else None
+        self.wall_ns = 0
+        self.cpu_ns = 0
+        self.hardware = {}
+
+    def __enter__(self):
+        if self.counters is not None and self.counters.available:
+            self.counters.start()
+        self._cpu_start = self.cpu_clock()
+        self._wall_start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wall_ns = time.perf_counter_ns() - self._wall_start
+        self.cpu_ns = self.cpu_clock() - self._cpu_start
+        if self.counters is not None and self.counters.available:
+            self.hardware = self.counters.stop()
+        return False
+
+    @property
+    def wall_ms(self):
+        return self.wall_ns / 1e6
+
+    def record(self):
+        """
+        Flat result row: wall and CPU time in ns plus each hardware counter (None when unavailable).
+        """
+        row = {"Wall Time (ns)": self.wall_ns, "CPU Time (ns)": self.cpu_ns}
+        for name in HARDWARE_EVENTS:
+            row[name] = self.hardware.get(name)
+        return row
+
+
+def cycles_per_byte(records, size_in_bytes):
+    """
+    Mean cycles per byte over Timer records, or None when no cycle counts were collected.
+    """
+    cycles = [record["Cycles"] for record in records if record.get("Cycles") is not None]
+    if not cycles or size_in_bytes <= 0:
+        return None
+    return sum(cycles) / len(cycles) / size_in_bytes
@@ -1,25 +1,9 @@
-import os
+import argparse
 
-def create_zero_filled_binary_file(file_name: str, size_in_bytes: int):
-    """
-    Create a zero-filled binary file.
-    """
-    with open(file_name, 'wb') as binary_file:
-        binary_file.write(b'\x00' * size_in_bytes)
-
-def create_repeated_pattern_binary_file(file_name: str, pattern: bytes, size_in_bytes: int):
-    """
-    Create a binary file with a repeated pattern.
-    """
-    with open(file_name, 'wb') as binary_file:
-        binary_file.write(pattern * (size_in_bytes // len(pattern)))
+from hashbench.datagen import DEFAULT_SEED, KINDS, ensure_files
 
-def create_random_binary_file(file_name: str, size_in_bytes: int):
-    """
-    Create a random binary file.
-    """
-    with open(file_name, 'wb') as binary_file:
-        binary_file.write(os.urandom(size_in_bytes))
+# File name prefix per data kind
+KIND_PREFIXES = {"zero": "zero_filled", "pattern": "pattern", "random": "random", "text": "text", "json": "json"}
 
 def generate_kb_file_sizes():
     """
@@ -41,34 +25,29 @@ def generate_mb_file_sizes():
     sizes_in_bytes = [size * 1024 * 1024 for size in sizes_in_mb]  # Convert to bytes
     return sizes_in_bytes
 
-def generate_files_for_multiple_sizes(sizes_in_bytes, size_label, output_folder="test_data"):
+def file_specs(sizes_in_bytes, size_label):
     """
-    Generate multiple binary files of varying sizes for all types: zero-filled, repeated-pattern, random.
+    (file name, kind, size in bytes) for every size and data kind: zero-filled, repeated-pattern, random, text and JSON.
     """
-    os.makedirs(output_folder, exist_ok=True)  # Ensure output folder exists
-
-    for size in sizes_in_bytes:
-        # Define file names
-        if size_label == "KB":
-            size_in_units = size // 1024
-        else:  # MB
-            size_in_units = size // (1024 * 1024)
-
-        zero_file_name = os.path.join(output_folder, f"zero_filled_{size_in_units}{size_label}.bin")
-        pattern_file_name = os.path.join(output_folder, f"pattern_{size_in_units}{size_label}.bin")
-        random_file_name = os.path.join(output_folder, f"random_{size_in_units}{size_label}.bin")
+    unit = 1024 if size_label == "KB" else 1024 * 1024
+    return [(f"{KIND_PREFIXES[kind]}_{size // unit}{size_label}.bin", kind, size)
+            for size in sizes_in_bytes for kind in KINDS]
 
-        # Generate files
-        create_zero_filled_binary_file(zero_file_name, size)
-        create_repeated_pattern_binary_file(pattern_file_name, b'AB', size)
-        create_random_binary_file(random_file_name, size)
-
-    print(f"Files of sizes {sizes_in_bytes} bytes ({size_label}) have been created in the '{output_folder}' folder.")
+def generate_files_for_multiple_sizes(sizes_in_bytes, size_label, output_folder="test_data", seed=DEFAULT_SEED, workers=None, verify=False):
+    """
+    Generate multiple binary files of varying sizes for all types, reusing files that are already valid.
+    """
+    ensure_files(file_specs(sizes_in_bytes, size_label), output_folder, seed=seed, workers=workers, verify_checksum=verify)
+    print(f"Files of sizes {sizes_in_bytes} bytes ({size_label}) are available in the '{output_folder}' folder.")
 
-# Generate KB and MB file sizes
-kb_file_sizes = generate_kb_file_sizes()
-mb_file_sizes = generate_mb_file_sizes()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate zero-filled, repeated-pattern, random, text and JSON test files.")
+    parser.add_argument("--output", type=str, default="test_data", help="Folder for the generated files.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed for the random files.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes used to write files.")
+    parser.add_argument("--verify", action="store_true", help="Re-hash existing files against their recorded checksums and regenerate mismatches.")
+    args = parser.parse_args()
 
-# Generate files for both KB and MB sizes
-generate_files_for_multiple_sizes(kb_file_sizes, "KB")
-generate_files_for_multiple_sizes(mb_file_sizes, "MB")
\ No newline at end of file
+    # Generate files for both KB and MB sizes
+    generate_files_for_multiple_sizes(generate_kb_file_sizes(), "KB", args.output, args.seed, args.workers, args.verify)
+    generate_files_for_multiple_sizes(generate_mb_file_sizes(), "MB", args.output, args.seed, args.workers, args.verify)
@@ -0,0 +1,31 @@
+import asyncio
+
+import pytest
+
+from hashbench import filehash
+
+
+def test_unexpected_worker_error_is_raised(tmp_path, monkeypatch):
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"file{i}"
+        path.write_bytes(b"x" * i)
+        paths.append(str(path))
+
+    def broken_digest_file(*args, **kwargs):
+        raise ValueError("broken cache")
+
+    monkeypatch.setattr(filehash, "digest_file", broken_digest_file)
+
+    async def collect(hasher):
+        return [result async for result in hasher.hash_paths(paths)]
+
+    with filehash.FileHasher(algorithm="sha256", workers=2, max_pending=2) as hasher:
+        with pytest.raises(ValueError, match="broken cache"):
+            asyncio.run(asyncio.wait_for(collect(hasher), timeout=10))
+
+
+def test_unreadable_file_is_reported(tmp_path):
+    missing = str(tmp_path / "missing")
+    [result] = filehash.hash_paths([missing], algorithm="sha256", cache=None)
+    assert result.path == missing and result.error
@@ -1,34 +1,29 @@
 import hashlib
-import time
 import os
+import sys
 import argparse
 from blake3 import blake3
-from scipy.stats import ttest_ind
-import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from hashbench.timing import Timer, cycles_per_byte, HARDWARE_EVENTS
+from hashbench.adaptive import run_adaptive
+from hashbench.datagen import KINDS, ensure_files
+from hashbench.store import record_frame
 
 # Configuration
 MAX_ITERATIONS = 5
 RUNS_PER_TEST = 5  # Number of runs for averaging and statistical testing
 CHUNK_SIZE = 64 * 1024  # 64KB
+PROFILES = KINDS  # Data profiles: zero, pattern, random, text, json
+DEFAULT_PROFILE = "random"
+CHUNK_SWEEP_SIZES = [4 * 1024 * 2 ** i for i in range(13)]  # 4KB to 16MB
+READ_METHODS = {"read": "chunked", "readinto": "streaming"}  # hashbench.io_strategies strategy of each read call
+NEAR_OPTIMAL = 0.05  # Chunk sizes within 5% of the best speed count as near-optimal
+CDC_PROFILES = ["zero", "pattern", "random"]  # Fully, periodically and not deduplicable content
 
 data_dir = "code/data/speed"
 results_dir = "results"
 
-os.makedirs(data_dir, exist_ok=True)
-os.makedirs(results_dir, exist_ok=True)
-
-def create_random_binary_file(file_name: str, size_in_bytes: int, chunk_size: int = 64 * 1024):
-    """
-    Create a random binary file in chunks to avoid memory overflow.
-    """
-    with open(file_name, 'wb') as binary_file:
-        bytes_written = 0
-        while bytes_written < size_in_bytes:
-            remaining_bytes = size_in_bytes - bytes_written
-            binary_file.write(os.urandom(min(chunk_size, remaining_bytes)))
-            bytes_written += min(chunk_size, remaining_bytes)
-
-    print(f"Created file: {file_name} with size: {size_in_bytes // (1024 * 1024)} MB")
 
 def generate_mb_file_sizes():
     """
@@ -37,21 +32,37 @@ def generate_mb_file_sizes():
     sizes_in_mb = [1, 2, 4, 8, 16, 32, 64, 128, 200, 512]# File sizes in MB
     return sizes_in_mb
 
-def generate_files_for_multiple_sizes(data_sizes_mb, output_folder):
+def data_file(data_size_mb, profile=DEFAULT_PROFILE):
     """
-    Generate binary files of specified sizes in MB.
+    Path of the data file for a size and data profile.
     """
-    os.makedirs(output_folder, exist_ok=True)
-    for size_mb in data_sizes_mb:
-        file_path = os.path.join(output_folder, f"random_{size_mb}MB.bin")
-        if not os.path.exists(file_path):
-            create_random_binary_file(file_path, size_mb * 1024 * 1024)
+    return os.path.join(data_dir, f"{profile}_{data_size_mb}MB.bin")
 
-def ensure_data_files_exist(data_sizes_mb):
+def profile_output_folder(output, profile=DEFAULT_PROFILE):
+    """
+    Results folder for a data profile. The default profile keeps results/<output>/hashing;
+    other profiles go to results/<output>/profiles/<profile>/hashing.
+    """
+    if profile == DEFAULT_PROFILE:
+        return os.path.join(results_dir, output, "hashing")
+    return os.path.join(results_dir, output, "profiles", profile, "hashing")
+
+def store_variant(profile=DEFAULT_PROFILE, mode=None):
+    """
+    Results-store variant of a run: the data profile and measurement mode (e.g. "zero adaptive").
+    Empty for random data measured with fixed runs, so those runs stay comparable with the legacy
+    results and the timing CSVs.
+    """
+    parts = ([] if profile == DEFAULT_PROFILE else [profile]) + ([mode] if mode else [])
+    return " ".join(parts) or None
+
+def ensure_data_files_exist(data_sizes_mb, profiles=(DEFAULT_PROFILE,)):
     """
     Ensure all required files exist in the data directory.
     """
-    generate_files_for_multiple_sizes(data_sizes_mb, data_dir)
+    specs = [(f"{profile}_{size_mb}MB.bin", profile, size_mb * 1024 * 1024)
+             for profile in profiles for size_mb in data_sizes_mb]
+    ensure_files(specs, data_dir)
 
 def warm_up(file_path, hash_function):
     """
@@ -61,11 +72,11 @@ def warm_up(file_path, hash_function):
         while chunk := file.read(CHUNK_SIZE):  # Read file in 64KB chunks
             hash_function(chunk)
 
-def measure_hashing_speed(algorithm, data_size_mb, iterations):
+def measure_hashing_speed(algorithm, data_size_mb, iterations, profile=DEFAULT_PROFILE):
     """
     Measure the hashing speed for a specific algorithm and file.
     """
-    file_path = os.path.join(data_dir, f"random_{data_size_mb}MB.bin")
+    file_path = data_file(data_size_mb, profile)
 
     if algorithm == "blake3":
         hash_function = lambda x: blake3(x).digest()
@@ -76,23 +87,94 @@ def measure_hashing_speed(algorithm, data_size_mb, iterations):
     warm_up(file_path, hash_function)
 
     timings = []
+    records = []
     for _ in range(RUNS_PER_TEST):
-        start_time = time.time()
+        with Timer() as timer:
+            with open(file_path, "rb") as file:
+                while chunk := file.read(CHUNK_SIZE):  # Read file in 64KB chunks
+                    hash_function(chunk)
+        timings.append(timer.wall_ms)  # perf_counter_ns converted to milliseconds
+        records.append(timer.record())
+
+    total_time = sum(timings)
+    avg_time = total_time / RUNS_PER_TEST
+    speed = data_size_mb / (avg_time / 1000)  # MBps
+    return timings, records, total_time, avg_time, speed
+
+def measure_hashing_speed_adaptive(algorithm, data_size_mb, target_rel_ci, time_budget, profile=DEFAULT_PROFILE):
+    """
+    Measure the hashing speed for a specific algorithm and file, repeating until the relative
+    confidence interval reaches `target_rel_ci` or `time_budget` seconds are spent.
+    """
+    file_path = data_file(data_size_mb, profile)
+
+    if algorithm == "blake3":
+        hash_function = lambda x: blake3(x).digest()
+    else:
+        hash_function = lambda x: hashlib.new(algorithm, x).digest()
+
+    # Warm-up phase
+    warm_up(file_path, hash_function)
+
+    def hash_file():
         with open(file_path, "rb") as file:
             while chunk := file.read(CHUNK_SIZE):  # Read file in 64KB chunks
                 hash_function(chunk)
-        end_time = time.time()
-        timings.append((end_time - start_time) * 1e3)  # Convert to milliseconds
 
-    total_time = sum(timings)
-    avg_time = total_time / RUNS_PER_TEST
-    speed = (data_size_mb * iterations * RUNS_PER_TEST) / (total_time / 1000)  # MBps
-    return timings, total_time, avg_time, speed
+    return run_adaptive(hash_file, target_rel_ci=target_rel_ci, time_budget=time_budget)
 
-def test_singlethread(algorithms, data_sizes_mb, iterations, output_folder):
+def test_singlethread_adaptive(algorithms, data_sizes_mb, output_folder, target_rel_ci, time_budget, profile=DEFAULT_PROFILE, label=None):
+    """
+    Perform single-threaded hashing tests with adaptive repetition and outlier rejection.
+    Writes the same CSV files as test_singlethread; the summary also records runs, inner loops,
+    rejected outliers, median/MAD and the achieved relative CI. Speed is based on the median.
+    """
+    import pandas as pd
+    timing_results = []
+    summary_results = []
+
+    os.makedirs(output_folder, exist_ok=True)
+
+    for algo in algorithms:
+        for size_mb in data_sizes_mb:
+            try:
+                result = measure_hashing_speed_adaptive(algo, size_mb, target_rel_ci, time_budget, profile)
+                samples, records = result["samples"], result["records"]
+
+                for timing, record in zip(samples, records):
+                    timing_results.append([algo, size_mb, timing, *record.values()])
+
+                total_time = sum(samples)
+                speed = size_mb / (result["median"] / 1000)  # MBps
+                cpb = cycles_per_byte(records, size_mb * 1024 * 1024)
+                summary_results.append([algo, size_mb, len(samples), total_time, total_time / len(samples), speed, cpb,
+                                        result["runs"], result["inner_loops"], result["outliers"],
+                                        result["median"], result["mad"], result["rel_ci"]])
+                print(f"{algo} {size_mb}MB: {result['runs']} runs x {result['inner_loops']} loops, "
+                      f"median {result['median']:.4f} ms, relative CI {result['rel_ci']:.4f}")
+            except Exception as e:
+                print(f"Error during test for {algo} with {size_mb}MB: {e}")
+
+    timing_csv = os.path.join(output_folder, "hashing_speed_single_thread_timing.csv")
+    timing_columns = ["Algorithm", "Data Size (MB)", "Timing (ms)", "Wall Time (ns)", "CPU Time (ns)", *HARDWARE_EVENTS]
+    timing_df = pd.DataFrame(timing_results, columns=timing_columns)
+    timing_df.to_csv(timing_csv, index=False)
+    print(f"Timing results saved to {timing_csv}")
+    record_frame("speed_single_thread", timing_df.assign(Variant=store_variant(profile, "adaptive")), timing_columns[2:],
+                 label=label, size="Data Size (MB)", variant="Variant",
+                 config={"profile": profile, "chunk_size": CHUNK_SIZE, "adaptive": True, "target_ci": target_rel_ci})
+
+    summary_csv = os.path.join(output_folder, "hashing_speed_single_thread_summary.csv")
+    summary_columns = ["Algorithm", "Data Size (MB)", "Iterations", "Total Time (ms)", "Avg Time (ms)", "Speed (MBps)", "Cycles per Byte",
+                       "Runs", "Inner Loops", "Outliers", "Median Time (ms)", "MAD (ms)", "Relative CI"]
+    pd.DataFrame(summary_results, columns=summary_columns).to_csv(summary_csv, index=False)
+    print(f"Summary results saved to {summary_csv}")
+
+def test_singlethread(algorithms, data_sizes_mb, iterations, output_folder, profile=DEFAULT_PROFILE, label=None):
     """
     Perform single-threaded hashing tests.
     """
+    import pandas as pd
     timing_results = []
     summary_results = []
 
@@ -101,82 +183,247 @@ def test_singlethread(algorithms, data_sizes_mb, iterations, output_folder):
     for algo in algorithms:
         for size_mb in data_sizes_mb:
             try:
-                timings, total_time, avg_time, speed = measure_hashing_speed(algo, size_mb, iterations)
+                timings, records, total_time, avg_time, speed = measure_hashing_speed(algo, size_mb, iterations, profile)
 
-                # Add raw timings
-                for timing in timings:
-                    timing_results.append([algo, size_mb, timing])
+                # Add raw timings with CPU time and hardware counters
+                for timing, record in zip(timings, records):
+                    timing_results.append([algo, size_mb, timing, *record.values()])
 
                 # Add summary metrics
-                summary_results.append([algo, size_mb, iterations, total_time, avg_time, speed])
+                cpb = cycles_per_byte(records, size_mb * 1024 * 1024)
+                summary_results.append([algo, size_mb, iterations, total_time, avg_time, speed, cpb])
             except Exception as e:
                 print(f"Error during test for {algo} with {size_mb}MB: {e}")
 
     # Save timing results to a CSV file
     timing_csv = os.path.join(output_folder, "hashing_speed_single_thread_timing.csv")
-    pd.DataFrame(timing_results, columns=["Algorithm", "Data Size (MB)", "Timing (ms)"]).to_csv(timing_csv, index=False)
+    timing_columns = ["Algorithm", "Data Size (MB)", "Timing (ms)", "Wall Time (ns)", "CPU Time (ns)", *HARDWARE_EVENTS]
+    timing_df = pd.DataFrame(timing_results, columns=timing_columns)
+    timing_df.to_csv(timing_csv, index=False)
     print(f"Timing results saved to {timing_csv}")
+    record_frame("speed_single_thread", timing_df.assign(Variant=store_variant(profile)), timing_columns[2:],
+                 label=label, size="Data Size (MB)", variant="Variant",
+                 config={"profile": profile, "chunk_size": CHUNK_SIZE, "runs": RUNS_PER_TEST})
 
     # Save summary results to a CSV file
     summary_csv = os.path.join(output_folder, "hashing_speed_single_thread_summary.csv")
-    pd.DataFrame(summary_results, columns=["Algorithm", "Data Size (MB)", "Iterations", "Total Time (ms)", "Avg Time (ms)", "Speed (MBps)"]).to_csv(summary_csv, index=False)
+    pd.DataFrame(summary_results, columns=["Algorithm", "Data Size (MB)", "Iterations", "Total Time (ms)", "Avg Time (ms)", "Speed (MBps)", "Cycles per Byte"]).to_csv(summary_csv, index=False)
+    print(f"Summary results saved to {summary_csv}")
+
+def test_chunk_sizes(algorithms, data_size_mb, output_folder, profile=DEFAULT_PROFILE, label=None):
+    """
+    Hash one file with every algorithm, read method (read() into a new bytes object per chunk, or
+    readinto() a reused buffer) and chunk size from 4KB to 16MB. Writes the per-run timings, a summary
+    per combination and the throughput-optimal chunk size per algorithm on this host.
+    """
+    import pandas as pd
+    from hashbench.io_strategies import hash_file
+    from hashbench.store import current_host
+
+    file_path = data_file(data_size_mb, profile)
+    timing_results = []
+
+    os.makedirs(output_folder, exist_ok=True)
+
+    for algo in algorithms:
+        for method, strategy in READ_METHODS.items():
+            for chunk_size in CHUNK_SWEEP_SIZES:
+                hash_file(file_path, algo, strategy, chunk_size)  # Warm-up
+                for _ in range(RUNS_PER_TEST):
+                    with Timer() as timer:
+                        hash_file(file_path, algo, strategy, chunk_size)
+                    timing_results.append([algo, method, chunk_size // 1024, data_size_mb, timer.wall_ms, *timer.record().values()])
+            print(f"{algo} {method}: {len(CHUNK_SWEEP_SIZES)} chunk sizes done")
+
+    timing_csv = os.path.join(output_folder, "hashing_chunk_size_timing.csv")
+    timing_columns = ["Algorithm", "Read Method", "Chunk Size (KB)", "Data Size (MB)", "Timing (ms)", "Wall Time (ns)", "CPU Time (ns)", *HARDWARE_EVENTS]
+    timing_df = pd.DataFrame(timing_results, columns=timing_columns)
+    timing_df.to_csv(timing_csv, index=False)
+    print(f"Timing results saved to {timing_csv}")
+    variant = timing_df["Read Method"] + " " + timing_df["Chunk Size (KB)"].astype(str) + "KB"
+    variants = timing_df.assign(Variant=variant if profile == DEFAULT_PROFILE else variant + " " + profile)
+    record_frame("chunk_size", variants, timing_columns[4:], label=label, size="Data Size (MB)", variant="Variant",
+                 config={"profile": profile, "runs": RUNS_PER_TEST})
+
+    # Speed from the median run, so one disturbed run does not move the optimum
+    summary = timing_df.groupby(["Algorithm", "Read Method", "Chunk Size (KB)"], sort=False)["Timing (ms)"].agg(
+        ["count", "sum", "mean", "median"]).reset_index()
+    summary.columns = ["Algorithm", "Read Method", "Chunk Size (KB)", "Iterations", "Total Time (ms)", "Avg Time (ms)", "Median Time (ms)"]
+    summary.insert(3, "Data Size (MB)", data_size_mb)
+    summary["Speed (MBps)"] = data_size_mb / (summary["Median Time (ms)"] / 1000)
+    summary_csv = os.path.join(output_folder, "hashing_chunk_size_summary.csv")
+    summary.to_csv(summary_csv, index=False)
+    print(f"Summary results saved to {summary_csv}")
+
+    optimal_results = []
+    for algo, group in summary.groupby("Algorithm", sort=False):
+        best = group.loc[group["Speed (MBps)"].idxmax()]
+        near = group[group["Speed (MBps)"] >= best["Speed (MBps)"] * (1 - NEAR_OPTIMAL)]
+        smallest = near.sort_values(["Chunk Size (KB)", "Speed (MBps)"], ascending=[True, False]).iloc[0]
+        default = group[(group["Read Method"] == "read") & (group["Chunk Size (KB)"] == CHUNK_SIZE // 1024)]["Speed (MBps)"]
+        default_speed = default.iloc[0] if len(default) else float("nan")
+        optimal_results.append([algo, current_host()["host_id"], best["Read Method"], best["Chunk Size (KB)"], best["Speed (MBps)"],
+                                smallest["Read Method"], smallest["Chunk Size (KB)"], smallest["Speed (MBps)"],
+                                default_speed, best["Speed (MBps)"] / default_speed])
+
+    optimal_csv = os.path.join(output_folder, "hashing_chunk_size_optimal.csv")
+    optimal_df = pd.DataFrame(optimal_results, columns=[
+        "Algorithm", "Host", "Best Read Method", "Best Chunk Size (KB)", "Best Speed (MBps)",
+        "Near-Optimal Read Method", "Near-Optimal Chunk Size (KB)", "Near-Optimal Speed (MBps)",
+        f"Read {CHUNK_SIZE // 1024}KB Speed (MBps)", f"Speedup vs Read {CHUNK_SIZE // 1024}KB"])
+    optimal_df.to_csv(optimal_csv, index=False)
+    print(f"Optimal chunk sizes saved to {optimal_csv}")
+    print(optimal_df.round(2).to_string(index=False))
+
+def test_cdc(algorithms, data_size_mb, output_folder, profiles=CDC_PROFILES, label=None):
+    """
+    Split each profile's file into content-defined chunks (FastCDC, hashbench/cdc.py), hash every
+    chunk and add it to a chunk index. Times the chunking and hashing stages separately and reports
+    throughput, chunk counts and the dedupe ratio per algorithm and profile.
+    """
+    import pandas as pd
+    from hashbench.cdc import ChunkIndex, chunk_file, cut_points, hash_chunks
+
+    timing_results = []
+    summary_results = []
+
+    os.makedirs(output_folder, exist_ok=True)
+
+    for profile in profiles:
+        file_path = data_file(data_size_mb, profile)
+        with open(file_path, "rb") as file:
+            data = file.read()  # Chunk from memory so the timings exclude I/O
+        for algo in algorithms:
+            chunk_file(file_path, algo)  # Warm-up
+            for run in range(1, RUNS_PER_TEST + 1):
+                with Timer() as chunk_timer:
+                    cuts = cut_points(data)
+                with Timer() as hash_timer:
+                    chunks = hash_chunks(data, cuts, algo)
+                index = ChunkIndex(algo)
+                index.add_chunks(chunks)
+                timing = chunk_timer.wall_ms + hash_timer.wall_ms
+                timing_results.append([algo, profile, data_size_mb, run, timing, chunk_timer.wall_ms, hash_timer.wall_ms,
+                                       data_size_mb / (timing / 1000)])
+            stats = index.stats()
+            summary_results.append([algo, profile, data_size_mb, stats["Chunks"], stats["Unique Chunks"], stats["Avg Chunk (KB)"],
+                                    stats["Dedupe Ratio"]])
+            print(f"{algo} {profile}: {stats['Chunks']} chunks, dedupe ratio {stats['Dedupe Ratio']:.2f}")
+
+    timing_csv = os.path.join(output_folder, "hashing_cdc_timing.csv")
+    timing_columns = ["Algorithm", "Data Profile", "Data Size (MB)", "Run", "Timing (ms)", "Chunking (ms)", "Hashing (ms)", "Speed (MBps)"]
+    timing_df = pd.DataFrame(timing_results, columns=timing_columns)
+    timing_df.to_csv(timing_csv, index=False)
+    print(f"Timing results saved to {timing_csv}")
+    record_frame("cdc", timing_df, timing_columns[4:], label=label, size="Data Size (MB)", variant="Data Profile",
+                 config={"runs": RUNS_PER_TEST})
+
+    summary_df = pd.DataFrame(summary_results, columns=["Algorithm", "Data Profile", "Data Size (MB)", "Chunks", "Unique Chunks",
+                                                        "Avg Chunk (KB)", "Dedupe Ratio"])
+    speeds = timing_df.groupby(["Algorithm", "Data Profile"], sort=False)[["Chunking (ms)", "Hashing (ms)", "Speed (MBps)"]].median()
+    summary_df = summary_df.join(speeds, on=["Algorithm", "Data Profile"])
+    summary_csv = os.path.join(output_folder, "hashing_cdc_summary.csv")
+    summary_df.to_csv(summary_csv, index=False)
     print(f"Summary results saved to {summary_csv}")
 
 def perform_t_tests(timing_csv, output_folder):
     """
-    Perform T-tests on timing results for algorithm comparisons.
+    Compare every pair of algorithms at each data size: Welch t-test, Mann-Whitney U, effect sizes,
+    bootstrap CI of the timing ratio and multiple-comparison corrected p-values.
     """
+    import pandas as pd
+    from hashbench.analysis import pairwise_tests
+
     df = pd.read_csv(timing_csv)
-    data_sizes = df["Data Size (MB)"].unique()
-
-    # Specify algorithm pairs for comparison
-    comparison_pairs = [("blake3", "sha256"), ("blake2s", "blake2b")]
-
-    t_test_results = []
-    for size in data_sizes:
-        subset = df[df["Data Size (MB)"] == size]
-        for algo1, algo2 in comparison_pairs:
-            times_algo1 = subset[subset["Algorithm"] == algo1]["Timing (ms)"].values
-            times_algo2 = subset[subset["Algorithm"] == algo2]["Timing (ms)"].values
-
-            if len(times_algo1) > 1 and len(times_algo2) > 1:
-                t_stat, p_value = ttest_ind(times_algo1, times_algo2, equal_var=False)
-                t_test_results.append({
-                    "Data Size (MB)": size,
-                    "Algorithm 1": algo1,
-                    "Algorithm 2": algo2,
-                    "T-Statistic": round(t_stat, 4),
-                    "P-Value": round(p_value, 6)
-                })
+    t_test_results = pairwise_tests(df, "Timing (ms)", ["Data Size (MB)"]).round({"T-Statistic": 4, "P-Value": 6})
 
     # Save T-test results to CSV
     t_test_output = os.path.join(output_folder, "hashing_t_test_single_thread_results.csv")
-    pd.DataFrame(t_test_results).to_csv(t_test_output, index=False)
+    t_test_results.to_csv(t_test_output, index=False)
     print(f"T-test results saved to {t_test_output}")
 
+def compare_profiles(output, profiles):
+    """
+    Combine the per-profile summaries into one table with each profile's speed relative to the
+    default profile (or the first profile run), to check that throughput is content-independent.
+    """
+    import pandas as pd
+    frames = []
+    for profile in profiles:
+        summary_csv = os.path.join(profile_output_folder(output, profile), "hashing_speed_single_thread_summary.csv")
+        df = pd.read_csv(summary_csv, usecols=["Algorithm", "Data Size (MB)", "Speed (MBps)"])
+        df["Data Profile"] = profile
+        frames.append(df)
+    df = pd.concat(frames, ignore_index=True)
+
+    reference = DEFAULT_PROFILE if DEFAULT_PROFILE in profiles else profiles[0]
+    reference_speed = df[df["Data Profile"] == reference].set_index(["Algorithm", "Data Size (MB)"])["Speed (MBps)"]
+    keys = pd.MultiIndex.from_frame(df[["Algorithm", "Data Size (MB)"]])
+    df[f"Speed vs {reference.capitalize()}"] = df["Speed (MBps)"].values / reference_speed.reindex(keys).values
+
+    comparison_folder = profile_output_folder(output)
+    os.makedirs(comparison_folder, exist_ok=True)
+    comparison_csv = os.path.join(comparison_folder, "hashing_speed_profile_comparison.csv")
+    df.sort_values(["Algorithm", "Data Size (MB)", "Data Profile"]).to_csv(comparison_csv, index=False)
+    print(f"Profile comparison saved to {comparison_csv}")
+
 def main():
     parser = argparse.ArgumentParser(description="Run single-threaded hashing speed test and save results to CSV.")
     parser.add_argument("--output", type=str, required=True, help="Output subdirectory under ./results/")
+    parser.add_argument("--adaptive", action="store_true", help="Repeat each case until --target_ci or --time_budget is reached instead of RUNS_PER_TEST times.")
+    parser.add_argument("--target_ci", type=float, default=0.02, help="Target relative half-width of the 95%% CI in adaptive mode.")
+    parser.add_argument("--time_budget", type=float, default=10.0, help="Maximum seconds spent per case in adaptive mode.")
+    parser.add_argument("--profiles", type=str, nargs="+", choices=PROFILES, default=[DEFAULT_PROFILE], help="Data profiles (file contents) to hash.")
+    parser.add_argument("--chunk_sweep", action="store_true", help="Sweep read()/readinto() chunk sizes from 4KB to 16MB on one file instead of the size test.")
+    parser.add_argument("--chunk_sweep_size", type=int, default=128, help="Data size (MB) of the file hashed by --chunk_sweep.")
+    parser.add_argument("--cdc", action="store_true", help="Benchmark content-defined chunking plus per-chunk hashing on zero, pattern and random files.")
+    parser.add_argument("--cdc_size", type=int, default=64, help="Data size (MB) of the files chunked by --cdc.")
     args = parser.parse_args()
 
-    output_folder = os.path.join(results_dir, args.output) + "/hashing"
-    os.makedirs(output_folder, exist_ok=True)
-
     algorithms = ['md5', 'sha1', 'sha256', 'sha512', 'sha3_256', 'blake2s', 'blake2b', 'blake3']
     data_sizes_mb = generate_mb_file_sizes()
     iterations = MAX_ITERATIONS
 
+    if args.cdc:
+        print("Running content-defined chunking test...")
+        ensure_data_files_exist([args.cdc_size], CDC_PROFILES)
+        test_cdc(algorithms, args.cdc_size, profile_output_folder(args.output), CDC_PROFILES, args.output)
+        return
+
+    if args.chunk_sweep:
+        print("Running chunk-size sweep...")
+        ensure_data_files_exist([args.chunk_sweep_size], args.profiles)
+        for profile in args.profiles:
+            print(f"Data profile: {profile}")
+            test_chunk_sizes(algorithms, args.chunk_sweep_size, profile_output_folder(args.output, profile), profile, args.output)
+        return
+
     print("Running single-threaded hashing test...")
 
     # Ensure data files exist
-    ensure_data_files_exist(data_sizes_mb)
+    ensure_data_files_exist(data_sizes_mb, args.profiles)
 
-    # Perform tests
-    test_singlethread(algorithms, data_sizes_mb, iterations, output_folder)
+    for profile in args.profiles:
+        print(f"Data profile: {profile}")
+        output_folder = profile_output_folder(args.output, profile)
+        os.makedirs(output_folder, exist_ok=True)
 
-    # Perform T-tests
-    timing_csv = os.path.join(output_folder, "hashing_speed_single_thread_timing.csv")
-    perform_t_tests(timing_csv, output_folder)
+        # Perform tests
+        if args.adaptive:
+            test_singlethread_adaptive(algorithms, data_sizes_mb, output_folder, args.target_ci, args.time_budget, profile, args.output)
+        else:
+            test_singlethread(algorithms, data_sizes_mb, iterations, output_folder, profile, args.output)
+
+        # Perform T-tests
+        timing_csv = os.path.join(output_folder, "hashing_speed_single_thread_timing.csv")
+        perform_t_tests(timing_csv, output_folder)
+
+        # Fit time = overhead + size / bandwidth
+        from hashbench.fit import fit_timing_csv
+        fit_timing_csv(timing_csv, output_folder)
+
+    if len(args.profiles) > 1:
+        compare_profiles(args.output, args.profiles)
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,15 @@
 import hashlib
-import time
 import os
+import sys
 import argparse
 from threading import Thread, Lock
 from queue import Queue
 from blake3 import blake3
-from scipy.stats import ttest_ind
-import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from hashbench.timing import Timer, cycles_per_byte, HARDWARE_EVENTS
+from hashbench.datagen import ensure_files
+from hashbench.store import record_frame
 
 MAX_THREADS = 8
 RUNS_PER_TEST = 5  # Number of runs for meaningful T-tests
@@ -15,24 +18,8 @@ CHUNK_SIZE = 64 * 1024  # 64KB for file reads
 data_dir = "code/data/speed"
 results_dir = "results"
 
-os.makedirs(data_dir, exist_ok=True)
-os.makedirs(results_dir, exist_ok=True)
-
 lock = Lock()
 
-def create_random_binary_file(file_name: str, size_in_bytes: int, chunk_size: int = 64 * 1024):
-    """
-    Create a random binary file in chunks to avoid memory overflow.
-    """
-    with open(file_name, 'wb') as binary_file:
-        bytes_written = 0
-        while bytes_written < size_in_bytes:
-            remaining_bytes = size_in_bytes - bytes_written
-            binary_file.write(os.urandom(min(chunk_size, remaining_bytes)))
-            bytes_written += min(chunk_size, remaining_bytes)
-
-    print(f"Created file: {file_name} with size: {size_in_bytes // (1024 * 1024)} MB")
-
 def generate_mb_file_sizes():
     """
     Generate a list of file sizes in MB.
@@ -42,10 +29,11 @@ def generate_mb_file_sizes():
 
 def cleanup_extra_files(data_sizes_mb, folder):
     """
-    Remove any extra files in the folder that are not part of the intended sizes.
+    Remove any extra random files in the folder that are not part of the intended sizes.
+    Files of other data profiles (shared with hashing_speed.py) are left alone.
     """
     intended_files = {f"random_{size}MB.bin" for size in data_sizes_mb}
-    existing_files = set(os.listdir(folder))
+    existing_files = {name for name in os.listdir(folder) if name.startswith("random_")}
 
     # Find extra files
     extra_files = existing_files - intended_files
@@ -54,22 +42,13 @@ def cleanup_extra_files(data_sizes_mb, folder):
         os.remove(file_path)
         print(f"Removed extra file: {file_path}")
 
-def generate_files_for_multiple_sizes(data_sizes_mb, output_folder):
-    """
-    Generate binary files of specified sizes in MB.
-    """
-    os.makedirs(output_folder, exist_ok=True)
-    for size_mb in data_sizes_mb:
-        file_path = os.path.join(output_folder, f"random_{size_mb}MB.bin")
-        if not os.path.exists(file_path):
-            create_random_binary_file(file_path, size_mb * 1024 * 1024)
-
 def ensure_data_files_exist():
     """
     Ensure all required files exist in the data directory.
     """
     file_sizes_mb = generate_mb_file_sizes()
-    generate_files_for_multiple_sizes(file_sizes_mb, data_dir)
+    specs = [(f"random_{size_mb}MB.bin", "random", size_mb * 1024 * 1024) for size_mb in file_sizes_mb]
+    ensure_files(specs, data_dir)
     cleanup_extra_files(file_sizes_mb, data_dir)
 
 def warm_up(file_path, hash_function):
@@ -92,18 +71,19 @@ def measure_hashing_speed(algorithm, file_path, data_size_mb):
     warm_up(file_path, hash_function)
 
     timings = []
+    records = []
     for _ in range(RUNS_PER_TEST):
-        start_time = time.time()
-        with open(file_path, "rb") as file:
-            while chunk := file.read(CHUNK_SIZE):
-                hash_function(chunk)
-        end_time = time.time()
-        timings.append((end_time - start_time) * 1e3)  # Convert seconds to milliseconds
+        with Timer(per_thread=True) as timer:  # CPU time and counters of this worker thread only
+            with open(file_path, "rb") as file:
+                while chunk := file.read(CHUNK_SIZE):
+                    hash_function(chunk)
+        timings.append(timer.wall_ms)  # perf_counter_ns converted to milliseconds
+        records.append(timer.record())
 
     total_time = sum(timings)
     avg_time = total_time / RUNS_PER_TEST
-    speed = data_size_mb / (total_time / 1000)  # MBps
-    return timings, total_time, avg_time, speed
+    speed = data_size_mb / (avg_time / 1000)  # MBps
+    return timings, records, total_time, avg_time, speed
 
 def worker(queue, timing_results, summary_results):
     """
@@ -112,11 +92,12 @@ def worker(queue, timing_results, summary_results):
     while not queue.empty():
         algo, file_path, size_mb = queue.get()
         try:
-            timings, total_time, avg_time, speed = measure_hashing_speed(algo, file_path, size_mb)
+            timings, records, total_time, avg_time, speed = measure_hashing_speed(algo, file_path, size_mb)
+            cpb = cycles_per_byte(records, size_mb * 1024 * 1024)
             with lock:
-                for timing in timings:
-                    timing_results.append([algo, size_mb, timing])
-                summary_results.append([algo, size_mb, total_time, avg_time, speed])
+                for timing, record in zip(timings, records):
+                    timing_results.append([algo, size_mb, timing, *record.values()])
+                summary_results.append([algo, size_mb, total_time, avg_time, speed, cpb])
         except Exception as e:
             print(f"Error processing {algo} with {file_path}: {e}")
         finally:
@@ -147,30 +128,17 @@ def test_multithreading(algorithms, files_info):
 
 def perform_t_tests(timing_results_csv, output_folder):
     """
-    Perform T-tests on timing results for algorithm comparisons.
+    Compare every pair of algorithms at each data size: Welch t-test, Mann-Whitney U, effect sizes,
+    bootstrap CI of the timing ratio and multiple-comparison corrected p-values.
     """
+    import pandas as pd
+    from hashbench.analysis import pairwise_tests
+
     df = pd.read_csv(timing_results_csv)
-    comparison_pairs = [("blake3", "sha256"), ("blake2s", "blake2b")]
-    t_test_results = []
-
-    for size in df["Data Size (MB)"].unique():
-        subset = df[df["Data Size (MB)"] == size]
-        for algo1, algo2 in comparison_pairs:
-            times1 = subset[subset["Algorithm"] == algo1]["Timing (ms)"]
-            times2 = subset[subset["Algorithm"] == algo2]["Timing (ms)"]
-
-            if len(times1) > 1 and len(times2) > 1:
-                t_stat, p_value = ttest_ind(times1, times2, equal_var=False)
-                t_test_results.append({
-                    "Data Size (MB)": size,
-                    "Algorithm 1": algo1,
-                    "Algorithm 2": algo2,
-                    "T-Statistic": round(t_stat, 4),
-                    "P-Value": round(p_value, 6)
-                })
+    t_test_results = pairwise_tests(df, "Timing (ms)", ["Data Size (MB)"]).round({"T-Statistic": 4, "P-Value": 6})
 
     t_test_file = os.path.join(output_folder, "hashing_t_multi_threads_test_results.csv")
-    pd.DataFrame(t_test_results).to_csv(t_test_file, index=False)
+    t_test_results.to_csv(t_test_file, index=False)
     print(f"T-test results saved to {t_test_file}")
 
 def main():
@@ -194,16 +162,26 @@ def main():
     algorithms = ['blake3', 'blake2s', 'blake2b', 'sha256']
     timing_results, summary_results = test_multithreading(algorithms, files_info)
 
+    import pandas as pd
+
     # Save timing results
     timing_csv = os.path.join(output_folder, "hashing_speed_multi_threads_timing.csv")
-    pd.DataFrame(timing_results, columns=["Algorithm", "Data Size (MB)", "Timing (ms)"]).to_csv(timing_csv, index=False)
+    timing_columns = ["Algorithm", "Data Size (MB)", "Timing (ms)", "Wall Time (ns)", "CPU Time (ns)", *HARDWARE_EVENTS]
+    timing_df = pd.DataFrame(timing_results, columns=timing_columns)
+    timing_df.to_csv(timing_csv, index=False)
+    record_frame("speed_multi_thread", timing_df, timing_columns[2:], label=args.output, size="Data Size (MB)",
+                 config={"threads": MAX_THREADS, "chunk_size": CHUNK_SIZE})
 
     # Save summary results
     summary_csv = os.path.join(output_folder, "hashing_speed_multi_threads_summary.csv")
-    pd.DataFrame(summary_results, columns=["Algorithm", "Data Size (MB)", "Total Time (ms)", "Avg Time (ms)", "Speed (MBps)"]).to_csv(summary_csv, index=False)
+    pd.DataFrame(summary_results, columns=["Algorithm", "Data Size (MB)", "Total Time (ms)", "Avg Time (ms)", "Speed (MBps)", "Cycles per Byte"]).to_csv(summary_csv, index=False)
 
     # Perform T-tests
     perform_t_tests(timing_csv, output_folder)
 
+    # Fit time = overhead + size / bandwidth
+    from hashbench.fit import fit_timing_csv
+    fit_timing_csv(timing_csv, output_folder)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,144 @@
+import hashlib
+import os
+import sys
+import argparse
+from blake3 import blake3
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from hashbench.adaptive import run_adaptive
+from hashbench.hashers import hash_batch, hash_constructor, hash_packed, hash_records
+from hashbench.store import record_frame
+
+# Configuration
+BATCH_SIZE = 1024  # Messages hashed per timed call
+TARGET_REL_CI = 0.02
+TIME_BUDGET = 2.0  # Seconds per case
+MERKLE_LEAF_COUNTS = [16, 256, 4096, 65536]  # Transactions per MerkleTree in the leaf ingestion test
+BLOCKCHAIN_TEST_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "blockchain", "test_data")
+
+results_dir = "results"
+
+def generate_message_sizes():
+    """
+    Generate message sizes from 16 B to 64 KB (powers of two).
+    """
+    return [2 ** exponent for exponent in range(4, 17)]
+
+def make_case(mode, algorithm, messages, packed, message_size):
+    """
+    Return a function hashing the whole batch with the given API:
+    "per-call" mirrors the benchmark scripts (hashlib.new / blake3 per message),
+    "batch" hashes the list in one call, "packed" hashes fixed-size records of one buffer,
+    "parallel" hashes them with the thread-pool engine into a preallocated output.
+    """
+    if mode == "per-call":
+        if algorithm == "blake3":
+            hash_function = lambda x: blake3(x).digest()
+        else:
+            hash_function = lambda x: hashlib.new(algorithm, x).digest()
+        return lambda: [hash_function(message) for message in messages]
+    if mode == "batch":
+        return lambda: hash_batch(algorithm, messages)
+    if mode == "packed":
+        return lambda: hash_packed(algorithm, packed, record_size=message_size)
+    if mode == "parallel":
+        out = bytearray(len(messages) * hash_constructor(algorithm)().digest_size)
+        return lambda: hash_records(algorithm, packed, record_size=message_size, out=out)
+    raise ValueError(f"Unknown mode '{mode}'")
+
+def test_small_messages(algorithms, message_sizes, modes, output_folder, label=None):
+    """
+    Measure ns/hash and hashes/s for every algorithm, message size and API mode.
+    """
+    import pandas as pd
+    results = []
+    for message_size in message_sizes:
+        packed = os.urandom(message_size * BATCH_SIZE)
+        messages = [packed[i:i + message_size] for i in range(0, len(packed), message_size)]
+        for algo in algorithms:
+            for mode in modes:
+                result = run_adaptive(make_case(mode, algo, messages, packed, message_size),
+                                      target_rel_ci=TARGET_REL_CI, time_budget=TIME_BUDGET)
+                ns_per_hash = result["median"] * 1e6 / BATCH_SIZE
+                results.append([algo, message_size, mode, ns_per_hash, 1e9 / ns_per_hash,
+                                message_size / ns_per_hash * 1e9 / (1024 * 1024), result["runs"], result["rel_ci"]])
+                print(f"{algo} {message_size}B {mode}: {ns_per_hash:.1f} ns/hash")
+
+    results_csv = os.path.join(output_folder, "small_message_results.csv")
+    columns = ["Algorithm", "Message Size (B)", "Mode", "ns/hash", "Hashes/s", "Throughput (MBps)", "Runs", "Relative CI"]
+    results_df = pd.DataFrame(results, columns=columns)
+    results_df.to_csv(results_csv, index=False)
+    print(f"Small-message results saved to {results_csv}")
+    record_frame("small_message", results_df, columns[3:], label=label, size="Message Size (B)", size_unit=1, variant="Mode",
+                 config={"batch_size": BATCH_SIZE})
+
+def test_merkle_leaves(algorithms, leaf_counts, output_folder, label=None):
+    """
+    Records/s of MerkleTree leaf ingestion for block-sized to very large transaction lists:
+    "per-object" is the original loop (encode, hash, hexdigest and fromhex per transaction),
+    "add_leaf" the current add_leaf(txs, True), and "packed" add_packed_leaves on transactions that
+    arrive packed in one buffer with offsets, hashed by the batch engine into a preallocated output.
+    """
+    import pandas as pd
+    sys.path.insert(0, BLOCKCHAIN_TEST_DATA)
+    from merkle_tree import MerkleTree
+    from hashbench.hashers import pack_records
+
+    results = []
+    for algo in algorithms:
+        tree = MerkleTree(algo)
+
+        def per_object(txs, packed):
+            tree.reset_tree()
+            tree.add_leaf([tree.hash_function(tx.encode('utf-8')).hexdigest() for tx in txs])
+
+        def add_leaf(txs, packed):
+            tree.reset_tree()
+            tree.add_leaf(txs, True)
+
+        def add_packed(txs, packed):
+            tree.reset_tree()
+            tree.add_packed_leaves(*packed)
+
+        for count in leaf_counts:
+            txs = [str({'sender': os.urandom(16).hex(), 'recipient': os.urandom(16).hex(), 'amount': i}) for i in range(count)]
+            packed = pack_records([tx.encode('utf-8') for tx in txs])
+            for mode, ingest in [("per-object", per_object), ("add_leaf", add_leaf), ("packed", add_packed)]:
+                result = run_adaptive(lambda: ingest(txs, packed), target_rel_ci=TARGET_REL_CI, time_budget=TIME_BUDGET)
+                ns_per_record = result["median"] * 1e6 / count
+                results.append([algo, count, mode, ns_per_record, 1e9 / ns_per_record, result["runs"], result["rel_ci"]])
+                print(f"{algo} {count} leaves {mode}: {1e9 / ns_per_record:.0f} records/s")
+
+    results_csv = os.path.join(output_folder, "merkle_leaf_results.csv")
+    columns = ["Algorithm", "Leaves", "Mode", "ns/record", "Records/s", "Runs", "Relative CI"]
+    results_df = pd.DataFrame(results, columns=columns)
+    per_object_rate = results_df[results_df["Mode"] == "per-object"].set_index(["Algorithm", "Leaves"])["Records/s"]
+    keys = pd.MultiIndex.from_frame(results_df[["Algorithm", "Leaves"]])
+    results_df["Speedup vs Per-Object"] = results_df["Records/s"].values / per_object_rate.reindex(keys).values
+    results_df.to_csv(results_csv, index=False)
+    print(f"Merkle leaf results saved to {results_csv}")
+    results_df["Variant"] = results_df["Mode"] + " " + results_df["Leaves"].astype(str)
+    record_frame("merkle_leaves", results_df, ["ns/record", "Records/s"], label=label, variant="Variant")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-hash cost of small messages (16 B to 64 KB).")
+    parser.add_argument("--output", type=str, required=True, help="Output subdirectory under ./results/")
+    parser.add_argument("--merkle_leaves", action="store_true", help="Measure MerkleTree leaf ingestion (per-object loop, add_leaf, packed batch) instead.")
+    args = parser.parse_args()
+
+    output_folder = os.path.join(results_dir, args.output) + "/hashing"
+    os.makedirs(output_folder, exist_ok=True)
+
+    algorithms = ['md5', 'sha1', 'sha256', 'sha512', 'sha3_256', 'blake2s', 'blake2b', 'blake3']
+    modes = ["per-call", "batch", "packed", "parallel"]
+
+    if args.merkle_leaves:
+        print("Running Merkle leaf ingestion test...")
+        test_merkle_leaves(algorithms, MERKLE_LEAF_COUNTS, output_folder, args.output)
+        return
+
+    print("Running small-message hashing test...")
+    test_small_messages(algorithms, generate_message_sizes(), modes, output_folder, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import os
+import sys
+import argparse
+
+code_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(code_dir, "..", ".."))
+sys.path.insert(0, os.path.join(code_dir, "hashing"))
+sys.path.insert(0, os.path.join(code_dir, "resource_usage"))
+
+from hashbench.isolated import CACHE_STATES, run_cases
+from hashbench.timing import HARDWARE_EVENTS, cycles_per_byte
+from hashbench.store import record_frame
+import hashing_speed
+import resource_consumption
+
+results_dir = "results"
+
+
+def build_cases(benchmark, algorithms, data_sizes_mb, runs, cache):
+    """
+    One case per (algorithm, size) with the data file and chunk size of the corresponding benchmark script.
+    """
+    cases = []
+    for algo in algorithms:
+        for size_mb in data_sizes_mb:
+            if benchmark == "speed":
+                file_path = hashing_speed.data_file(size_mb)
+                chunk_size = hashing_speed.CHUNK_SIZE
+            else:
+                file_path = resource_consumption.data_file(size_mb)
+                chunk_size = 8192
+            cases.append({"benchmark": benchmark, "algorithm": algo, "size_mb": size_mb, "file": file_path,
+                          "runs": runs, "chunk_size": chunk_size, "cache": cache})
+    return cases
+
+
+def save_speed_results(results, output_folder, label=None, config=None):
+    """
+    Aggregate speed cases into the single-thread timing and summary CSV schemas, then run the T-tests.
+    """
+    import pandas as pd
+    timing_results = []
+    summary_results = []
+    for case, runs in results:
+        timings = [run["Wall Time (ns)"] / 1e6 for run in runs]
+        for timing, run in zip(timings, runs):
+            timing_results.append([case["algorithm"], case["size_mb"], timing, run["Wall Time (ns)"], run["CPU Time (ns)"],
+                                   *(run[name] for name in HARDWARE_EVENTS)])
+        total_time = sum(timings)
+        speed = case["size_mb"] * len(runs) / (total_time / 1000)  # MBps
+        summary_results.append([case["algorithm"], case["size_mb"], len(runs), total_time, total_time / len(runs), speed,
+                                cycles_per_byte(runs, case["size_mb"] * 1024 * 1024)])
+
+    timing_csv = os.path.join(output_folder, "hashing_speed_single_thread_timing.csv")
+    timing_columns = ["Algorithm", "Data Size (MB)", "Timing (ms)", "Wall Time (ns)", "CPU Time (ns)", *HARDWARE_EVENTS]
+    timing_df = pd.DataFrame(timing_results, columns=timing_columns).sort_values(["Algorithm", "Data Size (MB)"])
+    timing_df.to_csv(timing_csv, index=False)
+    print(f"Timing results saved to {timing_csv}")
+    record_frame("speed_single_thread", timing_df, timing_columns[2:], label=label, config=config, size="Data Size (MB)")
+
+    summary_csv = os.path.join(output_folder, "hashing_speed_single_thread_summary.csv")
+    summary_columns = ["Algorithm", "Data Size (MB)", "Iterations", "Total Time (ms)", "Avg Time (ms)", "Speed (MBps)", "Cycles per Byte"]
+    pd.DataFrame(summary_results, columns=summary_columns).sort_values(["Algorithm", "Data Size (MB)"]).to_csv(summary_csv, index=False)
+    print(f"Summary results saved to {summary_csv}")
+
+    hashing_speed.perform_t_tests(timing_csv, output_folder)
+
+
+def save_resource_results(results, output_folder, label=None, config=None):
+    """
+    Aggregate resource cases into the resource results CSV schema, then run the T-tests and averages.
+    """
+    import pandas as pd
+    rows = []
+    for case, runs in results:
+        for run in runs:
+            rows.append([case["algorithm"], case["size_mb"], round(run["CPU (%)"], 6), round(run["Peak Memory (MB)"], 6),
+                         run["Wall Time (ns)"], run["CPU Time (ns)"], run["Cycles per Byte"]])
+
+    results_csv = os.path.join(output_folder, "hashing_resource_results.csv")
+    columns = ["Algorithm", "Data Size (MB)", "CPU (%)", "Peak Memory (MB)", "Wall Time (ns)", "CPU Time (ns)", "Cycles per Byte"]
+    results_df = pd.DataFrame(rows, columns=columns).sort_values(["Algorithm", "Data Size (MB)"])
+    results_df.to_csv(results_csv, index=False)
+    print(f"Resource results saved to {results_csv}")
+    record_frame("resource", results_df, columns[2:], label=label, config=config, size="Data Size (MB)")
+
+    resource_consumption.perform_t_tests(results_csv, output_folder)
+    resource_consumption.calculate_averages(results_csv, output_folder)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run each (algorithm, size) case in a fresh subprocess with page cache control.")
+    parser.add_argument("--output", type=str, required=True, help="Output subdirectory under ./results/; results go to <output>/<cache>/.")
+    parser.add_argument("--benchmark", type=str, choices=["speed", "resource"], default="speed", help="Which benchmark's cases and CSV schema to use.")
+    parser.add_argument("--cache", type=str, choices=CACHE_STATES, default="none", help="Page cache state of the data file before every run.")
+    parser.add_argument("--runs", type=int, default=hashing_speed.RUNS_PER_TEST, help="Timed runs per case.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the randomized case order.")
+    args = parser.parse_args()
+
+    algorithms = ['md5', 'sha1', 'sha256', 'sha512', 'sha3_256', 'blake2s', 'blake2b', 'blake3']
+    data_sizes_mb = hashing_speed.generate_mb_file_sizes()
+
+    if args.benchmark == "speed":
+        hashing_speed.ensure_data_files_exist(data_sizes_mb)
+        output_folder = os.path.join(results_dir, args.output, args.cache, "hashing")
+    else:
+        resource_consumption.ensure_data_files_exist()
+        output_folder = os.path.join(results_dir, args.output, args.cache, "resource_usage")
+    os.makedirs(output_folder, exist_ok=True)
+
+    cases = build_cases(args.benchmark, algorithms, data_sizes_mb, args.runs, args.cache)
+    results = run_cases(cases, args.seed)
+
+    config = {"isolated": True, "cache": args.cache, "runs": args.runs, "seed": args.seed}
+    if args.benchmark == "speed":
+        save_speed_results(results, output_folder, args.output, config)
+    else:
+        save_resource_results(results, output_folder, args.output, config)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,19 @@
 import hashlib
-import psutil
 import os
+import sys
 import csv
 import argparse
 from blake3 import blake3
-from scipy.stats import ttest_ind
-import pandas as pd
-import time
 import logging
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from hashbench.timing import Timer, cycles_per_byte
+from hashbench.sampler import ResourceSampler
+from hashbench.io_strategies import STRATEGIES
+from hashbench.memprofile import profile_in_subprocess
+from hashbench.datagen import KINDS, ensure_files
+from hashbench.store import record_frame
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -16,137 +21,145 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 data_dir = "code/data/resources"
 default_results_dir = "results"
 
-# Ensure base directories exist
-os.makedirs(data_dir, exist_ok=True)
-os.makedirs(default_results_dir, exist_ok=True)
-
+# Data profiles: zero, pattern, random, text, json
+PROFILES = KINDS
+DEFAULT_PROFILE = "random"
 
-def create_random_binary_file(file_name: str, size_in_bytes: int, chunk_size: int = 64 * 1024):
+def data_file(data_size_mb, profile=DEFAULT_PROFILE):
     """
-    Create a random binary file in chunks to avoid memory overflow.
+    Path of the data file for a size and data profile; random data keeps the dataset_ name.
     """
-    try:
-        with open(file_name, 'wb') as binary_file:
-            bytes_written = 0
-            while bytes_written < size_in_bytes:
-                remaining_bytes = size_in_bytes - bytes_written
-                binary_file.write(os.urandom(min(chunk_size, remaining_bytes)))
-                bytes_written += min(chunk_size, remaining_bytes)
-        logging.info(f"Created file: {file_name} with size: {size_in_bytes // (1024 * 1024)} MB")
-    except Exception as e:
-        logging.error(f"Error creating file {file_name}: {e}")
+    prefix = "dataset" if profile == DEFAULT_PROFILE else profile
+    return os.path.join(data_dir, f"{prefix}_{data_size_mb}MB.bin")
 
 
-def generate_files_for_multiple_sizes(data_sizes_mb, output_folder):
+def profile_results_dir(output, profile=DEFAULT_PROFILE):
     """
-    Generate binary files of specified sizes in MB.
+    Results folder for a data profile. The default profile keeps results/<output>/resource_usage;
+    other profiles go to results/<output>/profiles/<profile>/resource_usage.
     """
-    os.makedirs(output_folder, exist_ok=True)
-    for size_mb in data_sizes_mb:
-        file_path = os.path.join(output_folder, f"dataset_{size_mb}MB.bin")
-        if not os.path.exists(file_path):
-            create_random_binary_file(file_path, size_mb * 1024 * 1024)
+    if profile == DEFAULT_PROFILE:
+        return os.path.join(default_results_dir, output, "resource_usage")
+    return os.path.join(default_results_dir, output, "profiles", profile, "resource_usage")
 
 
-def ensure_data_files_exist():
+def ensure_data_files_exist(profiles=(DEFAULT_PROFILE,)):
     """
     Ensure all required files exist in the data directory.
     """
     file_sizes_mb = [1, 2, 4, 8, 16, 32, 64, 128, 200, 512]
-    generate_files_for_multiple_sizes(file_sizes_mb, data_dir)
-
+    specs = [(os.path.basename(data_file(size_mb, profile)), profile, size_mb * 1024 * 1024)
+             for profile in profiles for size_mb in file_sizes_mb]
+    ensure_files(specs, data_dir)
 
-import time
 
-def measure_resource_usage(algorithm, data_size_mb, iterations):
+def measure_resource_usage(algorithm, data_size_mb, iterations, sample_interval=0.005, timeseries_dir=None, profile=DEFAULT_PROFILE):
     """
     Measure CPU and memory usage for a given hashing algorithm and data size.
+    A background sampler records process CPU time, RSS and I/O while hashing, so CPU utilization
+    and peak memory cover the hashing window itself. Each run's time series is written to
+    `timeseries_dir` when given.
     """
-    ensure_data_files_exist()
-    file_path = os.path.join(data_dir, f"dataset_{data_size_mb}MB.bin")
+    file_path = data_file(data_size_mb, profile)
 
     if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
         logging.error(f"File not found or empty: {file_path}")
-        return [], 0
+        return [], 0, []
 
     if algorithm == "blake3":
         hash_function = lambda x: blake3(x).digest()
     else:
         hash_function = lambda x: hashlib.new(algorithm, x).digest()
 
-    process = psutil.Process(os.getpid())
     peak_memory_mb = 0
     cpu_usages = []
+    records = []
 
-    for _ in range(iterations):
+    for run in range(1, iterations + 1):
         try:
-            start_time = time.time()
-            with open(file_path, "rb") as file:
-                while chunk := file.read(8192):  # Read file in 8KB chunks
-                    hash_function(chunk)
+            with ResourceSampler(sample_interval) as sampler, Timer() as timer:
+                with open(file_path, "rb") as file:
+                    while chunk := file.read(8192):  # Read file in 8KB chunks
+                        hash_function(chunk)
 
-            elapsed_time = time.time() - start_time
-            logging.info(f"Iteration completed in {elapsed_time:.6f} seconds for {data_size_mb} MB with {algorithm}")
+            record = timer.record()
+            record["Cycles per Byte"] = cycles_per_byte([record], data_size_mb * 1024 * 1024)
+            records.append(record)
+            logging.info(f"Iteration completed in {timer.wall_ns / 1e9:.6f} seconds for {data_size_mb} MB with {algorithm}")
 
-            # Add a short delay before measuring CPU usage
-            time.sleep(2)  # 100 milliseconds delay
+            usage = sampler.summary()
+            cpu_usages.append(usage["CPU (%)"])
+            peak_memory_mb = max(peak_memory_mb, usage["Peak Memory (MB)"])
 
-            # Measure CPU usage with a short interval
-            cpu_usage = psutil.cpu_percent(interval=2)
-            cpu_usages.append(cpu_usage)
-
-            # Check memory usage
-            current_memory_mb = process.memory_info().rss / (1024 * 1024)
-            peak_memory_mb = max(peak_memory_mb, current_memory_mb)
+            if timeseries_dir is not None:
+                sampler.write_csv(os.path.join(timeseries_dir, f"{algorithm}_{data_size_mb}MB_run{run}.csv"))
 
         except Exception as e:
             logging.error(f"Error during resource measurement: {e}")
             continue
 
-    return cpu_usages, peak_memory_mb
+    return cpu_usages, peak_memory_mb, records
 
 
-def test_resource_usage(algorithms, data_sizes_mb, iterations):
+def test_resource_usage(algorithms, data_sizes_mb, iterations, sample_interval=0.005, timeseries_dir=None, profile=DEFAULT_PROFILE):
     """
     Test resource usage for multiple algorithms and file sizes.
     """
+    ensure_data_files_exist([profile])
     results = []
     for algo in algorithms:
         for size_mb in data_sizes_mb:
             logging.info(f"Testing {algo} with {size_mb} MB")
-            cpu_usages, peak_memory = measure_resource_usage(algo, size_mb, iterations)
-            for cpu in cpu_usages:
-                results.append([algo, size_mb, round(cpu, 6), round(peak_memory, 6)])
+            cpu_usages, peak_memory, records = measure_resource_usage(algo, size_mb, iterations, sample_interval, timeseries_dir, profile)
+            for cpu, record in zip(cpu_usages, records):
+                results.append([algo, size_mb, round(cpu, 6), round(peak_memory, 6),
+                                record["Wall Time (ns)"], record["CPU Time (ns)"], record["Cycles per Byte"]])
     return results
 
 
+def profile_memory(algorithms, data_sizes_mb, output_folder, chunk_size=8192, profile=DEFAULT_PROFILE, label=None):
+    """
+    Profile allocations for every algorithm, size and read strategy, each in a fresh subprocess,
+    and save them side by side.
+    """
+    import pandas as pd
+    ensure_data_files_exist([profile])
+    rows = []
+    for algo in algorithms:
+        for size_mb in data_sizes_mb:
+            file_path = data_file(size_mb, profile)
+            for strategy in STRATEGIES:
+                logging.info(f"Profiling memory for {algo} with {size_mb} MB ({strategy})")
+                try:
+                    result = profile_in_subprocess(file_path, algo, strategy, chunk_size)
+                    rows.append({"Algorithm": algo, "Data Size (MB)": size_mb, "Strategy": strategy, **result})
+                except Exception as e:
+                    logging.error(f"Error profiling {algo} with {size_mb} MB ({strategy}): {e}")
+
+    profile_csv = os.path.join(output_folder, "hashing_memory_profile.csv")
+    profile_df = pd.DataFrame(rows)
+    profile_df.to_csv(profile_csv, index=False)
+    logging.info(f"Memory profile saved to {profile_csv}")
+    metrics = [column for column in profile_df.columns if column not in ("Algorithm", "Data Size (MB)", "Strategy")]
+    if rows and profile != DEFAULT_PROFILE:
+        profile_df["Strategy"] = profile_df["Strategy"] + " " + profile  # Keep profiles apart under one label
+    record_frame("memory_profile", profile_df, metrics, label=label, size="Data Size (MB)", variant="Strategy",
+                 config={"profile": profile, "chunk_size": chunk_size})
+
+
 def perform_t_tests(results_csv, output_folder):
     """
-    Perform T-tests between different hashing algorithms and save results.
+    Compare the CPU usage of every pair of algorithms at each data size: Welch t-test, Mann-Whitney U,
+    effect sizes, bootstrap CI of the ratio and multiple-comparison corrected p-values.
     """
+    import pandas as pd
+    from hashbench.analysis import pairwise_tests
+
     df = pd.read_csv(results_csv)
-    data_sizes = df["Data Size (MB)"].unique()
-    comparison_pairs = [("blake3", "sha256"), ("blake2s", "blake2b")]
-    t_test_results = []
-
-    for size in data_sizes:
-        subset = df[df["Data Size (MB)"] == size]
-        for algo1, algo2 in comparison_pairs:
-            values_algo1 = subset[subset["Algorithm"] == algo1]["CPU (%)"].values
-            values_algo2 = subset[subset["Algorithm"] == algo2]["CPU (%)"].values
-
-            if len(values_algo1) > 1 and len(values_algo2) > 1:
-                t_stat, p_value = ttest_ind(values_algo1, values_algo2, equal_var=False)
-                t_test_results.append({
-                    "Data Size (MB)": size,
-                    "Algorithm 1": algo1,
-                    "Algorithm 2": algo2,
-                    "T-Statistic": round(t_stat, 8),
-                    "P-Value": round(p_value, 8)
-                })
+    t_test_results = pairwise_tests(df, "CPU (%)", ["Data Size (MB)"]).round({"T-Statistic": 8, "P-Value": 8})
 
     t_test_output = os.path.join(output_folder, "hashing_resource_t_test_results.csv")
-    pd.DataFrame(t_test_results).to_csv(t_test_output, index=False)
+    t_test_results.to_csv(t_test_output, index=False)
     logging.info(f"T-test results saved to {t_test_output}")
 
 
@@ -154,6 +167,7 @@ def calculate_averages(input_csv, output_folder):
     """
     Calculate averages of CPU usage and memory usage and save results.
     """
+    import pandas as pd
     df = pd.read_csv(input_csv)
     avg_df = (
         df.groupby(["Algorithm", "Data Size (MB)"])
@@ -166,6 +180,32 @@ def calculate_averages(input_csv, output_folder):
     logging.info(f"Average results saved to {avg_csv}")
 
 
+def compare_profiles(output, profiles):
+    """
+    Combine the per-profile averages, with mean wall time per case, into one table to compare
+    CPU, memory and I/O behaviour across file contents.
+    """
+    import pandas as pd
+    frames = []
+    for profile in profiles:
+        folder = profile_results_dir(output, profile)
+        avg_df = pd.read_csv(os.path.join(folder, "hashing_resource_avg_results.csv"))
+        wall_df = (
+            pd.read_csv(os.path.join(folder, "hashing_resource_results.csv"))
+            .groupby(["Algorithm", "Data Size (MB)"])["Wall Time (ns)"].mean()
+            .reset_index()
+        )
+        df = avg_df.merge(wall_df, on=["Algorithm", "Data Size (MB)"])
+        df["Data Profile"] = profile
+        frames.append(df)
+
+    comparison_folder = profile_results_dir(output)
+    os.makedirs(comparison_folder, exist_ok=True)
+    comparison_csv = os.path.join(comparison_folder, "hashing_resource_profile_comparison.csv")
+    pd.concat(frames, ignore_index=True).sort_values(["Algorithm", "Data Size (MB)", "Data Profile"]).to_csv(comparison_csv, index=False)
+    logging.info(f"Profile comparison saved to {comparison_csv}")
+
+
 def main():
     """
     Main function to orchestrate the resource usage measurement.
@@ -173,28 +213,49 @@ def main():
     logging.info("Starting resource usage measurement...")
     parser = argparse.ArgumentParser(description="Measure and analyze resource usage of hashing algorithms.")
     parser.add_argument("--output", type=str, required=True, help="Subdirectory in the results folder to save the results.")
+    parser.add_argument("--sample_interval", type=float, default=5, help="Resource sampling interval in milliseconds.")
+    parser.add_argument("--mode", type=str, choices=["usage", "memory"], default="usage", help="'memory' profiles allocations per read strategy with tracemalloc instead.")
+    parser.add_argument("--profiles", type=str, nargs="+", choices=PROFILES, default=[DEFAULT_PROFILE], help="Data profiles (file contents) to hash.")
     args = parser.parse_args()
 
     algorithms = ['md5', 'sha1', 'sha256', 'sha512', 'sha3_256', 'blake2s', 'blake2b', 'blake3']
     data_sizes_mb = [1, 2, 4, 8, 16, 32, 64, 128, 200, 512]
     iterations = 1
 
-    results = test_resource_usage(algorithms, data_sizes_mb, iterations)
-    results_dir = os.path.join(default_results_dir, args.output, "resource_usage")
-    os.makedirs(results_dir, exist_ok=True)
-    results_csv = os.path.join(results_dir, "hashing_resource_results.csv")
-
-    try:
-        with open(results_csv, mode='w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(["Algorithm", "Data Size (MB)", "CPU (%)", "Peak Memory (MB)"])
-            writer.writerows(results)
-        logging.info(f"Resource results saved to {results_csv}")
-    except Exception as e:
-        logging.error(f"Error saving results: {e}")
-
-    perform_t_tests(results_csv, results_dir)
-    calculate_averages(results_csv, results_dir)
+    for profile in args.profiles:
+        logging.info(f"Data profile: {profile}")
+        results_dir = profile_results_dir(args.output, profile)
+        os.makedirs(results_dir, exist_ok=True)
+
+        if args.mode == "memory":
+            profile_memory(algorithms, data_sizes_mb, results_dir, profile=profile, label=args.output)
+            continue
+
+        timeseries_dir = os.path.join(results_dir, "timeseries")
+        results = test_resource_usage(algorithms, data_sizes_mb, iterations, args.sample_interval / 1000, timeseries_dir, profile)
+        results_csv = os.path.join(results_dir, "hashing_resource_results.csv")
+        columns = ["Algorithm", "Data Size (MB)", "CPU (%)", "Peak Memory (MB)", "Wall Time (ns)", "CPU Time (ns)", "Cycles per Byte"]
+
+        try:
+            with open(results_csv, mode='w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(columns)
+                writer.writerows(results)
+            logging.info(f"Resource results saved to {results_csv}")
+        except Exception as e:
+            logging.error(f"Error saving results: {e}")
+
+        import pandas as pd
+        # Non-default profiles get their own variant, so runs under one label are not pooled across contents
+        results_df = pd.DataFrame(results, columns=columns).assign(Variant=None if profile == DEFAULT_PROFILE else profile)
+        record_frame("resource", results_df, columns[2:], label=args.output, size="Data Size (MB)", variant="Variant",
+                     config={"profile": profile, "sample_interval_ms": args.sample_interval})
+
+        perform_t_tests(results_csv, results_dir)
+        calculate_averages(results_csv, results_dir)
+
+    if args.mode == "usage" and len(args.profiles) > 1:
+        compare_profiles(args.output, args.profiles)
 
 
 if __name__ == "__main__":
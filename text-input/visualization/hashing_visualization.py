@@ -1,8 +1,12 @@
 import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import argparse
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from hashbench.fit import fit_line
+
 # Argument parser
 parser = argparse.ArgumentParser(description="Visualize hashing performance metrics for single-threaded and multi-threaded results.")
 parser.add_argument("--folder", type=str, required=True, help="Folder name inside results and visualization directories.")
@@ -21,20 +25,32 @@ def load_csv_data(file_path):
         raise FileNotFoundError(f"CSV file not found: {file_path}")
     return pd.read_csv(file_path)
 
+# Load a summary CSV with the speed of one pass recomputed from its average time
+# (older summaries scaled Speed (MBps) by the run count, like report.py corrects)
+def load_summary(file_path):
+    df = load_csv_data(file_path)
+    df["Speed (MBps)"] = df["Data Size (MB)"] / df["Avg Time (ms)"] * 1000
+    return df
+
 # Visualization function
-def visualize_metric(df, x_col, y_col, ylabel, title, filename):
+def visualize_metric(df, x_col, y_col, ylabel, title, filename, fit_df=None):
     plt.figure(figsize=(12, 6))
     algorithms = df["Algorithm"].unique()
 
     for algo in algorithms:
         subset = df[df["Algorithm"] == algo]
-        plt.plot(subset[x_col], subset[y_col], marker='o', label=algo.upper())
+        line, = plt.plot(subset[x_col], subset[y_col], marker='o', label=algo.upper())
+
+        # Overlay the fitted time = overhead + per-MB time * size (written by hashbench/fit.py)
+        if fit_df is not None and algo in fit_df["Algorithm"].values:
+            fitted = fit_line(fit_df[fit_df["Algorithm"] == algo].iloc[0], subset[x_col], y_col)
+            plt.plot(subset[x_col], fitted, linestyle="--", color=line.get_color(), alpha=0.6)
 
     # Add labels, title, and legend
     plt.title(title, fontsize=16)
     plt.xlabel(x_col.replace("_", " ").title(), fontsize=14)
     plt.ylabel(ylabel, fontsize=14)
-    plt.legend(title="Algorithm", fontsize=12)
+    plt.legend(title="Algorithm (dashed: fit)" if fit_df is not None else "Algorithm", fontsize=12)
     plt.grid(True, linestyle="--", alpha=0.7)
     plt.tight_layout()
 
@@ -49,11 +65,14 @@ def main():
     # File paths for summaries
     single_thread_summary_file = os.path.join(results_dir, "hashing_speed_single_thread_summary.csv")
     multi_thread_summary_file = os.path.join(results_dir, "hashing_speed_multi_threads_summary.csv")
+    single_thread_fit_file = os.path.join(results_dir, "hashing_speed_single_thread_fit.csv")
+    multi_thread_fit_file = os.path.join(results_dir, "hashing_speed_multi_threads_fit.csv")
 
     # Single-threaded visualization
     if os.path.exists(single_thread_summary_file):
         print("Visualizing single-threaded summary results...")
-        single_thread_summary_df = load_csv_data(single_thread_summary_file)
+        single_thread_summary_df = load_summary(single_thread_summary_file)
+        single_thread_fit_df = load_csv_data(single_thread_fit_file) if os.path.exists(single_thread_fit_file) else None
 
         # Visualize average timing
         visualize_metric(
@@ -62,7 +81,8 @@ def main():
             y_col="Avg Time (ms)",
             ylabel="Average Time (ms)",
             title="Single-Threaded Hashing: Average Timing Per Algorithm",
-            filename="single_thread_avg_time.png"
+            filename="single_thread_avg_time.png",
+            fit_df=single_thread_fit_df
         )
 
         # Visualize speed
@@ -72,13 +92,15 @@ def main():
             y_col="Speed (MBps)",
             ylabel="Speed (MBps)",
             title="Single-Threaded Hashing: Speed Per Algorithm",
-            filename="single_thread_speed.png"
+            filename="single_thread_speed.png",
+            fit_df=single_thread_fit_df
         )
 
     # Multi-threaded visualization
     if os.path.exists(multi_thread_summary_file):
         print("Visualizing multi-threaded summary results...")
-        multi_thread_summary_df = load_csv_data(multi_thread_summary_file)
+        multi_thread_summary_df = load_summary(multi_thread_summary_file)
+        multi_thread_fit_df = load_csv_data(multi_thread_fit_file) if os.path.exists(multi_thread_fit_file) else None
 
         # Visualize average timing
         visualize_metric(
@@ -87,7 +109,8 @@ def main():
             y_col="Avg Time (ms)",
             ylabel="Average Time (ms)",
             title="Multi-Threaded Hashing: Average Timing Per Algorithm",
-            filename="multi_thread_avg_time.png"
+            filename="multi_thread_avg_time.png",
+            fit_df=multi_thread_fit_df
         )
 
         # Visualize speed
@@ -97,7 +120,8 @@ def main():
             y_col="Speed (MBps)",
             ylabel="Speed (MBps)",
             title="Multi-Threaded Hashing: Speed Per Algorithm",
-            filename="multi_thread_speed.png"
+            filename="multi_thread_speed.png",
+            fit_df=multi_thread_fit_df
         )
 
 if __name__ == "__main__":